@@ -0,0 +1,91 @@
+"""Micro-batching of concurrent query encodings"""
+
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+from qdrant_client.models import SparseVector
+
+from app.executor import InferenceExecutor
+
+
+class QueryCoalescer:
+    """Gathers queries arriving within a short window and encodes them together
+
+    Each caller awaits its own future; the batch is flushed when the window
+    elapses or max_batch queries are waiting, whichever comes first, and is
+    encoded with one dense and one sparse forward pass on the executor.
+    """
+
+    def __init__(
+        self,
+        engine,
+        executor: InferenceExecutor,
+        window_ms: float = 3.0,
+        max_batch: int = 32
+    ):
+        self.engine = engine
+        self.executor = executor
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to tasks; in-flight batches are held here
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.queries = 0
+
+    async def encode(
+        self,
+        query: str,
+        mode: str = "hybrid"
+    ) -> Tuple[Optional[np.ndarray], Optional[SparseVector]]:
+        """Encode one query for the given search mode as part of a batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, mode, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        self.batches += 1
+        self.queries += len(batch)
+        try:
+            dense_queries, sparse_queries = await self.executor.run(
+                self.engine.encode_queries,
+                [query for query, _, _ in batch],
+                [mode for _, mode, _ in batch]
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), dense, sparse in zip(batch, dense_queries, sparse_queries):
+            if not future.done():
+                future.set_result((dense, sparse))
+
+    def stats(self):
+        """Report batch count and average batch size"""
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": self.queries / self.batches if self.batches else 0.0
+        }
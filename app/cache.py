@@ -0,0 +1,256 @@
+"""Bounded LRU/TTL caches for embeddings and search results"""
+
+import hashlib
+import json
+import multiprocessing
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (Unicode NFC, collapsed whitespace)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss/eviction counters
+
+    Entries are bounded by count and, when max_bytes and sizeof are given,
+    by the approximate total size reported by sizeof.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_size = max_size
+        self.ttl = ttl or None
+        self.max_bytes = max_bytes or None
+        self._sizeof = sizeof if self.max_bytes else None
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(model: str, mode: str, text: str) -> Tuple[str, str, bytes]:
+        """Build a compact key from model name, encoding mode and normalized text"""
+        digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+        return model, mode, digest
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a cached value, refreshing its LRU position"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value, nbytes = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.bytes -= nbytes
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries when full"""
+        if self.max_size <= 0:
+            return
+
+        nbytes = self._sizeof(value) if self._sizeof else 0
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            self._entries[key] = (time.monotonic(), value, nbytes)
+            self.bytes += nbytes
+            while len(self._entries) > self.max_size or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report cache size and counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Rough fixed cost of one result dict: keys, id, scores and chunk offsets
+RESULT_OVERHEAD = 256
+
+
+def value_size(value: Any) -> int:
+    """Approximate size of a payload value: string lengths, a flat cost for scalars"""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(value_size(item) for item in value)
+    return 8
+
+
+def result_size(results: Any) -> int:
+    """Approximate memory footprint of a search result list in bytes
+
+    Counts the texts and metadata plus a fixed cost per result; no
+    serialization, since it runs on every cache miss.
+    """
+    size = 64
+    for result in results:
+        size += RESULT_OVERHEAD + len(result.get("text") or "") + value_size(result.get("metadata") or {})
+        for chunk in result.get("chunks") or ():
+            size += RESULT_OVERHEAD + len(chunk.get("text") or "")
+    return size
+
+
+class SharedVersions:
+    """Collection version counters in shared memory, seen by every forked worker
+
+    Must be created before the workers are forked. Collection names hash
+    into a fixed number of slots; two collections sharing a slot only
+    invalidate each other's cached results more often than needed.
+    """
+
+    def __init__(self, slots: int = 4096):
+        self._counters = multiprocessing.Array("q", slots)
+
+    def _slot(self, collection_name: str) -> int:
+        digest = hashlib.blake2b(collection_name.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % len(self._counters)
+
+    def get(self, collection_name: str) -> int:
+        return self._counters[self._slot(collection_name)]
+
+    def bump(self, collection_name: str):
+        slot = self._slot(collection_name)
+        with self._counters.get_lock():
+            self._counters[slot] += 1
+
+
+# Set by share_result_versions() in a preforking parent; result caches created afterwards use it
+_shared_versions: Optional[SharedVersions] = None
+
+
+def share_result_versions() -> SharedVersions:
+    """Make result caches built from now on, in this process and its forks, share collection versions"""
+    global _shared_versions
+    if _shared_versions is None:
+        _shared_versions = SharedVersions()
+    return _shared_versions
+
+
+class SearchResultCache:
+    """Search results keyed on the normalized request and a per-collection version
+
+    Every write to a collection bumps its version. Keys embed the version
+    current when the search started, so results computed before a write are
+    never served after it; the orphaned entries simply age out of the LRU.
+    Under share_result_versions() the versions live in shared memory, so a
+    write through one worker invalidates the results cached by all of them.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        self._results = EmbeddingCache(
+            max_size=max_size,
+            ttl=ttl,
+            max_bytes=max_bytes,
+            sizeof=result_size
+        )
+        self._versions: Dict[str, int] = {}
+        self._shared = _shared_versions
+        self._lock = threading.Lock()
+
+    def version(self, collection_name: str) -> int:
+        with self._lock:
+            if self._shared is not None:
+                self._versions[collection_name] = self._shared.get(collection_name)
+            return self._versions.get(collection_name, 0)
+
+    def invalidate(self, collection_name: str):
+        """Bump a collection's version so its cached results are no longer served"""
+        with self._lock:
+            if self._shared is not None:
+                self._shared.bump(collection_name)
+                self._versions[collection_name] = self._shared.get(collection_name)
+            else:
+                self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+
+    def make_key(
+        self,
+        collection_name: str,
+        query: str,
+        mode: str,
+        limit: int,
+        offset: int,
+        filters: Optional[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, int, bytes]:
+        """Build a key from the normalized request and the collection's current version"""
+        request = json.dumps(
+            [normalize_text(query), mode, limit, offset, filters or {}, options or {}],
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.blake2b(request.encode("utf-8"), digest_size=16).digest()
+        return collection_name, self.version(collection_name), digest
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self._results.get(key)
+
+    def put(self, key: Hashable, results: Any):
+        self._results.put(key, results)
+
+    def clear(self):
+        self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            versions = dict(self._versions)
+        return {**self._results.stats(), "collection_versions": versions}
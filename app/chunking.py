@@ -0,0 +1,59 @@
+"""Token-bounded, overlapping chunking of long documents"""
+
+import uuid
+from typing import List, Tuple
+
+PARENT_ID_FIELD = "parent_id"
+CHUNK_FIELDS = ("chunk_index", "chunk_start", "chunk_end", "chunk_count", "parent_hash")
+
+# Chunk point IDs are derived from the parent ID, so re-indexing overwrites them in place
+CHUNK_NAMESPACE = uuid.UUID("6f1c2a3e-8d4b-4f5a-9c7e-2b1d0e3f4a5b")
+
+
+def chunk_id(parent_id: str, index: int) -> str:
+    """Point ID of a document's index-th chunk"""
+    return str(uuid.uuid5(CHUNK_NAMESPACE, f"{parent_id}:{index}"))
+
+
+class DocumentChunker:
+    """Splits texts into overlapping windows of at most `max_tokens` tokens
+
+    Windows are cut on token boundaries using a fast tokenizer's offset
+    mapping and returned as character spans, so each chunk is an exact
+    substring of the original text. Texts that already fit are one chunk.
+    """
+
+    def __init__(self, tokenizer, max_tokens: int, overlap: int = 0):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap < max_tokens:
+            raise ValueError("overlap must be smaller than max_tokens")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+
+    def spans(self, texts: List[str]) -> List[List[Tuple[int, int]]]:
+        """Character spans (start, end) of the chunks of each text"""
+        offsets = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            truncation=False,
+            verbose=False
+        )["offset_mapping"]
+
+        stride = self.max_tokens - self.overlap
+        spans = []
+        for text, tokens in zip(texts, offsets):
+            if len(tokens) <= self.max_tokens:
+                spans.append([(0, len(text))])
+                continue
+
+            text_spans = []
+            for start in range(0, len(tokens), stride):
+                window = tokens[start:start + self.max_tokens]
+                text_spans.append((window[0][0], window[-1][1]))
+                if start + self.max_tokens >= len(tokens):
+                    break
+            spans.append(text_spans)
+        return spans
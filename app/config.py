@@ -20,6 +20,12 @@ class Settings(BaseSettings):
     qdrant_port: int = Field(default=6333, env="QDRANT_PORT")
     qdrant_api_key: Optional[str] = Field(default=None, env="QDRANT_API_KEY")
     qdrant_collection: str = Field(default="hybrid_search", env="QDRANT_COLLECTION")
+    qdrant_location: Optional[str] = Field(default=None, env="QDRANT_LOCATION")  # ":memory:" or a path for local mode
+    qdrant_grpc_port: int = Field(default=6334, env="QDRANT_GRPC_PORT")
+    qdrant_prefer_grpc: bool = Field(default=False, env="QDRANT_PREFER_GRPC")
+    qdrant_async: bool = Field(default=False, env="QDRANT_ASYNC")  # Use AsyncQdrantClient on the request path
+    qdrant_timeout: int = Field(default=30, env="QDRANT_TIMEOUT")
+    qdrant_pool_size: int = Field(default=16, env="QDRANT_POOL_SIZE")
     
     # Model Configuration with GPU optimization
     dense_model: str = Field(
@@ -36,16 +42,70 @@ class Settings(BaseSettings):
     cuda_device: int = Field(default=0, env="CUDA_DEVICE")
     batch_size: int = Field(default=32, env="BATCH_SIZE")  # Optimized for 8GB VRAM
     max_sequence_length: int = Field(default=512, env="MAX_SEQUENCE_LENGTH")
+    sparse_max_length: int = Field(default=128, env="SPARSE_MAX_LENGTH")
+    sparse_query_max_length: int = Field(default=24, env="SPARSE_QUERY_MAX_LENGTH")
+    sparse_prune_top_k: int = Field(default=0, env="SPARSE_PRUNE_TOP_K")  # Heaviest terms kept per indexed text, 0 keeps all
+    sparse_prune_min_weight: float = Field(default=0.0, env="SPARSE_PRUNE_MIN_WEIGHT")  # Indexed terms below this weight are dropped
+    inference_backend: str = Field(default="torch", env="INFERENCE_BACKEND")  # torch or onnx
+    onnx_quantize: bool = Field(default=False, env="ONNX_QUANTIZE")  # Dynamic int8 weights for the ONNX backend
+    onnx_cache_dir: str = Field(default="./onnx_models", env="ONNX_CACHE_DIR")
+    onnx_threads: int = Field(default=0, env="ONNX_THREADS")  # Intra-op threads per session, 0 = all cores
+    parallel_model_loading: bool = Field(default=True, env="PARALLEL_MODEL_LOADING")  # Load dense and sparse concurrently
+    warmup_on_startup: bool = Field(default=True, env="WARMUP_ON_STARTUP")  # Encode sample batches before /readyz passes
+    prefork_workers: int = Field(default=2, env="PREFORK_WORKERS")  # Worker processes forked by app.prefork
+    worker_threads: int = Field(default=0, env="WORKER_THREADS")  # Torch threads per forked worker, 0 = cores / workers
     
     # Performance Settings
-    num_workers: int = Field(default=4, env="NUM_WORKERS")
+    num_workers: int = Field(default=4, env="NUM_WORKERS")  # Inference executor threads
+    inference_queue_size: int = Field(default=64, env="INFERENCE_QUEUE_SIZE")  # Queued requests before 503
+    query_coalescing: bool = Field(default=True, env="QUERY_COALESCING")
+    coalesce_window_ms: float = Field(default=3.0, env="COALESCE_WINDOW_MS")
+    coalesce_max_batch: int = Field(default=32, env="COALESCE_MAX_BATCH")
     cache_embeddings: bool = Field(default=True, env="CACHE_EMBEDDINGS")
     embedding_cache_size: int = Field(default=10000, env="EMBEDDING_CACHE_SIZE")
+    embedding_cache_ttl: int = Field(default=0, env="EMBEDDING_CACHE_TTL")  # Seconds, 0 disables expiry
+    cache_search_results: bool = Field(default=True, env="CACHE_SEARCH_RESULTS")
+    search_cache_size: int = Field(default=1000, env="SEARCH_CACHE_SIZE")
+    search_cache_max_bytes: int = Field(default=64 * 1024 * 1024, env="SEARCH_CACHE_MAX_BYTES")
+    search_cache_ttl: int = Field(default=0, env="SEARCH_CACHE_TTL")  # Set when other processes write to Qdrant
+    upsert_batch_size: int = Field(default=100, env="UPSERT_BATCH_SIZE")
+    upsert_wait: bool = Field(default=True, env="UPSERT_WAIT")  # False pipelines batches without waiting for indexing; disables the result cache
+    incremental_indexing: bool = Field(default=False, env="INCREMENTAL_INDEXING")  # Skip unchanged documents by content hash
+    upsert_parallelism: int = Field(default=4, env="UPSERT_PARALLELISM")  # Concurrent batches on the async client
+    stream_chunk_size: int = Field(default=256, env="STREAM_CHUNK_SIZE")  # Documents per /index/stream chunk
+    stream_queue_size: int = Field(default=2, env="STREAM_QUEUE_SIZE")  # Chunks buffered between pipeline stages
+    job_concurrency: int = Field(default=2, env="JOB_CONCURRENCY")  # Indexing jobs running at once
+    job_queue_size: int = Field(default=100, env="JOB_QUEUE_SIZE")  # Jobs waiting before 503
+    job_retention: int = Field(default=100, env="JOB_RETENTION")  # Finished jobs kept for /jobs
+    chunk_documents: bool = Field(default=False, env="CHUNK_DOCUMENTS")  # Split long documents into chunk points
+    chunk_max_tokens: int = Field(default=126, env="CHUNK_MAX_TOKENS")  # Sparse tokenizer tokens, capped to fit SPARSE_MAX_LENGTH
+    chunk_overlap_tokens: int = Field(default=24, env="CHUNK_OVERLAP_TOKENS")
+    
+    # Collection Storage
+    collection_profile: str = Field(default="default", env="COLLECTION_PROFILE")  # default, bulk-ingest, low-latency, low-memory
+    quantization: Optional[str] = Field(default=None, env="QUANTIZATION")  # scalar, product, binary or unset
+    quantization_always_ram: bool = Field(default=True, env="QUANTIZATION_ALWAYS_RAM")  # Keep quantized vectors in RAM
+    product_quantization_compression: str = Field(default="x16", env="PRODUCT_QUANTIZATION_COMPRESSION")
+    dense_on_disk: bool = Field(default=False, env="DENSE_ON_DISK")  # Original dense vectors on disk (mmap)
+    sparse_on_disk: bool = Field(default=False, env="SPARSE_ON_DISK")
+    sparse_datatype: Optional[str] = Field(default=None, env="SPARSE_DATATYPE")  # float32, float16, uint8 or unset (float32)
+    sparse_idf: bool = Field(default=False, env="SPARSE_IDF")  # Qdrant IDF modifier on the sparse vectors
     
     # Search Settings
     default_limit: int = Field(default=10, env="DEFAULT_LIMIT")
     max_limit: int = Field(default=100, env="MAX_LIMIT")
-    fusion_weight: float = Field(default=0.5, env="FUSION_WEIGHT")  # Balance between dense and sparse
+    fusion_method: str = Field(default="rrf", env="FUSION_METHOD")  # rrf, dbsf, minmax or zscore
+    fusion_weight: float = Field(default=0.5, env="FUSION_WEIGHT")  # Dense weight; sparse gets 1 - weight
+    search_cursor_window: int = Field(default=100, env="SEARCH_CURSOR_WINDOW")  # Fused hybrid candidates kept per cursor
+    search_cursor_ttl: int = Field(default=60, env="SEARCH_CURSOR_TTL")  # Seconds a cursor reuses its candidates
+    search_cursor_cache_size: int = Field(default=1000, env="SEARCH_CURSOR_CACHE_SIZE")
+    group_prefetch_factor: int = Field(default=4, env="GROUP_PREFETCH_FACTOR")  # Hybrid candidates per grouped hit
+    hybrid_prefetch_min: int = Field(default=40, env="HYBRID_PREFETCH_MIN")  # Candidates per hybrid branch, at least
+    hybrid_prefetch_factor: float = Field(default=1.5, env="HYBRID_PREFETCH_FACTOR")  # Candidates per branch per requested result
+    hnsw_ef: Optional[int] = Field(default=None, env="HNSW_EF")  # Dense search beam width, unset = Qdrant default
+    exact_search: bool = Field(default=False, env="EXACT_SEARCH")  # Skip the HNSW index for dense search
+    search_profile_ttl: int = Field(default=60, env="SEARCH_PROFILE_TTL")  # Seconds a collection's search profile is cached
+    snippet_chars: int = Field(default=200, env="SNIPPET_CHARS")  # Snippet length when max_text_chars is not given
     
     # n8n Integration
     n8n_webhook_enabled: bool = Field(default=True, env="N8N_WEBHOOK_ENABLED")
@@ -0,0 +1,93 @@
+"""Bounded inference executor that keeps model work off the asyncio event loop"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the inference queue is full"""
+
+
+class InferenceExecutor:
+    """Thread pool for encoder/Qdrant work with a bounded submission queue
+
+    Threads are used rather than processes so every worker shares the models
+    already loaded by the search engine; torch releases the GIL during
+    inference, so the forward passes still run in parallel.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of running plus queued tasks"""
+        return self.max_workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted tasks waiting for a worker"""
+        with self._lock:
+            return self._pending - self._running
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def _call(self, fn: Callable[..., Any]) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn in the pool and await its result, or raise ExecutorSaturated"""
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(
+                    f"Inference queue full ({self._pending}/{self.capacity} tasks)"
+                )
+            self._pending += 1
+
+        future = self._executor.submit(self._call, functools.partial(fn, *args, **kwargs))
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def run_when_available(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Like run, but wait for queue space instead of failing (for background work)"""
+        while True:
+            try:
+                return await self.run(fn, *args, **kwargs)
+            except ExecutorSaturated:
+                await asyncio.sleep(0.05)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report worker and queue utilisation"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
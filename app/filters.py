@@ -0,0 +1,101 @@
+"""Translation of SearchRequest.filters into Qdrant payload filters
+
+Keys refer to document metadata ("category" and "metadata.category" are the
+same field). Supported values:
+
+    {"category": "ai"}                         equality
+    {"category": ["ai", "devops"]}             any of
+    {"category": {"any": ["ai", "devops"]}}    any of
+    {"category": {"except": ["spam"]}}         none of
+    {"category": {"eq": "ai"}}                 equality
+    {"category": {"ne": "spam"}}               not equal
+    {"year": {"gte": 2020, "lt": 2024}}        numeric range
+    {"published": {"gte": "2024-01-01"}}       date range (ISO 8601)
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from qdrant_client import models
+
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+MATCH_OPERATORS = ("eq", "ne", "any", "except")
+
+PAYLOAD_SCHEMAS = {
+    "keyword": models.PayloadSchemaType.KEYWORD,
+    "integer": models.PayloadSchemaType.INTEGER,
+    "float": models.PayloadSchemaType.FLOAT,
+    "bool": models.PayloadSchemaType.BOOL,
+    "datetime": models.PayloadSchemaType.DATETIME,
+    "text": models.PayloadSchemaType.TEXT,
+    "uuid": models.PayloadSchemaType.UUID
+}
+
+
+def payload_key(field: str) -> str:
+    """Payload path of a metadata field"""
+    return field if field.startswith("metadata.") else f"metadata.{field}"
+
+
+def _is_datetime(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+def _range_condition(key: str, bounds: Dict[str, Any]) -> models.FieldCondition:
+    if all(_is_datetime(value) for value in bounds.values()):
+        return models.FieldCondition(key=key, range=models.DatetimeRange(**bounds))
+    for operator, value in bounds.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Range bound {operator!r} on {key!r} must be a number or ISO date")
+    return models.FieldCondition(key=key, range=models.Range(**bounds))
+
+
+def _match(key: str, value: Any) -> models.FieldCondition:
+    if isinstance(value, (list, tuple)):
+        return models.FieldCondition(key=key, match=models.MatchAny(any=list(value)))
+    if isinstance(value, (str, int, bool)):
+        return models.FieldCondition(key=key, match=models.MatchValue(value=value))
+    raise ValueError(f"Unsupported filter value for {key!r}: {value!r}")
+
+
+def build_filter(filters: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+    """Build a Qdrant Filter from a filters dict, or None when there is nothing to filter"""
+    if not filters:
+        return None
+
+    must: List[models.Condition] = []
+    must_not: List[models.Condition] = []
+
+    for field, value in filters.items():
+        key = payload_key(field)
+
+        if not isinstance(value, dict):
+            must.append(_match(key, value))
+            continue
+
+        unknown = set(value) - set(RANGE_OPERATORS) - set(MATCH_OPERATORS)
+        if unknown:
+            raise ValueError(f"Unsupported filter operators for {field!r}: {sorted(unknown)}")
+
+        bounds = {op: value[op] for op in RANGE_OPERATORS if op in value}
+        if bounds:
+            must.append(_range_condition(key, bounds))
+        if "eq" in value:
+            must.append(_match(key, value["eq"]))
+        for op in ("any", "except"):
+            if op in value and not isinstance(value[op], (list, tuple)):
+                raise ValueError(f"Filter operator {op!r} for {field!r} needs a list, got {value[op]!r}")
+        if "any" in value:
+            must.append(_match(key, list(value["any"])))
+        if "ne" in value:
+            must_not.append(_match(key, value["ne"]))
+        if "except" in value:
+            must_not.append(_match(key, list(value["except"])))
+
+    return models.Filter(must=must or None, must_not=must_not or None)
@@ -0,0 +1,113 @@
+"""Client-side fusion of dense and sparse candidate lists"""
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+FUSION_METHODS = ("rrf", "dbsf", "minmax", "zscore")
+RRF_K = 2  # Qdrant's default ranking constant
+
+
+def _rrf(scores: np.ndarray, ranks: np.ndarray, weight: float) -> np.ndarray:
+    # Weighted RRF as Qdrant computes it: 1 / ((rank + 1) / weight + k - 1)
+    if weight <= 0:
+        return np.zeros_like(scores)
+    return np.where(np.isnan(scores), 0.0, 1.0 / ((ranks + 1) / weight + RRF_K - 1))
+
+
+def _dbsf(scores: np.ndarray) -> np.ndarray:
+    # Distribution-based score fusion: scale by mean +/- 3 sample std of the branch, as Qdrant does
+    present = scores[~np.isnan(scores)]
+    if present.size == 0:
+        return np.zeros_like(scores)
+    if present.size == 1 or present.std() == 0:
+        return np.where(np.isnan(scores), 0.0, 0.5)
+    mean, std = present.mean(), present.std(ddof=1)
+    low, high = mean - 3 * std, mean + 3 * std
+    return np.where(np.isnan(scores), 0.0, (scores - low) / (high - low))
+
+
+def _minmax(scores: np.ndarray) -> np.ndarray:
+    present = scores[~np.isnan(scores)]
+    if present.size == 0:
+        return np.zeros_like(scores)
+    low, high = present.min(), present.max()
+    if high <= low:
+        return np.where(np.isnan(scores), 0.0, 1.0)
+    return np.where(np.isnan(scores), 0.0, (scores - low) / (high - low))
+
+
+def _zscore(scores: np.ndarray) -> np.ndarray:
+    present = scores[~np.isnan(scores)]
+    if present.size == 0:
+        return np.zeros_like(scores)
+    std = present.std() or 1.0
+    normalized = (scores - present.mean()) / std
+    # A candidate missing from a branch ranked below everything that branch returned
+    return np.where(np.isnan(scores), (present.min() - present.mean()) / std, normalized)
+
+
+NORMALIZERS = {
+    "dbsf": _dbsf,
+    "minmax": _minmax,
+    "zscore": _zscore
+}
+
+
+def fuse(
+    dense_points: List[Any],
+    sparse_points: List[Any],
+    method: str = "rrf",
+    weight: float = 0.5
+) -> List[Tuple[Any, float, Optional[float], Optional[float]]]:
+    """Fuse two ranked lists of scored points into (point, score, dense_score, sparse_score)
+
+    Each branch is normalized with `method` and combined as
+    weight * dense + (1 - weight) * sparse. RRF weights the branches by
+    2 * weight and 2 * (1 - weight), and DBSF is scaled by 2, so that a
+    weight of 0.5 reproduces Qdrant's server-side fusion scores.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    # Union of candidates, keeping the first point object seen for each id
+    positions = {}
+    points = []
+    for point in list(dense_points) + list(sparse_points):
+        if point.id not in positions:
+            positions[point.id] = len(points)
+            points.append(point)
+
+    n = len(points)
+    if n == 0:
+        return []
+
+    dense = np.full(n, np.nan)
+    sparse = np.full(n, np.nan)
+    dense_ranks = np.full(n, np.inf)
+    sparse_ranks = np.full(n, np.inf)
+    for rank, point in enumerate(dense_points):
+        dense[positions[point.id]] = point.score
+        dense_ranks[positions[point.id]] = rank
+    for rank, point in enumerate(sparse_points):
+        sparse[positions[point.id]] = point.score
+        sparse_ranks[positions[point.id]] = rank
+
+    if method == "rrf":
+        fused = _rrf(dense, dense_ranks, 2 * weight) + _rrf(sparse, sparse_ranks, 2 * (1 - weight))
+    else:
+        normalize = NORMALIZERS[method]
+        fused = weight * normalize(dense) + (1 - weight) * normalize(sparse)
+        if method == "dbsf":
+            fused *= 2
+
+    order = np.argsort(-fused, kind="stable")
+    return [
+        (
+            points[i],
+            float(fused[i]),
+            None if np.isnan(dense[i]) else float(dense[i]),
+            None if np.isnan(sparse[i]) else float(sparse[i])
+        )
+        for i in order
+    ]
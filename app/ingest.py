@@ -0,0 +1,247 @@
+"""Streaming NDJSON ingestion with pipelined parse, encode and upsert stages"""
+
+import asyncio
+import json
+import time
+import zlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.executor import InferenceExecutor
+from app.models import DocumentInput, IndexingResponse
+
+GZIP_MAGIC = b"\x1f\x8b"
+MAX_REPORTED_ERRORS = 100
+
+
+class IngestStreamingResponse(StreamingResponse):
+    """Streaming response that leaves the request body to the ingest pipeline
+
+    StreamingResponse normally watches for client disconnects by reading
+    receive(), which would consume the request body the pipeline is still
+    parsing. A disconnect here surfaces as a failed send instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+class StreamingIndexer:
+    """Indexes documents chunk by chunk through a three-stage pipeline
+
+    Reading (an NDJSON byte stream, optionally gzip-compressed, or an
+    in-memory document list), encoding and upserting run as concurrent stages
+    connected by bounded queues, so chunk k+1 is encoded while chunk k is
+    uploaded and the input is only consumed as fast as the encoder keeps up.
+    """
+
+    def __init__(
+        self,
+        engine,
+        executor: InferenceExecutor,
+        collection_name: str,
+        chunk_size: int = 256,
+        queue_size: int = 2,
+        incremental: bool = False,
+        chunking: bool = False
+    ):
+        self.engine = engine
+        self.executor = executor
+        self.collection_name = collection_name
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.incremental = incremental
+        self.chunking = chunking
+        self.received = 0
+        self.indexed = 0
+        self.failed = 0
+        self.new = 0
+        self.updated = 0
+        self.skipped = 0
+        self.errors: List[str] = []
+        self._started = time.time()
+        self._finished: Optional[float] = None
+
+    def _error(self, message: str):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    async def _parse(self, body: AsyncIterator[bytes], out: asyncio.Queue):
+        """Stage 1: split the byte stream into lines and validate documents"""
+        decoder: Optional[Any] = None
+        buffer = b""
+        line_number = 0
+        chunk: List[Dict[str, Any]] = []
+
+        async def handle(line: bytes):
+            nonlocal line_number, chunk
+            if not line.strip():
+                return
+            line_number += 1
+            self.received += 1
+            try:
+                doc = DocumentInput(**json.loads(line))
+                chunk.append({"id": doc.id, "text": doc.text, "metadata": doc.metadata or {}})
+            except Exception as e:
+                self.failed += 1
+                self._error(f"Line {line_number}: {e}")
+            if len(chunk) >= self.chunk_size:
+                await out.put(chunk)
+                chunk = []
+
+        try:
+            async for data in body:
+                if not data:
+                    continue
+                if decoder is None:
+                    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if data[:2] == GZIP_MAGIC else False
+                if decoder:
+                    data = decoder.decompress(data)
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    await handle(line)
+
+            if decoder:
+                buffer += decoder.flush()
+            for line in buffer.split(b"\n"):
+                await handle(line)
+            if chunk:
+                await out.put(chunk)
+        except Exception as e:
+            self._error(f"Stream aborted after line {line_number}: {e}")
+        finally:
+            await out.put(None)
+
+    async def _encode(self, inbox: asyncio.Queue, out: asyncio.Queue):
+        """Stage 2: encode chunks into hybrid points on the inference executor"""
+        try:
+            while (documents := await inbox.get()) is not None:
+                try:
+                    if self.incremental:
+                        documents = await self._skip_unchanged(documents)
+                    points = []
+                    if documents:
+                        points = await self.executor.run_when_available(
+                            self.engine.build_points, documents, self.chunking
+                        )
+                    await out.put(points)
+                except Exception as e:
+                    self.failed += len(documents)
+                    self._error(f"Encoding failed for {len(documents)} documents: {e}")
+        finally:
+            await out.put(None)
+
+    async def _skip_unchanged(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop documents already indexed with the same content"""
+        pending, counts = await self.executor.run_when_available(
+            self.engine.prepare_incremental, documents, self.collection_name, self.chunking
+        )
+        self.new += counts["new"]
+        self.updated += counts["updated"]
+        self.skipped += counts["skipped"]
+        self.indexed += counts["payload_updated"]
+        return pending
+
+    async def _upload(self, inbox: asyncio.Queue, progress: asyncio.Queue):
+        """Stage 3: upsert encoded chunks and report progress"""
+        try:
+            chunk_number = 0
+            while (points := await inbox.get()) is not None:
+                chunk_number += 1
+                if not points:
+                    await progress.put(self._progress(chunk_number))
+                    continue
+                try:
+                    if self.engine.async_qdrant_client is not None:
+                        count, errors = await self.engine.aupsert_points(self.collection_name, points)
+                    else:
+                        count, errors = await self.executor.run_when_available(
+                            self.engine.upsert_points, self.collection_name, points
+                        )
+                except Exception as e:
+                    count, errors = 0, [f"Upsert failed for {self.engine.document_count(points)} documents: {e}"]
+                self.indexed += count
+                self.failed += self.engine.document_count(points) - count
+                for error in errors:
+                    self._error(error)
+                await progress.put(self._progress(chunk_number))
+        finally:
+            await progress.put(None)
+
+    def _progress(self, chunk_number: int) -> Dict[str, Any]:
+        return {
+            "event": "progress",
+            "chunk": chunk_number,
+            "received": self.received,
+            "indexed": self.indexed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "docs_per_sec": self.docs_per_sec
+        }
+
+    async def _feed(self, documents: List[Dict[str, Any]], out: asyncio.Queue):
+        """Stage 1 for already-parsed documents: split them into chunks"""
+        try:
+            for start in range(0, len(documents), self.chunk_size):
+                chunk = documents[start:start + self.chunk_size]
+                self.received += len(chunk)
+                await out.put(chunk)
+        finally:
+            await out.put(None)
+
+    async def run(self, body: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+        """Consume an NDJSON body and yield progress events, then a final summary"""
+        async for event in self._run_stages(lambda out: self._parse(body, out)):
+            yield event
+
+    async def run_documents(self, documents: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Index a document list and yield progress events, then a final summary"""
+        async for event in self._run_stages(lambda out: self._feed(documents, out)):
+            yield event
+
+    async def _run_stages(self, reader: Callable[[asyncio.Queue], Awaitable[None]]) -> AsyncIterator[Dict[str, Any]]:
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        encoded: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        progress: asyncio.Queue = asyncio.Queue()
+        stages = [
+            asyncio.create_task(reader(parsed)),
+            asyncio.create_task(self._encode(parsed, encoded)),
+            asyncio.create_task(self._upload(encoded, progress))
+        ]
+
+        try:
+            while (event := await progress.get()) is not None:
+                yield event
+            await asyncio.gather(*stages)
+        finally:
+            # Client went away, job cancelled or a stage failed: stop the remaining stages
+            for stage in stages:
+                stage.cancel()
+            self._finished = time.time()
+
+        yield {"event": "done", **self.summary().dict()}
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the indexer started, frozen once the pipeline has ended"""
+        return (self._finished or time.time()) - self._started
+
+    @property
+    def docs_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.indexed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> IndexingResponse:
+        """Totals so far in the /index response shape"""
+        return IndexingResponse(
+            indexed_count=self.indexed,
+            failed_count=self.failed,
+            collection_name=self.collection_name,
+            processing_time_ms=self.elapsed * 1000,
+            errors=self.errors or None,
+            new_count=self.new if self.incremental else None,
+            updated_count=self.updated if self.incremental else None,
+            skipped_count=self.skipped if self.incremental else None
+        )
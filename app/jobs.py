@@ -0,0 +1,192 @@
+"""Asynchronous indexing jobs with a bounded in-process registry"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.executor import InferenceExecutor
+from app.ingest import StreamingIndexer
+from app.models import JobInfo, JobStatus
+
+FINISHED_STATES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are waiting to run"""
+
+
+class IndexingJob:
+    """State of one background indexing job"""
+
+    def __init__(
+        self,
+        documents: List[Dict[str, Any]],
+        collection_name: str,
+        incremental: bool = False,
+        chunking: bool = False
+    ):
+        self.id = uuid.uuid4().hex
+        self.collection_name = collection_name
+        self.incremental = incremental
+        self.chunking = chunking
+        self.documents: Optional[List[Dict[str, Any]]] = documents
+        self.total = len(documents)
+        self.status = JobStatus.QUEUED
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.indexer: Optional[StreamingIndexer] = None
+        self.task: Optional[asyncio.Task] = None
+        self.error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def info(self) -> JobInfo:
+        """Snapshot of the job for the API"""
+        indexed = failed = skipped = 0
+        docs_per_sec = 0.0
+        errors: List[str] = []
+        if self.indexer is not None:
+            indexed, failed = self.indexer.indexed, self.indexer.failed
+            skipped = self.indexer.skipped
+            docs_per_sec = self.indexer.docs_per_sec
+            errors = list(self.indexer.errors)
+        if self.error:
+            errors.append(self.error)
+
+        return JobInfo(
+            job_id=self.id,
+            status=self.status,
+            collection_name=self.collection_name,
+            total=self.total,
+            indexed_count=indexed,
+            failed_count=failed,
+            skipped_count=skipped if self.incremental else None,
+            progress=(indexed + failed + skipped) / self.total if self.total else 1.0,
+            docs_per_sec=docs_per_sec,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            errors=errors or None
+        )
+
+
+class JobManager:
+    """Runs indexing jobs on a fixed number of workers and keeps recent results"""
+
+    def __init__(
+        self,
+        engine,
+        executor: InferenceExecutor,
+        concurrency: int = 2,
+        max_queued: int = 100,
+        retention: int = 100,
+        chunk_size: int = 256,
+        queue_size: int = 2
+    ):
+        self.engine = engine
+        self.executor = executor
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.retention = retention
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self._jobs: "OrderedDict[str, IndexingJob]" = OrderedDict()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker tasks on the running event loop"""
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        """Cancel running jobs and stop the workers"""
+        for job in self._jobs.values():
+            if not job.finished:
+                self.cancel(job.id)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+    def submit(
+        self,
+        documents: List[Dict[str, Any]],
+        collection_name: str,
+        incremental: bool = False,
+        chunking: bool = False
+    ) -> IndexingJob:
+        """Register a job and queue it for a worker"""
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull(f"Job queue full ({self.max_queued} jobs waiting)")
+
+        job = IndexingJob(documents, collection_name, incremental, chunking)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[IndexingJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[IndexingJob]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[IndexingJob]:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, JobStatus.CANCELLED)
+        return job
+
+    def _finish(self, job: IndexingJob, status: JobStatus):
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        job.documents = None
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the retention limit"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.retention)]:
+            del self._jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.finished:
+                continue  # Cancelled while queued
+            job.task = asyncio.create_task(self._run(job))
+            await asyncio.wait([job.task])
+            self._prune()
+
+    async def _run(self, job: IndexingJob):
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        job.indexer = StreamingIndexer(
+            self.engine,
+            self.executor,
+            job.collection_name,
+            chunk_size=self.chunk_size,
+            queue_size=self.queue_size,
+            incremental=job.incremental,
+            chunking=job.chunking
+        )
+        try:
+            async for _ in job.indexer.run_documents(job.documents):
+                pass
+            self._finish(job, JobStatus.COMPLETED)
+        except asyncio.CancelledError:
+            self._finish(job, JobStatus.CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, JobStatus.FAILED)
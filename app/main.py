@@ -1,23 +1,42 @@
 """FastAPI application for Qdrant Hybrid Search"""
 
-from fastapi import FastAPI, HTTPException, Depends, Security, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Security, BackgroundTasks, Request, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import torch
+from fastapi.responses import JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import json
 import time
 import logging
 import structlog
-from typing import Optional, List
+from typing import Optional, List, Annotated, TYPE_CHECKING
 from contextlib import asynccontextmanager
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 from app.config import settings
+from app import metrics
 from app.models import (
-    DocumentBatch, SearchRequest, SearchResponse, SearchResult,
-    CollectionInfo, HealthStatus, IndexingResponse,
-    WebhookRequest, WebhookResponse
+    DocumentBatch, SearchRequest, SearchResponse,
+    BatchSearchRequest, BatchSearchResponse,
+    CollectionInfo, CollectionCreateRequest, HealthStatus, IndexingResponse, JobInfo,
+    PayloadIndexRequest, SearchProfile, WebhookRequest, WebhookResponse
 )
-from app.search_engine import HybridSearchEngine
+from app.executor import InferenceExecutor, ExecutorSaturated
+from app.batching import QueryCoalescer
+from app.ingest import StreamingIndexer, IngestStreamingResponse
+from app.jobs import JobManager, JobQueueFull
+from app.pagination import SearchPaginator, InvalidCursor
+from app.startup import StartupState
+from app.projection import resolve_projection
+from app.responses import FastJSONResponse
+
+if TYPE_CHECKING:
+    from app.search_engine import HybridSearchEngine
+
+# Started before anything heavy is imported, so startup timings cover the whole boot
+startup = StartupState()
 
 # Configure structured logging
 structlog.configure(
@@ -40,7 +59,23 @@ structlog.configure(
 logger = structlog.get_logger()
 
 # Global search engine instance
-search_engine: Optional[HybridSearchEngine] = None
+search_engine: Optional["HybridSearchEngine"] = None
+
+# Executor running model inference and Qdrant calls off the event loop
+inference_executor: Optional[InferenceExecutor] = None
+
+# Coalescer batching concurrent /search query encodings
+query_coalescer: Optional[QueryCoalescer] = None
+
+# Background indexing jobs for /index?async=true
+job_manager: Optional[JobManager] = None
+
+# Cursors and cached fused candidates for paginated /search
+search_paginator = SearchPaginator(
+    window=settings.search_cursor_window,
+    max_entries=settings.search_cursor_cache_size,
+    ttl=settings.search_cursor_ttl
+)
 
 # Security
 security = HTTPBearer(auto_error=False)
@@ -52,28 +87,132 @@ def verify_api_key(credentials: HTTPAuthorizationCredentials = Security(security
             raise HTTPException(status_code=403, detail="Invalid API key")
     return True
 
+def executor_saturated(e: ExecutorSaturated) -> HTTPException:
+    """Map a full inference queue to 503 with Retry-After"""
+    logger.warning("Inference executor saturated", **inference_executor.stats())
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+async def run_inference(fn, *args, **kwargs):
+    """Run blocking search engine work on the inference executor"""
+    try:
+        return await inference_executor.run(fn, *args, **kwargs)
+    except ExecutorSaturated as e:
+        raise executor_saturated(e)
+
+async def index_with_async_client(documents, collection_name=None, chunking=False):
+    """Encode on the inference executor, then upload with the async Qdrant client"""
+    try:
+        points = await run_inference(search_engine.build_points, documents, chunking)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error encoding documents", error=str(e))
+        return 0, [str(e)]
+    
+    return await search_engine.aupsert_points(
+        collection_name or settings.qdrant_collection,
+        points
+    )
+
+def build_search_engine() -> "HybridSearchEngine":
+    """Import the model stack and create the engine; blocking, runs off the event loop"""
+    with startup.phase("imports"):
+        import torch
+        from app.search_engine import HybridSearchEngine
+    
+    startup.gpu_available = torch.cuda.is_available()
+    startup.gpu_name = torch.cuda.get_device_name(0) if startup.gpu_available else None
+    
+    with startup.phase("engine"):
+        return HybridSearchEngine()
+
+async def initialize():
+    """Build the search engine, load and warm up models, then mark the service ready
+    
+    A worker forked by app.prefork starts with the engine already loaded and
+    only sets up what is per process: Qdrant clients, warmup, coalescer and jobs.
+    """
+    global search_engine, query_coalescer, job_manager
+    
+    try:
+        if search_engine is None:
+            search_engine = await run_in_threadpool(build_search_engine)
+            
+            with startup.phase("models"):
+                success = await run_in_threadpool(search_engine.load_models)
+        else:
+            # Models were loaded by the preforking parent (app.prefork) and are shared copy-on-write
+            search_engine.reconnect()
+            success = True
+        
+        if success and settings.warmup_on_startup:
+            with startup.phase("warmup"):
+                await run_in_threadpool(search_engine.warmup)
+        
+        if settings.query_coalescing:
+            query_coalescer = QueryCoalescer(
+                search_engine,
+                inference_executor,
+                window_ms=settings.coalesce_window_ms,
+                max_batch=settings.coalesce_max_batch
+            )
+        
+        job_manager = JobManager(
+            search_engine,
+            inference_executor,
+            concurrency=settings.job_concurrency,
+            max_queued=settings.job_queue_size,
+            retention=settings.job_retention,
+            chunk_size=settings.stream_chunk_size,
+            queue_size=settings.stream_queue_size
+        )
+        job_manager.start()
+        metrics.bind_gauges(search_engine, inference_executor)
+        
+        if not success:
+            logger.error("Failed to load models", models=search_engine.model_state)
+            startup.mark_failed("Failed to load models")
+            return
+        
+        # Create default collection
+        with startup.phase("collection"):
+            await run_in_threadpool(search_engine.create_collection)
+        startup.mark_ready()
+        logger.info(
+            "Search engine initialized successfully",
+            startup_seconds=startup.phases,
+            model_load_seconds=search_engine.model_load_seconds,
+            gpu_available=startup.gpu_available
+        )
+    except Exception as e:
+        logger.exception("Search engine initialization failed", error=str(e))
+        startup.mark_failed(str(e))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
-    global search_engine
-    
-    # Startup
-    logger.info("Starting Qdrant Hybrid Search API", gpu_available=torch.cuda.is_available())
+    global inference_executor
     
-    search_engine = HybridSearchEngine()
-    success = search_engine.load_models()
+    # Startup: bind the port right away, load models in the background
+    logger.info("Starting Qdrant Hybrid Search API", import_seconds=startup.elapsed())
     
-    if not success:
-        logger.error("Failed to load models")
-    else:
-        # Create default collection
-        search_engine.create_collection()
-        logger.info("Search engine initialized successfully")
+    inference_executor = InferenceExecutor(
+        max_workers=settings.num_workers,
+        max_queue=settings.inference_queue_size
+    )
+    initialization = asyncio.create_task(initialize())
     
     yield
     
     # Shutdown
     logger.info("Shutting down Qdrant Hybrid Search API")
+    if not initialization.done():
+        initialization.cancel()
+    if job_manager is not None:
+        await job_manager.stop()
+    inference_executor.shutdown(wait=False)
+    if search_engine is not None and search_engine.async_qdrant_client is not None:
+        await search_engine.async_qdrant_client.close()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -92,23 +231,68 @@ if settings.cors_enabled:
         allow_headers=["*"],
     )
 
+# Endpoints answered while the search engine is still starting
+STARTUP_EXEMPT_PATHS = {"/", "/livez", "/readyz", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+@app.middleware("http")
+async def reject_until_ready(request: Request, call_next):
+    """Answer 503 with Retry-After until background initialization has finished"""
+    if not startup.finished and request.url.path not in STARTUP_EXEMPT_PATHS:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Service is starting", "phase": startup.current},
+            headers={"Retry-After": "5"}
+        )
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe request latency per route template"""
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.REQUEST_SECONDS.labels(
+        request.method,
+        route.path if route else "unmatched",
+        str(response.status_code)
+    ).observe(time.perf_counter() - start_time)
+    return response
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics endpoint"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/livez")
+async def liveness():
+    """Liveness probe: the process is up and its event loop responds"""
+    return {"status": "alive", "uptime_seconds": startup.elapsed()}
+
+@app.get("/readyz")
+async def readiness():
+    """Readiness probe: models loaded and warmed up, default collection created"""
+    models_state = (
+        search_engine.model_state if search_engine
+        else {"dense": "pending", "sparse": "pending"}
+    )
+    status = "ready" if startup.ready else "failed" if startup.error else "starting"
+    return JSONResponse(
+        status_code=200 if startup.ready else 503,
+        content={"status": status, "models": models_state, "startup": startup.stats()}
+    )
+
 @app.get("/health", response_model=HealthStatus)
 async def health_check():
     """Health check endpoint"""
-    gpu_name = None
-    gpu_available = torch.cuda.is_available()
-    
-    if gpu_available:
-        gpu_name = torch.cuda.get_device_name(0)
-    
     try:
-        # Check Qdrant connection
-        collections = search_engine.qdrant_client.get_collections()
+        # Check Qdrant connection without blocking the event loop
+        collections = await run_in_threadpool(search_engine.qdrant_client.get_collections)
         qdrant_connected = True
     except:
         qdrant_connected = False
     
     models_loaded = (
+        search_engine is not None and
         search_engine.dense_model is not None and 
         search_engine.sparse_model is not None
     )
@@ -116,8 +300,8 @@ async def health_check():
     return HealthStatus(
         status="healthy" if models_loaded and qdrant_connected else "degraded",
         qdrant_connected=qdrant_connected,
-        gpu_available=gpu_available,
-        gpu_name=gpu_name,
+        gpu_available=startup.gpu_available,
+        gpu_name=startup.gpu_name,
         models_loaded=models_loaded,
         version=settings.api_version
     )
@@ -126,9 +310,10 @@ async def health_check():
 async def index_documents(
     batch: DocumentBatch,
     background_tasks: BackgroundTasks,
+    run_async: Annotated[bool, Query(alias="async")] = False,
     authorized: bool = Depends(verify_api_key)
 ):
-    """Index documents into the search engine"""
+    """Index documents into the search engine, or queue a background job with ?async=true"""
     if not search_engine or not search_engine.dense_model:
         raise HTTPException(status_code=503, detail="Search engine not initialized")
     
@@ -144,62 +329,399 @@ async def index_documents(
         for doc in batch.documents
     ]
     
+    incremental = settings.incremental_indexing if batch.incremental is None else batch.incremental
+    chunking = settings.chunk_documents if batch.chunking is None else batch.chunking
+    
+    if run_async:
+        try:
+            job = job_manager.submit(
+                documents,
+                batch.collection_name or settings.qdrant_collection,
+                incremental,
+                chunking
+            )
+        except JobQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+        return JSONResponse(status_code=202, content=jsonable_encoder(job.info()))
+    
+    # Skip documents whose content is already indexed
+    pending = documents
+    counts = {"new": None, "updated": None, "skipped": 0, "payload_updated": 0}
+    if incremental:
+        pending, counts = await run_inference(
+            search_engine.prepare_incremental,
+            documents,
+            batch.collection_name,
+            chunking
+        )
+    
     # Index documents
-    indexed_count, errors = search_engine.index_documents(
-        documents,
-        batch.collection_name
-    )
+    if not pending:
+        indexed_count, errors = 0, []
+    elif search_engine.async_qdrant_client is not None:
+        indexed_count, errors = await index_with_async_client(
+            pending,
+            batch.collection_name,
+            chunking
+        )
+    else:
+        indexed_count, errors = await run_inference(
+            search_engine.index_documents,
+            pending,
+            batch.collection_name,
+            chunking=chunking
+        )
+    indexed_count += counts["payload_updated"]
     
     processing_time = (time.time() - start_time) * 1000
     
     return IndexingResponse(
         indexed_count=indexed_count,
-        failed_count=len(documents) - indexed_count,
+        failed_count=len(documents) - indexed_count - counts["skipped"],
         collection_name=batch.collection_name or settings.qdrant_collection,
         processing_time_ms=processing_time,
-        errors=errors if errors else None
+        errors=errors if errors else None,
+        new_count=counts["new"],
+        updated_count=counts["updated"],
+        skipped_count=counts["skipped"] if incremental else None
     )
 
-@app.post("/search", response_model=SearchResponse)
-async def search(
-    request: SearchRequest,
+@app.post("/index/stream")
+async def index_documents_stream(
+    request: Request,
+    collection_name: Optional[str] = None,
+    incremental: Optional[bool] = None,
+    chunking: Optional[bool] = None,
     authorized: bool = Depends(verify_api_key)
 ):
-    """Perform hybrid search"""
+    """Index an NDJSON (optionally gzip-compressed) document stream with progress events"""
     if not search_engine or not search_engine.dense_model:
         raise HTTPException(status_code=503, detail="Search engine not initialized")
     
-    start_time = time.time()
+    indexer = StreamingIndexer(
+        search_engine,
+        inference_executor,
+        collection_name or settings.qdrant_collection,
+        chunk_size=settings.stream_chunk_size,
+        queue_size=settings.stream_queue_size,
+        incremental=settings.incremental_indexing if incremental is None else incremental,
+        chunking=settings.chunk_documents if chunking is None else chunking
+    )
     
-    # Perform search
-    results = search_engine.search(
+    async def events():
+        async for event in indexer.run(request.stream()):
+            yield json.dumps(event) + "\n"
+    
+    return IngestStreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/jobs", response_model=List[JobInfo])
+async def list_jobs(authorized: bool = Depends(verify_api_key)):
+    """List queued, running and recently finished indexing jobs"""
+    if not job_manager:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    return [job.info() for job in job_manager.list()]
+
+@app.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job(
+    job_id: str,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Get progress, throughput and errors of an indexing job"""
+    if not job_manager:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.info()
+
+@app.delete("/jobs/{job_id}", response_model=JobInfo)
+async def cancel_job(
+    job_id: str,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Cancel a queued or running indexing job"""
+    if not job_manager:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    job = job_manager.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.info()
+
+async def execute_search(request: SearchRequest, limit: int, offset: int, cache_key=None):
+    """Encode the query and run it against Qdrant on the configured path"""
+    # Encode the query together with other concurrent searches
+    dense_query = sparse_query = None
+    if query_coalescer is not None:
+        try:
+            dense_query, sparse_query = await query_coalescer.encode(
+                request.query,
+                request.mode.value
+            )
+        except ExecutorSaturated as e:
+            raise executor_saturated(e)
+    
+    if search_engine.async_qdrant_client is not None:
+        if query_coalescer is None:
+            dense_queries, sparse_queries = await run_inference(
+                search_engine.encode_queries,
+                [request.query],
+                [request.mode.value]
+            )
+            dense_query, sparse_query = dense_queries[0], sparse_queries[0]
+        return await search_engine.asearch(
+            query=request.query,
+            mode=request.mode.value,
+            limit=limit,
+            filters=request.filters,
+            collection_name=request.collection_name,
+            dense_query=dense_query,
+            sparse_query=sparse_query,
+            offset=offset,
+            cache_key=cache_key,
+            oversampling=request.oversampling,
+            rescore=request.rescore,
+            fusion=request.fusion.value if request.fusion else None,
+            fusion_weight=request.fusion_weight,
+            group_size=request.group_size if request.group_by_parent else None,
+            prefetch=request.prefetch,
+            hnsw_ef=request.hnsw_ef,
+            exact=request.exact,
+            projection=projection_of(request)
+        )
+    
+    return await run_inference(
+        search_engine.search,
         query=request.query,
         mode=request.mode.value,
-        limit=request.limit,
+        limit=limit,
         filters=request.filters,
-        collection_name=request.collection_name
+        collection_name=request.collection_name,
+        dense_query=dense_query,
+        sparse_query=sparse_query,
+        offset=offset,
+        cache_key=cache_key,
+        oversampling=request.oversampling,
+        rescore=request.rescore,
+        fusion=request.fusion.value if request.fusion else None,
+        fusion_weight=request.fusion_weight,
+        group_size=request.group_size if request.group_by_parent else None,
+        prefetch=request.prefetch,
+        hnsw_ef=request.hnsw_ef,
+        exact=request.exact,
+        projection=projection_of(request)
     )
+
+def projection_of(request: SearchRequest):
+    """Payload projection requested by a search, None for full payloads"""
+    return resolve_projection(
+        request.include_text,
+        request.metadata_fields,
+        request.max_text_chars,
+        request.snippet,
+        settings.snippet_chars
+    )
+
+def search_result(r) -> dict:
+    """Shape a result dict from the search engine like the SearchResult model"""
+    return {
+        "id": str(r["id"]),
+        "score": r["score"],
+        "text": r["text"],
+        "metadata": r["metadata"],
+        "dense_score": r.get("dense_score"),
+        "sparse_score": r.get("sparse_score"),
+        "parent_id": r.get("parent_id"),
+        "chunk_index": r.get("chunk_index"),
+        "chunk_start": r.get("chunk_start"),
+        "chunk_end": r.get("chunk_end"),
+        "chunks": [
+            {
+                "id": str(chunk["id"]),
+                "score": chunk["score"],
+                "text": chunk["text"],
+                "chunk_index": chunk.get("chunk_index"),
+                "chunk_start": chunk.get("chunk_start"),
+                "chunk_end": chunk.get("chunk_end")
+            }
+            for chunk in r["chunks"]
+        ] if r.get("chunks") is not None else None
+    }
+
+def validate_grouping(request: SearchRequest):
+    """Reject options that grouped (parent document) search cannot honour"""
+    if not request.group_by_parent:
+        return
+    if request.paginate or request.cursor:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with group_by_parent; use offset")
     
-    processing_time = (time.time() - start_time) * 1000
+    fusion = request.fusion.value if request.fusion else settings.fusion_method
+    weight = settings.fusion_weight if request.fusion_weight is None else request.fusion_weight
+    if request.mode.value == "hybrid" and not (fusion == "rrf" or (fusion == "dbsf" and weight == 0.5)):
+        raise HTTPException(
+            status_code=400,
+            detail="Grouped hybrid search supports fusion rrf, or dbsf with fusion_weight 0.5"
+        )
+
+async def run_search(request: SearchRequest) -> dict:
+    """Run a search and return the response as a plain dict with the SearchResponse shape"""
+    if not search_engine or not search_engine.dense_model:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
     
-    # Convert to response format
-    search_results = [
-        SearchResult(
-            id=r["id"],
-            score=r["score"],
-            text=r["text"],
-            metadata=r["metadata"]
+    validate_grouping(request)
+    start_time = time.time()
+    
+    offset = request.offset
+    next_cursor = None
+    paginate = request.paginate or request.cursor is not None
+    fingerprint = search_paginator.fingerprint(
+        request.query,
+        request.mode.value,
+        request.filters,
+        request.collection_name or settings.qdrant_collection,
+        {
+            "oversampling": request.oversampling,
+            "rescore": request.rescore,
+            "fusion": request.fusion,
+            "fusion_weight": request.fusion_weight,
+            "group_size": request.group_size if request.group_by_parent else None,
+            "prefetch": request.prefetch,
+            "hnsw_ef": request.hnsw_ef,
+            "exact": request.exact,
+            "projection": projection_of(request)
+        }
+    )
+    
+    # Resume from a cursor; its cached candidates may make the query unnecessary
+    cached = None
+    if request.cursor:
+        try:
+            offset, cached = search_paginator.resume(request.cursor, fingerprint)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # Perform search
+    if cached is not None and search_paginator.covers(cached, offset, request.limit):
+        results = []
+    elif paginate and request.mode.value == "hybrid":
+        # Fetch a window of fused candidates from rank 0 and keep it for the next pages
+        fetched = search_paginator.fetch_size(offset, request.limit)
+        results = await execute_search(request, fetched, 0)
+        cached = search_paginator.store(results, fetched)
+    else:
+        cached = None
+        # Repeated searches are served from the result cache without encoding the query
+        cache_key = search_engine.search_cache_key(
+            request.query,
+            request.mode.value,
+            request.limit,
+            offset,
+            request.filters,
+            request.collection_name or settings.qdrant_collection,
+            oversampling=request.oversampling,
+            rescore=request.rescore,
+            fusion=request.fusion.value if request.fusion else settings.fusion_method,
+            fusion_weight=settings.fusion_weight if request.fusion_weight is None else request.fusion_weight,
+            group_size=request.group_size if request.group_by_parent else None,
+            prefetch=request.prefetch,
+            hnsw_ef=request.hnsw_ef,
+            exact=request.exact,
+            projection=projection_of(request)
         )
-        for r in results
-    ]
+        results = search_engine.get_cached_results(cache_key)
+        if results is None:
+            results = await execute_search(request, request.limit, offset, cache_key)
     
-    return SearchResponse(
-        query=request.query,
-        mode=request.mode.value,
-        results=search_results,
-        total=len(search_results),
-        processing_time_ms=processing_time
+    if paginate:
+        results, next_cursor = search_paginator.page(
+            results, offset, request.limit, fingerprint, cached
+        )
+    
+    processing_time = (time.time() - start_time) * 1000
+    search_results = [search_result(r) for r in results]
+    
+    return {
+        "query": request.query,
+        "mode": request.mode.value,
+        "results": search_results,
+        "total": len(search_results),
+        "processing_time_ms": processing_time,
+        "offset": offset,
+        "next_cursor": next_cursor
+    }
+
+@app.post("/search", response_model=SearchResponse)
+async def search(
+    request: SearchRequest,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Perform hybrid search"""
+    # Serialize the result dicts directly; long passages make a per-hit model rebuild expensive
+    return FastJSONResponse(await run_search(request))
+
+@app.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    request: BatchSearchRequest,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Run many searches with one encode pass and one Qdrant batch query"""
+    if not search_engine or not search_engine.dense_model:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    if any(search.paginate or search.cursor for search in request.searches):
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported in batch search; use offset")
+    if any(search.group_by_parent for search in request.searches):
+        raise HTTPException(status_code=400, detail="group_by_parent is not supported in batch search")
+    
+    start_time = time.time()
+    
+    outputs, timings = await run_inference(
+        search_engine.search_batch,
+        [
+            {
+                "query": search.query,
+                "mode": search.mode.value,
+                "limit": search.limit,
+                "offset": search.offset,
+                "filters": search.filters,
+                "collection_name": search.collection_name,
+                "oversampling": search.oversampling,
+                "rescore": search.rescore,
+                "fusion": search.fusion.value if search.fusion else None,
+                "fusion_weight": search.fusion_weight,
+                "prefetch": search.prefetch,
+                "hnsw_ef": search.hnsw_ef,
+                "exact": search.exact,
+                "projection": projection_of(search)
+            }
+            for search in request.searches
+        ]
     )
+    
+    responses = [
+        {
+            "query": search.query,
+            "mode": search.mode.value,
+            "results": [search_result(r) for r in results],
+            "total": len(results),
+            "processing_time_ms": elapsed_ms,
+            "offset": search.offset,
+            "next_cursor": None
+        }
+        for search, (results, elapsed_ms) in zip(request.searches, outputs)
+    ]
+    
+    return FastJSONResponse({
+        "results": responses,
+        "total": len(responses),
+        "encode_time_ms": timings["encode_ms"],
+        "qdrant_time_ms": timings["qdrant_ms"],
+        "processing_time_ms": (time.time() - start_time) * 1000
+    })
 
 @app.get("/collections", response_model=List[str])
 async def list_collections(authorized: bool = Depends(verify_api_key)):
@@ -213,6 +735,28 @@ async def list_collections(authorized: bool = Depends(verify_api_key)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/collections")
+async def create_collection(
+    request: CollectionCreateRequest,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Create a collection from a profile, with optional per-option overrides"""
+    if not search_engine:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    options = request.model_dump(exclude={"name", "profile", "quantization"}, exclude_none=True, mode="json")
+    success = await run_in_threadpool(
+        search_engine.create_collection,
+        request.name,
+        request.quantization.value if request.quantization else None,
+        profile=request.profile,
+        **options
+    )
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to create collection")
+    
+    return {"message": f"Collection {request.name} ready"}
+
 @app.get("/collections/{name}", response_model=CollectionInfo)
 async def get_collection_info(
     name: str,
@@ -246,6 +790,52 @@ async def delete_collection(
     
     return {"message": f"Collection {name} deleted successfully"}
 
+@app.put("/collections/{name}/search-profile")
+async def set_search_profile(
+    name: str,
+    request: SearchProfile,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Set a collection's default hybrid prefetch depth, hnsw_ef and exact search"""
+    if not search_engine:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    profile = request.model_dump(exclude_none=True)
+    success = await run_in_threadpool(search_engine.set_search_profile, name, profile)
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to set search profile")
+    
+    return {"message": f"Search profile of {name} updated", "search_profile": profile}
+
+@app.post("/collections/{name}/indexes")
+async def create_payload_index(
+    name: str,
+    request: PayloadIndexRequest,
+    authorized: bool = Depends(verify_api_key)
+):
+    """Create a payload index on a metadata field used in search filters"""
+    if not search_engine:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+    
+    success = await run_in_threadpool(
+        search_engine.create_payload_index, request.field, request.schema_type, name
+    )
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to create payload index")
+    
+    return {"message": f"Payload index on {request.field} ({request.schema_type}) created in {name}"}
+
+@app.get("/cache/stats")
+async def cache_stats(authorized: bool = Depends(verify_api_key)):
+    """Get embedding and search result cache hit/miss/eviction counters"""
+    if not search_engine:
+        raise HTTPException(status_code=503, detail="Search engine not initialized")
+
+    return {
+        **search_engine.cache_stats(),
+        "search_results": search_engine.search_cache_stats()
+    }
+
 @app.post("/webhook", response_model=WebhookResponse)
 async def webhook_handler(
     request: WebhookRequest,
@@ -260,10 +850,10 @@ async def webhook_handler(
         if request.action == "search":
             # Perform search
             search_req = SearchRequest(**request.data)
-            results = await search(search_req, authorized=True)
+            results = await run_search(search_req)
             return WebhookResponse(
                 success=True,
-                data=results.dict(),
+                data=results,
                 webhook_id=request.webhook_id
             )
             
@@ -298,9 +888,10 @@ async def root():
     return {
         "name": settings.api_title,
         "version": settings.api_version,
-        "gpu": torch.cuda.get_device_name(0) if torch.cuda.is_available() else "Not available",
+        "gpu": startup.gpu_name or "Not available",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/readyz"
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+"""Prometheus metrics for encoding, Qdrant calls and HTTP requests"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+# Model inference
+DENSE_ENCODE_SECONDS = Histogram(
+    "hybrid_dense_encode_seconds",
+    "Dense model forward pass latency per batch",
+    ["mode"],
+    buckets=LATENCY_BUCKETS
+)
+SPARSE_ENCODE_SECONDS = Histogram(
+    "hybrid_sparse_encode_seconds",
+    "Sparse model forward pass latency per batch",
+    ["max_length"],
+    buckets=LATENCY_BUCKETS
+)
+ENCODE_BATCH_SIZE = Histogram(
+    "hybrid_encode_batch_size",
+    "Texts per encoder forward pass",
+    ["encoder"],
+    buckets=BATCH_BUCKETS
+)
+
+# Qdrant
+QDRANT_QUERY_SECONDS = Histogram(
+    "hybrid_qdrant_query_seconds",
+    "Qdrant query latency",
+    ["mode", "collection"],
+    buckets=LATENCY_BUCKETS
+)
+QDRANT_UPSERT_SECONDS = Histogram(
+    "hybrid_qdrant_upsert_seconds",
+    "Qdrant upsert latency per batch",
+    ["collection"],
+    buckets=LATENCY_BUCKETS
+)
+UPSERT_BATCH_SIZE = Histogram(
+    "hybrid_upsert_batch_size",
+    "Points per Qdrant upsert call",
+    buckets=BATCH_BUCKETS
+)
+DOCUMENTS_INDEXED = Counter(
+    "hybrid_documents_indexed",
+    "Documents written to Qdrant (use rate() for docs/sec)",
+    ["collection"]
+)
+
+# HTTP
+REQUEST_SECONDS = Histogram(
+    "hybrid_http_request_seconds",
+    "HTTP request latency",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+# Sampled from live objects at scrape time (see bind_gauges)
+EMBEDDING_CACHE_HIT_RATIO = Gauge(
+    "hybrid_embedding_cache_hit_ratio",
+    "Embedding cache hits / lookups since start"
+)
+SEARCH_CACHE_HIT_RATIO = Gauge(
+    "hybrid_search_cache_hit_ratio",
+    "Search result cache hits / lookups since start"
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "hybrid_executor_queue_depth",
+    "Tasks waiting for an inference worker"
+)
+EXECUTOR_RUNNING = Gauge(
+    "hybrid_executor_running",
+    "Tasks currently running on inference workers"
+)
+
+
+def bind_gauges(engine, executor):
+    """Point the sampled gauges at the running search engine and executor"""
+    EMBEDDING_CACHE_HIT_RATIO.set_function(
+        lambda: engine.cache_stats().get("hit_ratio", 0.0)
+    )
+    SEARCH_CACHE_HIT_RATIO.set_function(
+        lambda: engine.search_cache_stats().get("hit_ratio", 0.0)
+    )
+    EXECUTOR_QUEUE_DEPTH.set_function(lambda: executor.queue_depth)
+    EXECUTOR_RUNNING.set_function(lambda: executor.stats()["running"])
@@ -1,16 +1,47 @@
 """Data models for the Hybrid Search API"""
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from enum import Enum
 
+from app.filters import build_filter, PAYLOAD_SCHEMAS
+from app.profiles import COLLECTION_PROFILES
+
 class SearchMode(str, Enum):
     """Search modes available"""
     HYBRID = "hybrid"
     DENSE = "dense"
     SPARSE = "sparse"
 
+class FusionMethod(str, Enum):
+    """Fusion strategies for hybrid search"""
+    RRF = "rrf"
+    DBSF = "dbsf"
+    MINMAX = "minmax"
+    ZSCORE = "zscore"
+
+class QuantizationType(str, Enum):
+    """Dense vector quantization for collections"""
+    NONE = "none"
+    SCALAR = "scalar"
+    PRODUCT = "product"
+    BINARY = "binary"
+
+class SparseDatatype(str, Enum):
+    """Value precision of the sparse index"""
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    UINT8 = "uint8"
+
+class JobStatus(str, Enum):
+    """Lifecycle states of an asynchronous indexing job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
 class DocumentInput(BaseModel):
     """Model for document input"""
     id: Optional[str] = Field(default=None, description="Document ID")
@@ -21,6 +52,14 @@ class DocumentBatch(BaseModel):
     """Model for batch document upload"""
     documents: List[DocumentInput] = Field(..., description="List of documents to index")
     collection_name: Optional[str] = Field(default=None, description="Target collection name")
+    incremental: Optional[bool] = Field(
+        default=None,
+        description="Skip documents whose content is already indexed (defaults to INCREMENTAL_INDEXING)"
+    )
+    chunking: Optional[bool] = Field(
+        default=None,
+        description="Split long documents into overlapping token-bounded chunks (defaults to CHUNK_DOCUMENTS)"
+    )
 
 class SearchRequest(BaseModel):
     """Model for search requests"""
@@ -30,6 +69,37 @@ class SearchRequest(BaseModel):
     offset: int = Field(default=0, ge=0, description="Offset for pagination")
     filters: Optional[Dict[str, Any]] = Field(default=None, description="Metadata filters")
     collection_name: Optional[str] = Field(default=None, description="Collection to search")
+    paginate: bool = Field(default=False, description="Return a next_cursor for the following page")
+    cursor: Optional[str] = Field(default=None, description="next_cursor from the previous page (overrides offset)")
+    oversampling: Optional[float] = Field(default=None, ge=1.0, description="Quantized candidates per result before rescoring")
+    rescore: Optional[bool] = Field(default=None, description="Rescore quantized candidates with the original vectors")
+    fusion: Optional[FusionMethod] = Field(default=None, description="Hybrid fusion strategy (default from settings)")
+    fusion_weight: Optional[float] = Field(default=None, ge=0.0, le=1.0, description="Dense weight in hybrid fusion; sparse gets 1 - weight")
+    group_by_parent: bool = Field(default=False, description="Return unique parent documents instead of chunks")
+    group_size: int = Field(default=1, ge=1, le=10, description="Matching chunks returned per document when grouping")
+    prefetch: Optional[int] = Field(default=None, ge=1, le=10000, description="Candidates per hybrid branch (default from the collection's search profile)")
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=10000, description="HNSW beam width of the dense search")
+    exact: Optional[bool] = Field(default=None, description="Exact dense search, bypassing the HNSW index")
+    include_text: bool = Field(default=True, description="Return the text of each hit")
+    metadata_fields: Optional[List[str]] = Field(default=None, description="Metadata keys to return (default all, [] for none)")
+    max_text_chars: Optional[int] = Field(default=None, ge=1, le=100000, description="Truncate returned texts to this many characters")
+    snippet: bool = Field(default=False, description="Return a window around the query terms instead of the text prefix")
+    
+    @field_validator("filters")
+    @classmethod
+    def validate_filters(cls, filters):
+        """Reject filters that cannot be translated to a Qdrant filter"""
+        build_filter(filters)
+        return filters
+    
+class ChunkHit(BaseModel):
+    """Model for a matching chunk of a grouped search result"""
+    id: str = Field(..., description="Chunk point ID")
+    score: float = Field(..., description="Relevance score")
+    text: str = Field(..., description="Chunk text")
+    chunk_index: Optional[int] = Field(default=None, description="Position of the chunk in its document")
+    chunk_start: Optional[int] = Field(default=None, description="Character offset of the chunk in its document")
+    chunk_end: Optional[int] = Field(default=None, description="Character offset where the chunk ends")
     
 class SearchResult(BaseModel):
     """Model for individual search result"""
@@ -39,6 +109,11 @@ class SearchResult(BaseModel):
     metadata: Dict[str, Any] = Field(default={}, description="Document metadata")
     dense_score: Optional[float] = Field(default=None, description="Dense embedding score")
     sparse_score: Optional[float] = Field(default=None, description="Sparse embedding score")
+    parent_id: Optional[str] = Field(default=None, description="ID of the document a chunk belongs to")
+    chunk_index: Optional[int] = Field(default=None, description="Position of the chunk in its document")
+    chunk_start: Optional[int] = Field(default=None, description="Character offset of the chunk in its document")
+    chunk_end: Optional[int] = Field(default=None, description="Character offset where the chunk ends")
+    chunks: Optional[List[ChunkHit]] = Field(default=None, description="Matching chunks of the document (grouped search)")
 
 class SearchResponse(BaseModel):
     """Model for search response"""
@@ -47,13 +122,73 @@ class SearchResponse(BaseModel):
     results: List[SearchResult] = Field(..., description="Search results")
     total: int = Field(..., description="Total number of results")
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
+    offset: int = Field(default=0, description="Offset of the first result")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, if any")
     
+class BatchSearchRequest(BaseModel):
+    """Model for running many searches in one request"""
+    searches: List[SearchRequest] = Field(..., min_length=1, max_length=100, description="Searches to run")
+    
+class BatchSearchResponse(BaseModel):
+    """Model for batch search response"""
+    results: List[SearchResponse] = Field(..., description="One response per search, in input order")
+    total: int = Field(..., description="Number of searches")
+    encode_time_ms: float = Field(..., description="Time spent encoding all queries")
+    qdrant_time_ms: float = Field(..., description="Time spent in Qdrant batch queries")
+    processing_time_ms: float = Field(..., description="Processing time in milliseconds")
+    
+class CollectionCreateRequest(BaseModel):
+    """Model for creating a collection; unset options come from the profile"""
+    name: str = Field(..., description="Collection name")
+    profile: Optional[str] = Field(default=None, description=f"One of: {', '.join(COLLECTION_PROFILES)} (default COLLECTION_PROFILE)")
+    quantization: Optional[QuantizationType] = Field(default=None, description="Dense vector quantization (default from settings)")
+    on_disk: Optional[bool] = Field(default=None, description="Keep original dense vectors on disk")
+    sparse_on_disk: Optional[bool] = Field(default=None, description="Keep the sparse index on disk")
+    sparse_datatype: Optional[SparseDatatype] = Field(default=None, description="Sparse index value precision (default float32)")
+    sparse_idf: Optional[bool] = Field(default=None, description="Weight sparse query terms by their IDF in the collection")
+    on_disk_payload: Optional[bool] = Field(default=None, description="Keep payloads on disk")
+    shard_number: Optional[int] = Field(default=None, ge=1, le=64, description="Number of shards")
+    replication_factor: Optional[int] = Field(default=None, ge=1, le=10, description="Copies of each shard (cluster mode)")
+    hnsw_m: Optional[int] = Field(default=None, ge=0, le=128, description="HNSW edges per node; 0 disables the graph")
+    hnsw_ef_construct: Optional[int] = Field(default=None, ge=4, le=1024, description="HNSW build-time candidate list size")
+    hnsw_on_disk: Optional[bool] = Field(default=None, description="Keep the HNSW graph on disk")
+    default_segment_number: Optional[int] = Field(default=None, ge=1, le=128, description="Target number of segments")
+    max_segment_size: Optional[int] = Field(default=None, ge=1, description="Maximum segment size in KB")
+    indexing_threshold: Optional[int] = Field(default=None, ge=0, description="Segment size in KB above which HNSW is built; 0 disables indexing")
+    
+    @field_validator("profile")
+    @classmethod
+    def validate_profile(cls, profile):
+        if profile is not None and profile not in COLLECTION_PROFILES:
+            raise ValueError(f"profile must be one of: {', '.join(COLLECTION_PROFILES)}")
+        return profile
+    
+class SearchProfile(BaseModel):
+    """Model for a collection's default search parameters; unset ones come from settings"""
+    prefetch_min: Optional[int] = Field(default=None, ge=1, le=10000, description="Candidates per hybrid branch, at least")
+    prefetch_factor: Optional[float] = Field(default=None, ge=1.0, le=100.0, description="Candidates per hybrid branch per requested result")
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=10000, description="HNSW beam width of the dense search")
+    exact: Optional[bool] = Field(default=None, description="Exact dense search, bypassing the HNSW index")
+    
+class PayloadIndexRequest(BaseModel):
+    """Model for creating a payload index on a metadata field"""
+    field: str = Field(..., description="Metadata field, e.g. 'category' or 'metadata.category'")
+    schema_type: str = Field(default="keyword", description=f"One of: {', '.join(PAYLOAD_SCHEMAS)}")
+    
+    @field_validator("schema_type")
+    @classmethod
+    def validate_schema_type(cls, schema_type):
+        if schema_type not in PAYLOAD_SCHEMAS:
+            raise ValueError(f"schema_type must be one of: {', '.join(PAYLOAD_SCHEMAS)}")
+        return schema_type
+
 class CollectionInfo(BaseModel):
     """Model for collection information"""
     name: str = Field(..., description="Collection name")
     vectors_count: int = Field(..., description="Number of vectors in collection")
     points_count: int = Field(..., description="Number of points in collection")
-    config: Dict[str, Any] = Field(..., description="Collection configuration")
+    config: Dict[str, Any] = Field(..., description="Effective collection configuration")
+    status: Dict[str, Any] = Field(default={}, description="Optimizer, segment and indexing status")
     
 class HealthStatus(BaseModel):
     """Model for health check response"""
@@ -72,6 +207,25 @@ class IndexingResponse(BaseModel):
     collection_name: str = Field(..., description="Collection name")
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
     errors: Optional[List[str]] = Field(default=None, description="List of errors if any")
+    new_count: Optional[int] = Field(default=None, description="New documents (incremental mode)")
+    updated_count: Optional[int] = Field(default=None, description="Changed documents re-indexed (incremental mode)")
+    skipped_count: Optional[int] = Field(default=None, description="Unchanged or duplicate documents skipped (incremental mode)")
+
+class JobInfo(BaseModel):
+    """Model for asynchronous indexing job status"""
+    job_id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(..., description="Job status")
+    collection_name: str = Field(..., description="Target collection name")
+    total: int = Field(..., description="Number of submitted documents")
+    indexed_count: int = Field(default=0, description="Number of documents indexed so far")
+    failed_count: int = Field(default=0, description="Number of failed documents so far")
+    skipped_count: Optional[int] = Field(default=None, description="Unchanged or duplicate documents skipped (incremental mode)")
+    progress: float = Field(default=0.0, description="Fraction of documents processed")
+    docs_per_sec: float = Field(default=0.0, description="Indexing throughput")
+    created_at: datetime = Field(..., description="Submission time")
+    started_at: Optional[datetime] = Field(default=None, description="Start time")
+    finished_at: Optional[datetime] = Field(default=None, description="Completion time")
+    errors: Optional[List[str]] = Field(default=None, description="List of errors if any")
 
 class WebhookRequest(BaseModel):
     """Model for n8n webhook integration"""
@@ -0,0 +1,222 @@
+"""ONNX Runtime inference backend for the dense and sparse encoders
+
+Models are exported from their PyTorch checkpoints on first use and cached
+under ONNX_CACHE_DIR, optionally with dynamic int8 weight quantization.
+Pooling is part of the exported graph (sentence embedding for the dense
+model, SPLADE max-pooling for the sparse one), so a single session run
+returns what encode_dense/encode_sparse need.
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import List
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+ONNX_OPSET = 17
+
+# Model construction and torch.onnx.export rely on process-wide state; export one model at a time
+_export_lock = threading.Lock()
+
+
+class _DenseGraph(torch.nn.Module):
+    """SentenceTransformer forward pass returning the pooled sentence embedding"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        features = self.model({"input_ids": input_ids, "attention_mask": attention_mask})
+        return features["sentence_embedding"]
+
+
+class _SpladeGraph(torch.nn.Module):
+    """Masked-LM forward pass with SPLADE pooling: max over tokens of log(1 + ReLU(logits))"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        logits = self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+        mask = attention_mask.unsqueeze(-1).to(logits.dtype)
+        return (torch.log1p(torch.relu(logits)) * mask).max(dim=1).values
+
+
+def model_dir(cache_dir: str, model_name: str, quantize: bool) -> str:
+    """Export directory for a model and precision"""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name.strip("/"))
+    return os.path.join(cache_dir, f"{name}-{'int8' if quantize else 'fp32'}")
+
+
+def _export(graph: torch.nn.Module, tokenizer, path: str, output_name: str):
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    torch.onnx.export(
+        graph.eval(),
+        (sample["input_ids"], sample["attention_mask"]),
+        path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=[output_name],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            output_name: {0: "batch"}
+        },
+        opset_version=ONNX_OPSET,
+        dynamo=False
+    )
+
+
+def _quantize(source: str, target: str):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+
+
+def _ensure_exported(kind: str, model_name: str, cache_dir: str, quantize: bool) -> str:
+    """Export (and quantize) a model unless a cached export exists; returns its directory"""
+    directory = model_dir(cache_dir, model_name, quantize)
+    path = os.path.join(directory, "model.onnx")
+    if os.path.exists(path):
+        return directory
+
+    with _export_lock:
+        if os.path.exists(path):
+            return directory
+
+        # Export into a staging directory and rename it into place, so other processes
+        # (e.g. preforked workers) never load a half-written export
+        os.makedirs(cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{os.path.basename(directory)}-", dir=cache_dir)
+        os.chmod(staging, 0o755)  # mkdtemp creates it private
+        try:
+            _export_model(kind, model_name, staging, os.path.join(staging, "model.onnx"), quantize)
+            if os.path.isdir(directory) and not os.path.exists(path):
+                shutil.rmtree(directory, ignore_errors=True)  # Left by an interrupted export
+            try:
+                os.replace(staging, directory)
+            except OSError:
+                if not os.path.exists(path):
+                    raise
+                logger.info(f"Using the {kind} export another process finished first: {directory}")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return directory
+
+
+def _export_model(kind: str, model_name: str, directory: str, path: str, quantize: bool):
+    logger.info(f"Exporting {kind} model {model_name} to ONNX ({'int8' if quantize else 'fp32'})")
+    with torch.no_grad():
+        if kind == "dense":
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(model_name, device="cpu")
+            tokenizer = model.tokenizer
+            graph, output_name = _DenseGraph(model), "sentence_embedding"
+        else:
+            from transformers import AutoModelForMaskedLM, AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForMaskedLM.from_pretrained(model_name)
+            graph, output_name = _SpladeGraph(model), "sparse_weights"
+
+        export_path = path if not quantize else os.path.join(directory, "model-fp32.onnx")
+        _export(graph, tokenizer, export_path, output_name)
+
+    if quantize:
+        _quantize(export_path, path)
+        os.remove(export_path)
+    tokenizer.save_pretrained(directory)
+
+
+def _session(path: str, threads: int, use_gpu: bool):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+
+    providers = ["CPUExecutionProvider"]
+    if use_gpu and "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, "CUDAExecutionProvider")
+    return ort.InferenceSession(path, options, providers=providers)
+
+
+class _OnnxEncoder:
+    kind = ""
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = "./onnx_models",
+        quantize: bool = False,
+        threads: int = 0,
+        use_gpu: bool = False
+    ):
+        self.model_name = model_name
+        self.quantize = quantize
+        from transformers import AutoTokenizer
+
+        directory = _ensure_exported(self.kind, model_name, cache_dir, quantize)
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.session = _session(os.path.join(directory, "model.onnx"), threads, use_gpu)
+
+    def _run(self, texts: List[str], max_length: int) -> np.ndarray:
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="np",
+            max_length=max_length,
+            truncation=True,
+            padding="longest"
+        )
+        return self.session.run(None, {
+            "input_ids": inputs["input_ids"].astype(np.int64),
+            "attention_mask": inputs["attention_mask"].astype(np.int64)
+        })[0]
+
+
+class OnnxDenseEncoder(_OnnxEncoder):
+    """Drop-in for the SentenceTransformer.encode calls made by HybridSearchEngine"""
+
+    kind = "dense"
+    max_seq_length = 512
+
+    def get_embedding_dimension(self) -> int:
+        """Output size of the exported sentence embedding"""
+        return self.session.get_outputs()[0].shape[-1]
+
+    def encode(
+        self,
+        sentences: List[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        batches = [
+            self._run(sentences[start:start + batch_size], self.max_seq_length)
+            for start in range(0, len(sentences), batch_size)
+        ]
+        embeddings = np.vstack(batches).astype(np.float32, copy=False)
+        if normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+
+class OnnxSparseEncoder(_OnnxEncoder):
+    """SPLADE encoder returning pooled vocabulary weights per text"""
+
+    kind = "sparse"
+
+    def weights(self, texts: List[str], max_length: int) -> np.ndarray:
+        """Return a (len(texts), vocab_size) float32 weight matrix"""
+        return self._run(texts, max_length).astype(np.float32, copy=False)
@@ -0,0 +1,123 @@
+"""Offset and cursor pagination for search results"""
+
+import base64
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.cache import EmbeddingCache, normalize_text
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor is malformed or belongs to a different search"""
+
+
+class SearchPaginator:
+    """Issues opaque cursors and keeps fused hybrid candidates for later pages
+
+    Hybrid results are only well-defined for the prefix that was fused, so a
+    hybrid page at offset N needs both prefetches to reach depth N + limit.
+    The first paginated hybrid search therefore fetches a window of fused
+    candidates and stores it; cursors for the following pages slice that list
+    without encoding the query or calling Qdrant again. When the entry has
+    expired (or lives in another worker) the cursor falls back to a regular
+    offset query. Dense and sparse modes page natively with a Qdrant offset.
+    """
+
+    def __init__(self, window: int = 100, max_entries: int = 1000, ttl: float = 60):
+        self.window = window
+        self._candidates = EmbeddingCache(max_size=max_entries, ttl=ttl)
+
+    @staticmethod
+    def fingerprint(
+        query: str,
+        mode: str,
+        filters: Optional[Dict[str, Any]],
+        collection_name: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Identify the search a cursor belongs to"""
+        key = json.dumps(
+            [normalize_text(query), mode, filters or {}, collection_name, options or {}],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+    @staticmethod
+    def encode_cursor(state: Dict[str, Any]) -> str:
+        raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            state = json.loads(raw)
+            if not isinstance(state, dict) or not isinstance(state.get("o"), int) or state["o"] < 0:
+                raise ValueError("missing offset")
+            return state
+        except Exception as e:
+            raise InvalidCursor(f"Invalid cursor: {e}")
+
+    def resume(self, cursor: str, fingerprint: str) -> Tuple[int, Optional[Tuple[str, List[Dict[str, Any]], bool]]]:
+        """Return the offset a cursor points at and its cached candidates, if still held"""
+        state = self.decode_cursor(cursor)
+        if state.get("f") != fingerprint:
+            raise InvalidCursor("Cursor does not belong to this search")
+
+        key = state.get("k")
+        cached = self._candidates.get(key) if key else None
+        if cached is None:
+            return state["o"], None
+        return state["o"], (key, *cached)
+
+    def covers(self, cached: Tuple[str, List[Dict[str, Any]], bool], offset: int, limit: int) -> bool:
+        """Whether cached candidates can serve a page without another Qdrant query"""
+        _, candidates, exhausted = cached
+        return exhausted or offset + limit <= len(candidates)
+
+    def fetch_size(self, offset: int, limit: int) -> int:
+        """Number of fused hybrid candidates to fetch for a paginated page"""
+        return max(self.window, offset + limit)
+
+    def store(self, candidates: List[Dict[str, Any]], fetched: int) -> Tuple[str, List[Dict[str, Any]], bool]:
+        """Keep a fused candidate list for later pages; returns it in resume() form"""
+        key = uuid.uuid4().hex
+        # A full window may have more candidates behind it; a short one is exhausted
+        exhausted = len(candidates) < fetched
+        self._candidates.put(key, (candidates, exhausted))
+        return key, candidates, exhausted
+
+    def page(
+        self,
+        results: List[Dict[str, Any]],
+        offset: int,
+        limit: int,
+        fingerprint: str,
+        cached: Optional[Tuple[str, List[Dict[str, Any]], bool]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Cut one page and build the cursor for the next
+
+        With `cached` (key, fused candidates from rank 0, exhausted) the page
+        is sliced from the candidates; otherwise `results` already is the
+        page, as returned by a Qdrant offset query.
+        """
+        end = offset + limit
+        if cached is None:
+            more = len(results) == limit
+            return results, self._next(end, fingerprint) if more else None
+
+        key, candidates, exhausted = cached
+        more = end < len(candidates) or (not exhausted and len(candidates) > 0)
+        return candidates[offset:end], self._next(end, fingerprint, key) if more else None
+
+    def _next(self, offset: int, fingerprint: str, key: Optional[str] = None) -> str:
+        state = {"o": offset, "f": fingerprint}
+        if key:
+            state["k"] = key
+        return self.encode_cursor(state)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"window": self.window, **self._candidates.stats()}
@@ -0,0 +1,167 @@
+"""Preforking server: load the models once, fork workers that share them copy-on-write
+
+    python -m app.prefork --workers 4
+
+`uvicorn --workers N` starts N independent processes and every one of them
+loads its own copy of the dense and sparse models. Here the parent process
+loads both models, binds the listening socket and then forks the workers.
+Model weights are only read after loading, so their pages stay shared
+between all workers; each worker pays for its interpreter, caches and
+inference activations only. A worker that dies is forked again from the
+parent, without reloading anything.
+
+Sharing needs the PyTorch backend on CPU: a CUDA context cannot be used in
+a forked child, and ONNX Runtime sessions own thread pools that do not
+survive fork(). In those setups the workers load their own models after
+the fork, as with uvicorn --workers.
+
+Caches stay per worker, but the search result cache's collection versions
+are shared: a write through any worker invalidates the results cached by
+all of them, as in a single process.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict
+
+# Ask torch whether CUDA exists through NVML, without initializing CUDA in the parent
+os.environ.setdefault("PYTORCH_NVML_BASED_CUDA_CHECK", "1")
+
+import structlog
+import uvicorn
+
+from app.cache import share_result_versions
+from app.config import settings
+from app import main
+
+logger = structlog.get_logger()
+
+
+def shares_models() -> bool:
+    """Whether the models can be loaded in the parent and inherited by the workers"""
+    if settings.inference_backend != "torch":
+        return False
+    import torch
+    return not (settings.use_gpu and torch.cuda.is_available())
+
+
+def preload():
+    """Load the models in the parent process, before any worker is forked"""
+    import torch
+
+    # A parent that never starts an OpenMP thread pool cannot leave a broken one to its children
+    torch.set_num_threads(1)
+
+    engine = main.build_search_engine()
+    with main.startup.phase("models"):
+        if not engine.load_models():
+            raise RuntimeError(f"Failed to load models: {engine.model_state}")
+    main.search_engine = engine
+
+    # Objects surviving until the fork are never scanned by the GC again, so it does not dirty their pages
+    gc.collect()
+    gc.freeze()
+    logger.info("Models loaded in the preforking parent", startup_seconds=main.startup.phases)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Listening socket inherited by all workers"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(sock: socket.socket, threads: int):
+    """Worker process body: run uvicorn on the inherited socket"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if main.search_engine is not None:
+        import torch
+        torch.set_num_threads(threads)
+
+    config = uvicorn.Config(main.app, log_level=settings.log_level.lower())
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(sock: socket.socket, threads: int) -> int:
+    """Fork one worker and return its pid"""
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            serve(sock, threads)
+        except BaseException:
+            logger.exception("Worker crashed", pid=os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def run(workers: int, host: str, port: int):
+    """Preload, fork `workers` workers and supervise them until SIGTERM/SIGINT"""
+    sock = bind_socket(host, port)
+    # Before any search engine (and its result cache) is built, in the parent or the workers
+    share_result_versions()
+    if shares_models():
+        preload()
+    else:
+        logger.warning("Models cannot be shared across fork() with this backend/device; workers load their own",
+                       backend=settings.inference_backend, use_gpu=settings.use_gpu)
+    threads = settings.worker_threads or max(1, (os.cpu_count() or 1) // workers)
+
+    children: Dict[int, float] = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children[spawn(sock, threads)] = time.monotonic()
+    logger.info("Workers started", workers=list(children), host=host, port=port, threads_per_worker=threads)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started_at = children.pop(pid, None)
+        if started_at is None or stopping:
+            continue
+
+        logger.warning("Worker exited, forking a replacement", pid=pid, status=status)
+        if time.monotonic() - started_at < 1:
+            time.sleep(1)  # Don't spin on a worker that dies during startup
+        children[spawn(sock, threads)] = time.monotonic()
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API from preforked workers sharing one copy of the models")
+    parser.add_argument("--workers", type=int, default=settings.prefork_workers)
+    parser.add_argument("--host", default=settings.api_host)
+    parser.add_argument("--port", type=int, default=settings.api_port)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level.upper(), format="%(message)s")
+    run(args.workers, args.host, args.port)
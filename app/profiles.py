@@ -0,0 +1,81 @@
+"""Collection profiles: presets for sharding, HNSW, optimizers and storage
+
+A profile is a partial set of collection options. The effective options
+of a new collection are the storage settings from the environment,
+overridden by the profile, overridden by options passed explicitly.
+Options left as None keep Qdrant's defaults.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+COLLECTION_OPTIONS = (
+    "quantization",
+    "on_disk",
+    "sparse_on_disk",
+    "sparse_datatype",
+    "sparse_idf",
+    "on_disk_payload",
+    "shard_number",
+    "replication_factor",
+    "hnsw_m",
+    "hnsw_ef_construct",
+    "hnsw_on_disk",
+    "default_segment_number",
+    "max_segment_size",
+    "indexing_threshold"
+)
+
+COLLECTION_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Qdrant defaults with the storage settings from the environment
+    "default": {},
+    # Fast uploads: cheaper graph, few large segments, HNSW only built for large segments
+    "bulk-ingest": {
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 64,
+        "default_segment_number": 2,
+        "indexing_threshold": 100000
+    },
+    # Latency first: denser graph, everything in RAM, more segments searched in parallel
+    "low-latency": {
+        "hnsw_m": 32,
+        "hnsw_ef_construct": 256,
+        "hnsw_on_disk": False,
+        "default_segment_number": 8,
+        "on_disk": False,
+        "sparse_on_disk": False,
+        "on_disk_payload": False
+    },
+    # Small footprint: originals, graph, sparse index and payload on disk; int8 copies in RAM
+    "low-memory": {
+        "quantization": "scalar",
+        "on_disk": True,
+        "sparse_on_disk": True,
+        "sparse_datatype": "float16",
+        "on_disk_payload": True,
+        "hnsw_on_disk": True
+    }
+}
+
+
+def resolve_profile(profile: Optional[str] = None, **overrides) -> Dict[str, Any]:
+    """Effective collection options for a profile and explicit overrides"""
+    profile = profile or settings.collection_profile
+    if profile not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile: {profile}")
+    unknown = set(overrides) - set(COLLECTION_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown collection options: {', '.join(sorted(unknown))}")
+
+    options: Dict[str, Any] = dict.fromkeys(COLLECTION_OPTIONS)
+    options.update(
+        quantization=settings.quantization,
+        on_disk=settings.dense_on_disk,
+        sparse_on_disk=settings.sparse_on_disk,
+        sparse_datatype=settings.sparse_datatype,
+        sparse_idf=settings.sparse_idf
+    )
+    options.update(COLLECTION_PROFILES[profile])
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
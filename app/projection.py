@@ -0,0 +1,99 @@
+"""Payload projection: which stored fields a search returns, and how much text
+
+Field selection is pushed down to Qdrant as a payload include selector,
+so dropped fields are never read or transferred. Qdrant cannot cut
+strings, so text truncation and query snippets are applied to the
+fetched text before the results are cached and serialized.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from app.chunking import PARENT_ID_FIELD
+
+# Small fields the result format always carries; content_hash, chunk_count and parent_hash are never returned
+RESULT_FIELDS = (PARENT_ID_FIELD, "chunk_index", "chunk_start", "chunk_end")
+
+ELLIPSIS = "…"
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def resolve_projection(
+    include_text: bool = True,
+    metadata_fields: Optional[List[str]] = None,
+    max_text_chars: Optional[int] = None,
+    snippet: bool = False,
+    snippet_chars: int = 200
+) -> Optional[Dict[str, Any]]:
+    """Normalized projection options, or None for the full payload"""
+    if snippet and max_text_chars is None:
+        max_text_chars = snippet_chars
+    if include_text and metadata_fields is None and max_text_chars is None:
+        return None
+    return {
+        "include_text": include_text,
+        "metadata_fields": sorted(set(metadata_fields)) if metadata_fields is not None else None,
+        "max_text_chars": max_text_chars if include_text else None,
+        "snippet": snippet and include_text
+    }
+
+
+def payload_selector(projection: Optional[Dict[str, Any]]) -> List[str]:
+    """Payload keys to fetch from Qdrant"""
+    fields = list(RESULT_FIELDS)
+    if projection is None or projection["include_text"]:
+        fields.append("text")
+    metadata_fields = projection["metadata_fields"] if projection else None
+    if metadata_fields is None:
+        fields.append("metadata")
+    else:
+        fields.extend(f"metadata.{field}" for field in metadata_fields)
+    return fields
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Prefix of at most max_chars, cut at a word boundary when one is close"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    if space > max_chars * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + ELLIPSIS
+
+
+def snippet(text: str, query: str, max_chars: int) -> str:
+    """Window of at most max_chars around the first occurrence of a query term"""
+    if len(text) <= max_chars:
+        return text
+    lowered = text.lower()
+    positions = [
+        position
+        for term in {word.lower() for word in _WORD.findall(query) if len(word) > 1}
+        for position in [lowered.find(term)]
+        if position >= 0
+    ]
+    if not positions:
+        return truncate(text, max_chars)
+
+    # Start a quarter window before the match, on a word boundary
+    start = max(0, min(positions) - max_chars // 4)
+    if start > 0:
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < min(positions) else start
+    window = truncate(text[start:], max_chars)
+    return (ELLIPSIS if start > 0 else "") + window
+
+
+def project_results(results: List[Dict[str, Any]], query: str, projection: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply text truncation or snippets to result dicts (and grouped chunks) in place"""
+    max_chars = projection["max_text_chars"] if projection else None
+    if not max_chars:
+        return results
+    for result in results:
+        for item in [result] + (result.get("chunks") or []):
+            if projection["snippet"]:
+                item["text"] = snippet(item["text"], query, max_chars)
+            else:
+                item["text"] = truncate(item["text"], max_chars)
+    return results
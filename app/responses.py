@@ -0,0 +1,20 @@
+"""JSON responses serialized straight from plain dicts with orjson"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+
+class FastJSONResponse(Response):
+    """Serialize result dicts as they come from the search engine
+
+    Endpoints returning it skip the per-hit Pydantic model rebuild and
+    response validation; they keep their response_model for the OpenAPI
+    schema and must build content with the same shape.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
@@ -3,18 +3,35 @@
 import torch
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
 from transformers import AutoTokenizer, AutoModelForMaskedLM
-from qdrant_client import QdrantClient, models
+from qdrant_client import QdrantClient, AsyncQdrantClient, models
 from qdrant_client.models import Distance, VectorParams, PointStruct, SparseVector
+import asyncio
 import hashlib
+import threading
 import time
+import uuid
 from functools import lru_cache
 import logging
 from app.config import settings
+from app.cache import EmbeddingCache, SearchResultCache
+from app.filters import build_filter, payload_key, PAYLOAD_SCHEMAS
+from app.fusion import fuse
+from app.chunking import CHUNK_FIELDS, PARENT_ID_FIELD, DocumentChunker, chunk_id
+from app.profiles import resolve_profile
+from app.search_tuning import SEARCH_PROFILE_KEY, prefetch_depth, resolve_search_params
+from app.projection import payload_selector, project_results
+from app.onnx_backend import OnnxDenseEncoder, OnnxSparseEncoder
+from app import metrics
 
 logger = logging.getLogger(__name__)
 
+# from_pretrained builds modules under a process-wide meta-device context, so two
+# models constructed at once in different threads can end up with meta tensors
+_model_construction_lock = threading.Lock()
+
 class HybridSearchEngine:
     """GPU-optimized hybrid search engine for RTX 4000"""
     
@@ -22,10 +39,33 @@ class HybridSearchEngine:
         """Initialize search engine with GPU support"""
         self.device = self._setup_device()
         self.qdrant_client = self._setup_qdrant()
+        self.async_qdrant_client = self._setup_async_qdrant()
         self.dense_model = None
         self.sparse_model = None
         self.sparse_tokenizer = None
-        self._embedding_cache = {}
+        self.model_state = {"dense": "pending", "sparse": "pending"}
+        self.model_load_seconds: Dict[str, float] = {}
+        self._chunker: Optional[DocumentChunker] = None
+        self._search_profiles: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._embedding_cache = (
+            EmbeddingCache(
+                max_size=settings.embedding_cache_size,
+                ttl=settings.embedding_cache_ttl
+            )
+            if settings.cache_embeddings else None
+        )
+        # Writes sent with UPSERT_WAIT=false are applied after invalidation, so a search
+        # in between would cache pre-write results under the new collection version
+        self._result_cache = (
+            SearchResultCache(
+                max_size=settings.search_cache_size,
+                max_bytes=settings.search_cache_max_bytes,
+                ttl=settings.search_cache_ttl
+            )
+            if settings.cache_search_results and settings.upsert_wait else None
+        )
+        if settings.cache_search_results and not settings.upsert_wait:
+            logger.info("Search result cache disabled: UPSERT_WAIT=false does not confirm writes")
         
     def _setup_device(self) -> torch.device:
         """Setup CUDA device for RTX 4000"""
@@ -40,53 +80,221 @@ class HybridSearchEngine:
             logger.warning("GPU not available, using CPU")
             return torch.device("cpu")
     
+    @staticmethod
+    def _qdrant_options() -> Dict[str, Any]:
+        """Connection options shared by the sync and async Qdrant clients"""
+        if settings.qdrant_location:
+            # Local mode (":memory:" or a storage path), mainly for tests and benchmarks
+            return {"location": settings.qdrant_location}
+        return {
+            "host": settings.qdrant_host,
+            "port": settings.qdrant_port,
+            "grpc_port": settings.qdrant_grpc_port,
+            "prefer_grpc": settings.qdrant_prefer_grpc,
+            "api_key": settings.qdrant_api_key,
+            "timeout": settings.qdrant_timeout,
+            "pool_size": settings.qdrant_pool_size
+        }
+    
     def _setup_qdrant(self) -> QdrantClient:
         """Setup Qdrant client"""
-        return QdrantClient(
-            host=settings.qdrant_host,
-            port=settings.qdrant_port,
-            api_key=settings.qdrant_api_key,
-            timeout=30
-        )
+        return QdrantClient(**self._qdrant_options())
+    
+    def _setup_async_qdrant(self) -> Optional[AsyncQdrantClient]:
+        """Setup the async Qdrant client used by the non-blocking request path"""
+        if not settings.qdrant_async:
+            return None
+        if settings.qdrant_location:
+            # Local mode keeps state per client, so a second client would see different data
+            logger.warning("QDRANT_ASYNC is ignored in local mode, using the sync client")
+            return None
+        return AsyncQdrantClient(**self._qdrant_options())
+    
+    def reconnect(self):
+        """Replace the Qdrant clients, whose connections must not be shared across fork()"""
+        self.qdrant_client = self._setup_qdrant()
+        self.async_qdrant_client = self._setup_async_qdrant()
     
     def load_models(self):
-        """Load embedding models with GPU optimization"""
+        """Load the dense and sparse models concurrently"""
+        loaders = {"dense": self._load_dense_model, "sparse": self._load_sparse_model}
+        workers = len(loaders) if settings.parallel_model_loading else 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model-load") as pool:
+            futures = [pool.submit(self._load_model, name, loader) for name, loader in loaders.items()]
+        
+        if not all(future.result() for future in futures):
+            return False
+        logger.info(f"Models loaded successfully ({settings.inference_backend}, {self.device})")
+        return True
+    
+    def _load_model(self, name: str, loader) -> bool:
+        """Run one model loader, tracking its state and load time"""
+        self.model_state[name] = "loading"
+        start_time = time.perf_counter()
         try:
-            # Load dense model (multilingual-e5-large)
-            logger.info(f"Loading dense model: {settings.dense_model}")
-            self.dense_model = SentenceTransformer(
+            loader()
+        except Exception as e:
+            self.model_state[name] = "failed"
+            logger.error(f"Error loading {name} model: {e}")
+            return False
+        
+        self.model_load_seconds[name] = round(time.perf_counter() - start_time, 3)
+        self.model_state[name] = "loaded"
+        logger.info(f"Loaded {name} model in {self.model_load_seconds[name]:.1f}s")
+        return True
+    
+    def _load_dense_model(self):
+        """Load the dense model (multilingual-e5-large)"""
+        if settings.inference_backend == "onnx":
+            logger.info(f"Loading dense model with ONNX Runtime: {settings.dense_model}")
+            self.dense_model = OnnxDenseEncoder(settings.dense_model, **self._onnx_options())
+            self.dense_model.max_seq_length = settings.max_sequence_length
+            return
+        
+        logger.info(f"Loading dense model: {settings.dense_model}")
+        with _model_construction_lock:
+            dense_model = SentenceTransformer(
                 settings.dense_model,
                 device=self.device
             )
-            self.dense_model.max_seq_length = settings.max_sequence_length
-            
-            # Load sparse model (Splade)
-            logger.info(f"Loading sparse model: {settings.sparse_model}")
-            self.sparse_tokenizer = AutoTokenizer.from_pretrained(settings.sparse_model)
-            self.sparse_model = AutoModelForMaskedLM.from_pretrained(settings.sparse_model)
-            self.sparse_model.to(self.device)
-            self.sparse_model.eval()
-            
-            # Optimize models for inference
-            if settings.use_gpu:
-                self.dense_model = self.dense_model.half()  # Use FP16 for faster inference
-                self.sparse_model = self.sparse_model.half()
-                
-            logger.info("Models loaded successfully with GPU optimization")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error loading models: {e}")
-            return False
+        dense_model.max_seq_length = settings.max_sequence_length
+        if settings.use_gpu:
+            dense_model = dense_model.half()  # Use FP16 for faster inference
+        self.dense_model = dense_model
+    
+    def _load_sparse_model(self):
+        """Load the sparse model (Splade)"""
+        if settings.inference_backend == "onnx":
+            logger.info(f"Loading sparse model with ONNX Runtime: {settings.sparse_model}")
+            sparse_model = OnnxSparseEncoder(settings.sparse_model, **self._onnx_options())
+            self.sparse_tokenizer = sparse_model.tokenizer
+            self.sparse_model = sparse_model
+            return
+        
+        logger.info(f"Loading sparse model: {settings.sparse_model}")
+        self.sparse_tokenizer = AutoTokenizer.from_pretrained(settings.sparse_model)
+        with _model_construction_lock:
+            sparse_model = AutoModelForMaskedLM.from_pretrained(settings.sparse_model)
+        sparse_model.to(self.device)
+        sparse_model.eval()
+        if settings.use_gpu:
+            sparse_model = sparse_model.half()
+        self.sparse_model = sparse_model
+    
+    def _onnx_options(self) -> Dict[str, Any]:
+        """Export and session options for the ONNX Runtime encoders"""
+        return {
+            "cache_dir": settings.onnx_cache_dir,
+            "quantize": settings.onnx_quantize,
+            "threads": settings.onnx_threads,
+            "use_gpu": self.device.type == "cuda"
+        }
+    
+    @torch.no_grad()
+    def warmup(self):
+        """Run both encoders on representative batch shapes before serving traffic
+        
+        Covers a single query, a full coalesced query batch and a full
+        document batch at the maximum sequence length, so allocator growth,
+        cuDNN autotuning and ONNX Runtime's first-run planning happen here
+        rather than on the first requests. Bypasses the embedding cache.
+        """
+        shapes = [
+            ("query", 1, settings.sparse_query_max_length),
+            ("query", settings.coalesce_max_batch, settings.sparse_query_max_length),
+            ("passage", settings.batch_size, settings.max_sequence_length)
+        ]
+        for mode, batch_size, max_length in shapes:
+            start_time = time.perf_counter()
+            texts = [f"{mode}: " + " ".join(["warmup"] * max_length)] * batch_size
+            self.dense_model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            self._encode_sparse_batch(texts, min(max_length, settings.sparse_max_length))
+            logger.info(f"Warmup {mode} x{batch_size}: {(time.perf_counter() - start_time) * 1000:.0f}ms")
+        
+        for name in self.model_state:
+            self.model_state[name] = "warm"
+    
+    @staticmethod
+    def quantization_config(quantization: Optional[str]) -> Optional[models.QuantizationConfig]:
+        """Build the dense vector quantization config for scalar, product or binary"""
+        if not quantization or quantization == "none":
+            return None
+        if quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=settings.quantization_always_ram
+                )
+            )
+        if quantization == "product":
+            return models.ProductQuantization(
+                product=models.ProductQuantizationConfig(
+                    compression=models.CompressionRatio(settings.product_quantization_compression),
+                    always_ram=settings.quantization_always_ram
+                )
+            )
+        if quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=settings.quantization_always_ram
+                )
+            )
+        raise ValueError(f"Unknown quantization: {quantization}")
+    
+    def dense_dimension(self) -> int:
+        """Output size of the loaded dense model"""
+        if self.dense_model is None:
+            raise RuntimeError("Dense model not loaded; cannot derive the vector size")
+        # Renamed get_embedding_dimension in newer sentence-transformers
+        dimension = (
+            getattr(self.dense_model, "get_embedding_dimension", None)
+            or self.dense_model.get_sentence_embedding_dimension
+        )
+        return dimension()
     
-    def create_collection(self, collection_name: str = None) -> bool:
-        """Create Qdrant collection with hybrid search configuration"""
+    def create_collection(
+        self,
+        collection_name: str = None,
+        quantization: Optional[str] = None,
+        on_disk: Optional[bool] = None,
+        sparse_on_disk: Optional[bool] = None,
+        profile: Optional[str] = None,
+        **options
+    ) -> bool:
+        """Create Qdrant collection with hybrid search configuration
+        
+        `profile` names a preset from app.profiles (COLLECTION_PROFILE by
+        default); explicit arguments override it. Raises ValueError for an
+        unknown profile or option.
+        """
         collection_name = collection_name or settings.qdrant_collection
+        config = resolve_profile(
+            profile,
+            quantization=quantization,
+            on_disk=on_disk,
+            sparse_on_disk=sparse_on_disk,
+            **options
+        )
         
         try:
+            vector_size = self.dense_dimension()
+            
             # Check if collection exists
             collections = self.qdrant_client.get_collections()
             if any(c.name == collection_name for c in collections.collections):
+                existing_size = self.qdrant_client.get_collection(collection_name).config.params.vectors["dense"].size
+                if existing_size != vector_size:
+                    logger.warning(
+                        f"Collection {collection_name} has dense size {existing_size}, "
+                        f"but {settings.dense_model} outputs {vector_size}"
+                    )
                 logger.info(f"Collection {collection_name} already exists")
                 return True
             
@@ -95,93 +303,580 @@ class HybridSearchEngine:
                 collection_name=collection_name,
                 vectors_config={
                     "dense": VectorParams(
-                        size=1024,  # multilingual-e5-large embedding size
-                        distance=Distance.COSINE
+                        size=vector_size,
+                        distance=Distance.COSINE,
+                        on_disk=config["on_disk"],  # Originals on disk, quantized copies stay in RAM
+                        quantization_config=self.quantization_config(config["quantization"])
                     )
                 },
                 sparse_vectors_config={
                     "sparse": models.SparseVectorParams(
                         index=models.SparseIndexParams(
-                            on_disk=False  # Keep in RAM for RTX 4000 performance
-                        )
+                            on_disk=config["sparse_on_disk"],  # RAM by default for RTX 4000 performance
+                            datatype=models.Datatype(config["sparse_datatype"]) if config["sparse_datatype"] else None
+                        ),
+                        modifier=models.Modifier.IDF if config["sparse_idf"] else None
                     )
-                }
+                },
+                shard_number=config["shard_number"],
+                replication_factor=config["replication_factor"],
+                on_disk_payload=config["on_disk_payload"],
+                hnsw_config=models.HnswConfigDiff(
+                    m=config["hnsw_m"],
+                    ef_construct=config["hnsw_ef_construct"],
+                    on_disk=config["hnsw_on_disk"]
+                ),
+                optimizers_config=models.OptimizersConfigDiff(
+                    default_segment_number=config["default_segment_number"],
+                    max_segment_size=config["max_segment_size"],
+                    indexing_threshold=config["indexing_threshold"]
+                ),
+                metadata={"profile": profile or settings.collection_profile}
+            )
+            
+            # Grouped search groups chunks by their parent document
+            self.qdrant_client.create_payload_index(
+                collection_name=collection_name,
+                field_name=PARENT_ID_FIELD,
+                field_schema=models.PayloadSchemaType.KEYWORD
             )
             
-            logger.info(f"Collection {collection_name} created successfully")
+            self.invalidate_results(collection_name)
+            logger.info(
+                f"Collection {collection_name} created successfully "
+                f"(profile={profile or settings.collection_profile}, size={vector_size}, "
+                f"quantization={config['quantization'] or 'none'}, on_disk={config['on_disk']})"
+            )
             return True
             
         except Exception as e:
             logger.error(f"Error creating collection: {e}")
             return False
     
+    def _cache_lookup(
+        self,
+        model: str,
+        mode: str,
+        texts: List[str]
+    ) -> Tuple[List[Optional[Any]], List[int]]:
+        """Return cached entries for texts and the indices that still need encoding"""
+        if self._embedding_cache is None:
+            return [None] * len(texts), list(range(len(texts)))
+        
+        cached = [
+            self._embedding_cache.get(EmbeddingCache.make_key(model, mode, text))
+            for text in texts
+        ]
+        missing = [i for i, entry in enumerate(cached) if entry is None]
+        return cached, missing
+    
+    def _cache_store(self, model: str, mode: str, text: str, value: Any):
+        """Store an encoded entry if caching is enabled"""
+        if self._embedding_cache is not None:
+            self._embedding_cache.put(EmbeddingCache.make_key(model, mode, text), value)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Report embedding cache counters"""
+        if self._embedding_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._embedding_cache.stats()}
+    
+    def search_cache_key(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        offset: int,
+        filters: Optional[Dict[str, Any]],
+        collection_name: str,
+        **options: Any
+    ) -> Optional[Tuple]:
+        """Result cache key for a search at the collection's current version
+        
+        Options left as None are dropped, so the key does not depend on
+        whether a caller passes an unused option or omits it.
+        """
+        if self._result_cache is None:
+            return None
+        options = {key: value for key, value in options.items() if value is not None}
+        return self._result_cache.make_key(
+            collection_name, query, mode, limit, offset, filters, options
+        )
+    
+    def get_cached_results(self, key: Optional[Tuple]) -> Optional[List[Dict[str, Any]]]:
+        """Return cached search results for a key, if any"""
+        if key is None:
+            return None
+        return self._result_cache.get(key)
+    
+    def cache_results(self, key: Optional[Tuple], results: List[Dict[str, Any]]):
+        """Store search results computed for a key"""
+        if key is not None:
+            self._result_cache.put(key, results)
+    
+    def invalidate_results(self, collection_name: str):
+        """Stop serving cached results for a collection after a write"""
+        if self._result_cache is not None:
+            self._result_cache.invalidate(collection_name)
+    
+    def search_cache_stats(self) -> Dict[str, Any]:
+        """Report search result cache counters"""
+        if self._result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._result_cache.stats()}
+    
+    def _cached_search_profile(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        cached = self._search_profiles.get(collection_name)
+        if cached is not None and time.monotonic() - cached[0] < settings.search_profile_ttl:
+            return cached[1]
+        return None
+    
+    def _store_search_profile(self, collection_name: str, info: Optional[models.CollectionInfo]) -> Dict[str, Any]:
+        profile = ((info.config.metadata or {}).get(SEARCH_PROFILE_KEY) if info else None) or {}
+        self._search_profiles[collection_name] = (time.monotonic(), profile)
+        return profile
+    
+    def search_profile(self, collection_name: str) -> Dict[str, Any]:
+        """Default search parameters stored on a collection, cached for SEARCH_PROFILE_TTL"""
+        profile = self._cached_search_profile(collection_name)
+        if profile is not None:
+            return profile
+        try:
+            info = self.qdrant_client.get_collection(collection_name)
+        except Exception as e:
+            logger.warning(f"Could not read the search profile of {collection_name}: {e}")
+            info = None
+        return self._store_search_profile(collection_name, info)
+    
+    async def asearch_profile(self, collection_name: str) -> Dict[str, Any]:
+        """search_profile on the async Qdrant client"""
+        profile = self._cached_search_profile(collection_name)
+        if profile is not None:
+            return profile
+        try:
+            info = await self.async_qdrant_client.get_collection(collection_name)
+        except Exception as e:
+            logger.warning(f"Could not read the search profile of {collection_name}: {e}")
+            info = None
+        return self._store_search_profile(collection_name, info)
+    
+    def set_search_profile(self, collection_name: str, profile: Dict[str, Any]) -> bool:
+        """Store a collection's default search parameters in its metadata"""
+        profile = {key: value for key, value in profile.items() if value is not None}
+        resolve_search_params(profile)  # Rejects unknown parameters
+        try:
+            self.qdrant_client.update_collection(collection_name, metadata={SEARCH_PROFILE_KEY: profile})
+        except Exception as e:
+            logger.error(f"Error storing the search profile of {collection_name}: {e}")
+            return False
+        
+        self._search_profiles[collection_name] = (time.monotonic(), profile)
+        self.invalidate_results(collection_name)
+        logger.info(f"Search profile of {collection_name} set to {profile}")
+        return True
+    
     @torch.no_grad()
-    def encode_dense(self, texts: List[str]) -> np.ndarray:
+    def encode_dense(self, texts: List[str], mode: str = "passage") -> np.ndarray:
         """Encode texts to dense embeddings with GPU acceleration"""
-        # Prefix texts for e5-large model
-        prefixed_texts = [f"passage: {text}" for text in texts]
+        embeddings, missing = self._cache_lookup(settings.dense_model, mode, texts)
+        
+        # Prefix texts for e5-large model ("query: " or "passage: ")
+        prefixed_texts = [f"{mode}: {texts[i]}" for i in missing]
         
         # Batch encoding with optimal batch size for RTX 4000
-        embeddings = []
-        for i in range(0, len(prefixed_texts), settings.batch_size):
-            batch = prefixed_texts[i:i + settings.batch_size]
-            batch_embeddings = self.dense_model.encode(
-                batch,
-                convert_to_numpy=True,
-                normalize_embeddings=True,
-                show_progress_bar=False
-            )
-            embeddings.append(batch_embeddings)
+        for start in range(0, len(prefixed_texts), settings.batch_size):
+            batch = prefixed_texts[start:start + settings.batch_size]
+            metrics.ENCODE_BATCH_SIZE.labels("dense").observe(len(batch))
+            with metrics.DENSE_ENCODE_SECONDS.labels(mode).time():
+                batch_embeddings = self.dense_model.encode(
+                    batch,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                ).astype(np.float32, copy=False)
+            for i, embedding in zip(missing[start:start + settings.batch_size], batch_embeddings):
+                embeddings[i] = embedding
+                # A row is a view that would keep the whole batch array alive in the cache
+                self._cache_store(settings.dense_model, mode, texts[i], embedding.copy())
         
         return np.vstack(embeddings) if embeddings else np.array([])
     
     @torch.no_grad()
-    def encode_sparse(self, texts: List[str]) -> List[SparseVector]:
-        """Encode texts to sparse embeddings with GPU acceleration"""
-        sparse_vectors = []
-        
-        for text in texts:
-            # Tokenize with max length constraint (24 for queries, 128 for docs)
-            max_length = 24 if len(text) < 100 else 128
-            inputs = self.sparse_tokenizer(
-                text,
-                return_tensors="pt",
-                max_length=max_length,
-                truncation=True,
-                padding="max_length"
-            ).to(self.device)
-            
-            # Get logits from model
-            outputs = self.sparse_model(**inputs)
-            logits = outputs.logits
-            
-            # Apply log-softmax and max pooling
-            log_probs = torch.log_softmax(logits, dim=-1)
-            pooled = log_probs.max(dim=1).values.squeeze()
+    def encode_sparse(
+        self,
+        texts: List[str],
+        max_length: Optional[int] = None
+    ) -> List[SparseVector]:
+        """Encode texts to sparse embeddings in dynamically padded batches"""
+        sparse_vectors: List[Optional[SparseVector]] = [None] * len(texts)
+        
+        # Group texts by their token budget (short queries vs documents)
+        buckets: Dict[int, List[int]] = {}
+        for i, text in enumerate(texts):
+            budget = max_length or self._sparse_max_length(text)
+            buckets.setdefault(budget, []).append(i)
+        
+        for budget, bucket in buckets.items():
+            mode = f"max_length={budget}"
+            cached, missing = self._cache_lookup(
+                settings.sparse_model, mode, [texts[i] for i in bucket]
+            )
+            for i, entry in zip(bucket, cached):
+                if entry is not None:
+                    indices, values = entry
+                    sparse_vectors[i] = SparseVector(
+                        indices=indices.tolist(),
+                        values=values.tolist()
+                    )
+            bucket = [bucket[j] for j in missing]
             
-            # Apply ReLU and get non-zero indices
-            relu_probs = torch.relu(pooled)
+            # Sort by length so each batch pads to a similar longest item
+            bucket.sort(key=lambda i: len(texts[i]))
+            for start in range(0, len(bucket), settings.batch_size):
+                batch_ids = bucket[start:start + settings.batch_size]
+                batch_vectors = self._encode_sparse_batch(
+                    [texts[i] for i in batch_ids],
+                    budget
+                )
+                for i, vector in zip(batch_ids, batch_vectors):
+                    sparse_vectors[i] = vector
+                    self._cache_store(
+                        settings.sparse_model,
+                        mode,
+                        texts[i],
+                        (
+                            np.asarray(vector.indices, dtype=np.int32),
+                            np.asarray(vector.values, dtype=np.float32)
+                        )
+                    )
+        
+        return sparse_vectors
+    
+    @staticmethod
+    def _sparse_max_length(text: str) -> int:
+        """Pick the SPLADE token budget for a text"""
+        if len(text) < 100:
+            return settings.sparse_query_max_length
+        return settings.sparse_max_length
+    
+    def _encode_sparse_batch(self, texts: List[str], max_length: int) -> List[SparseVector]:
+        """Run one SPLADE forward pass and extract non-zeros for the whole batch"""
+        metrics.ENCODE_BATCH_SIZE.labels("sparse").observe(len(texts))
+        
+        if isinstance(self.sparse_model, OnnxSparseEncoder):
+            # ONNX graph already applies SPLADE pooling
+            with metrics.SPARSE_ENCODE_SECONDS.labels(str(max_length)).time():
+                weights = self.sparse_model.weights(texts, max_length)
+            rows, columns = np.nonzero(weights)
+            values = weights[rows, columns]
+        else:
+            rows, columns, values = self._splade_nonzeros(texts, max_length)
+        
+        bounds = np.searchsorted(rows, np.arange(len(texts) + 1))
+        
+        return [
+            SparseVector(
+                indices=columns[bounds[i]:bounds[i + 1]].tolist(),
+                values=values[bounds[i]:bounds[i + 1]].tolist()
+            )
+            for i in range(len(texts))
+        ]
+    
+    def _splade_nonzeros(self, texts: List[str], max_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """PyTorch SPLADE forward pass; returns (rows, columns, values) of the non-zero weights"""
+        inputs = self.sparse_tokenizer(
+            texts,
+            return_tensors="pt",
+            max_length=max_length,
+            truncation=True,
+            padding="longest"
+        ).to(self.device)
+        
+        # Timed through the .cpu() copies so GPU work is not under-reported
+        with metrics.SPARSE_ENCODE_SECONDS.labels(str(max_length)).time():
+            logits = self.sparse_model(**inputs).logits
             
-            # Convert to sparse vector
-            non_zero_indices = relu_probs.nonzero().squeeze().cpu().numpy()
-            non_zero_values = relu_probs[non_zero_indices].cpu().numpy()
+            # SPLADE pooling: log(1 + ReLU(logits)), padding masked out, max over tokens
+            mask = inputs["attention_mask"].unsqueeze(-1).to(logits.dtype)
+            weights = (torch.log1p(torch.relu(logits)) * mask).max(dim=1).values.float()
             
-            if len(non_zero_indices) > 0:
-                sparse_vector = SparseVector(
-                    indices=non_zero_indices.tolist(),
-                    values=non_zero_values.tolist()
+            # Vectorized non-zero extraction; rows come back in order
+            coords = weights.nonzero()
+            values = weights[coords[:, 0], coords[:, 1]].cpu().numpy()
+            rows = coords[:, 0].cpu().numpy()
+            columns = coords[:, 1].cpu().numpy()
+        
+        return rows, columns, values
+    
+    @staticmethod
+    def prune_sparse(
+        vector: SparseVector,
+        top_k: Optional[int] = None,
+        min_weight: Optional[float] = None
+    ) -> SparseVector:
+        """Drop the light terms of an indexed sparse vector
+        
+        Keeps terms weighing at least `min_weight`, then the `top_k`
+        heaviest of those (SPARSE_PRUNE_* by default; 0 disables either).
+        Queries are never pruned, and cached encodings stay complete.
+        """
+        top_k = settings.sparse_prune_top_k if top_k is None else top_k
+        min_weight = settings.sparse_prune_min_weight if min_weight is None else min_weight
+        if not min_weight and not (top_k and len(vector.indices) > top_k):
+            return vector
+        
+        values = np.asarray(vector.values, dtype=np.float32)
+        keep = values >= min_weight if min_weight else np.ones(len(values), dtype=bool)
+        if top_k and keep.sum() > top_k:
+            # Index order is preserved; ties at the cut-off are broken by position
+            heaviest = np.argpartition(-np.where(keep, values, -np.inf), top_k - 1)[:top_k]
+            keep = np.zeros(len(values), dtype=bool)
+            keep[heaviest] = True
+        return SparseVector(
+            indices=np.asarray(vector.indices)[keep].tolist(),
+            values=values[keep].tolist()
+        )
+    
+    @staticmethod
+    def document_id(doc: Dict[str, Any]) -> str:
+        """Point ID for a document: its own ID, or an MD5 of the text"""
+        if doc.get("id"):
+            return str(doc["id"])
+        return hashlib.md5(doc["text"].encode()).hexdigest()
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash stored in the payload to detect unchanged texts on re-indexing"""
+        return hashlib.sha256(text.encode()).hexdigest()
+    
+    @staticmethod
+    def _normalize_id(point_id: Any) -> str:
+        """Canonical form of a point ID (Qdrant returns UUIDs hyphenated)"""
+        try:
+            return str(uuid.UUID(str(point_id)))
+        except ValueError:
+            return str(point_id)
+    
+    @property
+    def chunker(self) -> DocumentChunker:
+        """Chunker on the sparse tokenizer, whose token budget is the tighter one"""
+        if self._chunker is None:
+            self._chunker = DocumentChunker(
+                self.sparse_tokenizer,
+                max_tokens=min(settings.chunk_max_tokens, settings.sparse_max_length - 2),
+                overlap=settings.chunk_overlap_tokens
+            )
+        return self._chunker
+    
+    def chunk_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Split documents into chunk documents carrying their parent ID and character offsets"""
+        chunks = []
+        spans = self.chunker.spans([doc["text"] for doc in documents])
+        for doc, doc_spans in zip(documents, spans):
+            parent_id = self._normalize_id(self.document_id(doc))
+            parent_hash = self.content_hash(doc["text"])
+            for index, (start, end) in enumerate(doc_spans):
+                chunks.append({
+                    "id": chunk_id(parent_id, index),
+                    "text": doc["text"][start:end],
+                    "metadata": doc.get("metadata", {}),
+                    PARENT_ID_FIELD: parent_id,
+                    "chunk_index": index,
+                    "chunk_start": start,
+                    "chunk_end": end,
+                    "chunk_count": len(doc_spans),
+                    "parent_hash": parent_hash
+                })
+        return chunks
+    
+    def build_points(self, documents: List[Dict[str, Any]], chunking: bool = False) -> List[PointStruct]:
+        """Encode documents and build points with both named vectors
+        
+        With `chunking`, long documents become several chunk points; chunks
+        from all documents in the call are encoded together.
+        """
+        if chunking:
+            documents = self.chunk_documents(documents)
+        
+        # Collapse duplicate texts so each distinct text is encoded once
+        texts = list(dict.fromkeys(doc["text"] for doc in documents))
+        positions = {text: i for i, text in enumerate(texts)}
+        
+        # Generate embeddings in batches
+        logger.info(f"Encoding {len(texts)} distinct texts for {len(documents)} documents...")
+        dense_embeddings = self.encode_dense(texts)
+        sparse_embeddings = [self.prune_sparse(vector) for vector in self.encode_sparse(texts)]
+        
+        # Prepare points with both named vectors for Qdrant
+        points = []
+        for doc in documents:
+            i = positions[doc["text"]]
+            point_id = self.document_id(doc)  # Use the document ID directly
+            payload = {
+                "text": doc["text"],
+                "metadata": doc.get("metadata", {}),
+                "content_hash": self.content_hash(doc["text"]),
+                # Unchunked documents are their own parent, so grouped search covers them too
+                PARENT_ID_FIELD: doc.get(PARENT_ID_FIELD) or self._normalize_id(point_id)
+            }
+            payload.update({field: doc[field] for field in CHUNK_FIELDS if field in doc})
+            point = PointStruct(
+                id=point_id,
+                vector={
+                    "dense": dense_embeddings[i].tolist(),
+                    "sparse": sparse_embeddings[i]
+                },
+                payload=payload
+            )
+            points.append(point)
+        
+        return points
+    
+    @staticmethod
+    def document_count(points: List[PointStruct]) -> int:
+        """Number of documents among points; only a document's first chunk counts"""
+        return sum(1 for point in points if not point.payload.get("chunk_index"))
+    
+    @staticmethod
+    def _parent_filter(parent_id: str) -> models.Filter:
+        return models.Filter(must=[
+            models.FieldCondition(key=PARENT_ID_FIELD, match=models.MatchValue(value=parent_id))
+        ])
+    
+    @staticmethod
+    def _stale_chunks_filter(points: List[PointStruct]) -> Optional[models.Filter]:
+        """Match what re-indexed documents left behind
+        
+        Re-chunked documents leave surplus chunks and their unchunked version;
+        documents indexed unchunked again leave all their earlier chunks.
+        """
+        first_chunks = [point for point in points if point.payload.get("chunk_index") == 0]
+        unchunked = [point for point in points if point.payload.get("chunk_index") is None]
+        
+        conditions: List[Any] = [
+            models.Filter(must=[
+                models.FieldCondition(
+                    key=PARENT_ID_FIELD,
+                    match=models.MatchValue(value=point.payload[PARENT_ID_FIELD])
+                ),
+                models.FieldCondition(
+                    key="chunk_index",
+                    range=models.Range(gte=point.payload["chunk_count"])
+                )
+            ])
+            for point in first_chunks
+        ]
+        if first_chunks:
+            conditions.append(models.HasIdCondition(
+                has_id=[point.payload[PARENT_ID_FIELD] for point in first_chunks]
+            ))
+        if unchunked:
+            # The points themselves have no chunk_index, so only chunks of the same parents match
+            conditions.append(models.Filter(must=[
+                models.FieldCondition(
+                    key=PARENT_ID_FIELD,
+                    match=models.MatchAny(any=[point.payload[PARENT_ID_FIELD] for point in unchunked])
+                ),
+                models.FieldCondition(key="chunk_index", range=models.Range(gte=0))
+            ]))
+        return models.Filter(should=conditions) if conditions else None
+    
+    def prepare_incremental(
+        self,
+        documents: List[Dict[str, Any]],
+        collection_name: str = None,
+        chunking: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Drop unchanged documents before encoding
+        
+        Returns the documents that still need encoding and counts of new,
+        updated and skipped documents. Documents whose text is unchanged but
+        whose metadata differs get a payload-only update here, counted in
+        both "updated" and "payload_updated".
+        """
+        collection_name = collection_name or settings.qdrant_collection
+        counts = {"new": 0, "updated": 0, "skipped": 0, "payload_updated": 0}
+        
+        # Collapse documents sharing an ID within the batch; the last one wins
+        latest: Dict[str, Dict[str, Any]] = {}
+        for doc in documents:
+            latest[self._normalize_id(self.document_id(doc))] = doc
+        counts["skipped"] += len(documents) - len(latest)
+        
+        # Chunked documents are looked up by their first chunk, which holds the parent's hash
+        lookup = {point_id: chunk_id(point_id, 0) if chunking else point_id for point_id in latest}
+        hash_field = "parent_hash" if chunking else "content_hash"
+        
+        # Fetch stored hashes for all IDs in bulk
+        existing: Dict[str, Dict[str, Any]] = {}
+        ids = list(lookup.values())
+        try:
+            for start in range(0, len(ids), settings.upsert_batch_size):
+                records = self.qdrant_client.retrieve(
+                    collection_name=collection_name,
+                    ids=ids[start:start + settings.upsert_batch_size],
+                    with_payload=[hash_field, "metadata"],
+                    with_vectors=False
                 )
+                for record in records:
+                    existing[self._normalize_id(record.id)] = record.payload or {}
+        except Exception as e:
+            logger.warning(f"Could not look up existing points, indexing all documents: {e}")
+        
+        pending = []
+        payload_updates = []
+        for point_id, doc in latest.items():
+            stored = existing.get(lookup[point_id])
+            if stored is None:
+                counts["new"] += 1
+                pending.append(doc)
+            elif stored.get(hash_field) != self.content_hash(doc["text"]):
+                counts["updated"] += 1
+                pending.append(doc)
+            elif stored.get("metadata", {}) != doc.get("metadata", {}):
+                payload_updates.append((point_id, doc.get("metadata", {})))
             else:
-                sparse_vector = SparseVector(indices=[], values=[])
-            
-            sparse_vectors.append(sparse_vector)
+                counts["skipped"] += 1
         
-        return sparse_vectors
+        # Metadata-only changes: update payloads without re-encoding
+        if payload_updates:
+            try:
+                self.qdrant_client.batch_update_points(
+                    collection_name=collection_name,
+                    update_operations=[
+                        models.SetPayloadOperation(
+                            set_payload=models.SetPayload(
+                                payload={"metadata": metadata},
+                                points=None if chunking else [point_id],
+                                filter=self._parent_filter(point_id) if chunking else None
+                            )
+                        )
+                        for point_id, metadata in payload_updates
+                    ]
+                )
+                counts["updated"] += len(payload_updates)
+                counts["payload_updated"] = len(payload_updates)
+                self.invalidate_results(collection_name)
+            except Exception as e:
+                logger.warning(f"Payload update failed, re-indexing affected documents: {e}")
+                counts["updated"] += len(payload_updates)
+                pending.extend(
+                    latest[self._normalize_id(point_id)] for point_id, _ in payload_updates
+                )
+        
+        logger.info(
+            f"Incremental indexing: {counts['new']} new, {counts['updated']} updated, "
+            f"{counts['skipped']} skipped"
+        )
+        return pending, counts
     
     def index_documents(
         self,
         documents: List[Dict[str, Any]],
-        collection_name: str = None
+        collection_name: str = None,
+        batch_size: Optional[int] = None,
+        wait: Optional[bool] = None,
+        chunking: bool = False
     ) -> Tuple[int, List[str]]:
         """Index documents with hybrid embeddings"""
         collection_name = collection_name or settings.qdrant_collection
@@ -189,67 +884,128 @@ class HybridSearchEngine:
         errors = []
         
         try:
-            # Extract texts
-            texts = [doc["text"] for doc in documents]
-            
-            # Generate embeddings in batches
-            logger.info(f"Encoding {len(texts)} documents...")
-            dense_embeddings = self.encode_dense(texts)
-            sparse_embeddings = self.encode_sparse(texts)
+            points = self.build_points(documents, chunking)
+            indexed_count, errors = self.upsert_points(
+                collection_name, points, batch_size, wait
+            )
             
-            # Prepare points for Qdrant
-            points = []
-            for i, doc in enumerate(documents):
-                # Generate a unique ID for each document
-                if doc.get("id"):
-                    doc_id = str(doc["id"])
-                else:
-                    doc_id = hashlib.md5(doc["text"].encode()).hexdigest()
-                
-                point = PointStruct(
-                    id=doc_id,  # Use the document ID directly
-                    vector={
-                        "dense": dense_embeddings[i].tolist()
-                    },
-                    payload={
-                        "text": doc["text"],
-                        "metadata": doc.get("metadata", {})
-                    }
-                )
-                points.append(point)
+        except Exception as e:
+            logger.error(f"Error indexing documents: {e}")
+            errors.append(str(e))
+        
+        return indexed_count, errors
+    
+    def upsert_points(
+        self,
+        collection_name: str,
+        points: List[PointStruct],
+        batch_size: Optional[int] = None,
+        wait: Optional[bool] = None
+    ) -> Tuple[int, List[str]]:
+        """Upsert hybrid points in batches, isolating failures to single points"""
+        batch_size = batch_size or settings.upsert_batch_size
+        wait = settings.upsert_wait if wait is None else wait
+        indexed_count = 0
+        errors = []
+        
+        for i in range(0, len(points), batch_size):
+            batch = points[i:i + batch_size]
+            metrics.UPSERT_BATCH_SIZE.observe(len(batch))
+            try:
+                with metrics.QDRANT_UPSERT_SECONDS.labels(collection_name).time():
+                    self.qdrant_client.upsert(
+                        collection_name=collection_name,
+                        points=batch,
+                        wait=wait
+                    )
+                indexed_count += self.document_count(batch)
+            except Exception as e:
+                # Retry point by point so one bad point does not fail the batch
+                logger.warning(f"Batch upsert failed, retrying points individually: {e}")
+                for point in batch:
+                    try:
+                        self.qdrant_client.upsert(
+                            collection_name=collection_name,
+                            points=[point],
+                            wait=wait
+                        )
+                        indexed_count += self.document_count([point])
+                    except Exception as point_error:
+                        errors.append(f"Point {point.id}: {point_error}")
             
-            # Upload to Qdrant in batches
-            batch_size = 100
-            for i in range(0, len(points), batch_size):
-                batch = points[i:i + batch_size]
-                self.qdrant_client.upsert(
+            logger.info(f"Indexed {indexed_count}/{self.document_count(points)} documents")
+        
+        stale_chunks = self._stale_chunks_filter(points)
+        if stale_chunks is not None:
+            try:
+                self.qdrant_client.delete(
                     collection_name=collection_name,
-                    points=batch
+                    points_selector=models.FilterSelector(filter=stale_chunks),
+                    wait=wait
                 )
-                
-                # Also upload sparse vectors
-                sparse_batch = sparse_embeddings[i:i + batch_size]
-                for j, point in enumerate(batch):
-                    try:
-                        self.qdrant_client.update_vectors(
+            except Exception as e:
+                errors.append(f"Removing stale chunks failed: {e}")
+        
+        self.invalidate_results(collection_name)
+        metrics.DOCUMENTS_INDEXED.labels(collection_name).inc(indexed_count)
+        return indexed_count, errors
+    
+    async def aupsert_points(
+        self,
+        collection_name: str,
+        points: List[PointStruct],
+        batch_size: Optional[int] = None,
+        wait: Optional[bool] = None
+    ) -> Tuple[int, List[str]]:
+        """Upsert batches concurrently on the async Qdrant client"""
+        batch_size = batch_size or settings.upsert_batch_size
+        wait = settings.upsert_wait if wait is None else wait
+        semaphore = asyncio.Semaphore(settings.upsert_parallelism)
+        
+        async def upsert(batch: List[PointStruct]) -> Tuple[int, List[str]]:
+            async with semaphore:
+                metrics.UPSERT_BATCH_SIZE.observe(len(batch))
+                try:
+                    with metrics.QDRANT_UPSERT_SECONDS.labels(collection_name).time():
+                        await self.async_qdrant_client.upsert(
                             collection_name=collection_name,
-                            points=[
-                                models.PointVectors(
-                                    id=point.id,
-                                    vector={"sparse": sparse_batch[j]}
-                                )
-                            ]
+                            points=batch,
+                            wait=wait
                         )
-                    except Exception as e:
-                        logger.warning(f"Could not update sparse vector for point {point.id}: {e}")
-                
-                indexed_count += len(batch)
-                logger.info(f"Indexed {indexed_count}/{len(documents)} documents")
+                    return self.document_count(batch), []
+                except Exception as e:
+                    if len(batch) == 1:
+                        return 0, [f"Point {batch[0].id}: {e}"]
+                    logger.warning(f"Batch upsert failed, retrying points individually: {e}")
             
-        except Exception as e:
-            logger.error(f"Error indexing documents: {e}")
-            errors.append(str(e))
+            # Retry point by point so one bad point does not fail the batch
+            outcomes = await asyncio.gather(*(upsert([point]) for point in batch))
+            return (
+                sum(count for count, _ in outcomes),
+                [error for _, point_errors in outcomes for error in point_errors]
+            )
+        
+        outcomes = await asyncio.gather(*(
+            upsert(points[i:i + batch_size])
+            for i in range(0, len(points), batch_size)
+        ))
+        indexed_count = sum(count for count, _ in outcomes)
+        errors = [error for _, batch_errors in outcomes for error in batch_errors]
+        logger.info(f"Indexed {indexed_count}/{self.document_count(points)} documents")
+        
+        stale_chunks = self._stale_chunks_filter(points)
+        if stale_chunks is not None:
+            try:
+                await self.async_qdrant_client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.FilterSelector(filter=stale_chunks),
+                    wait=wait
+                )
+            except Exception as e:
+                errors.append(f"Removing stale chunks failed: {e}")
         
+        self.invalidate_results(collection_name)
+        metrics.DOCUMENTS_INDEXED.labels(collection_name).inc(indexed_count)
         return indexed_count, errors
     
     def search(
@@ -258,97 +1014,645 @@ class HybridSearchEngine:
         mode: str = "hybrid",
         limit: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        collection_name: str = None
+        collection_name: str = None,
+        dense_query: Optional[np.ndarray] = None,
+        sparse_query: Optional[SparseVector] = None,
+        offset: int = 0,
+        cache_key: Optional[Tuple] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        fusion: Optional[str] = None,
+        fusion_weight: Optional[float] = None,
+        group_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: Optional[bool] = None,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Perform hybrid search with RRF fusion"""
+        """Perform hybrid search, fusing the dense and sparse branches
+        
+        With `group_size`, results are parent documents (Qdrant group_by on
+        the parent ID), each with up to group_size matching chunks.
+        """
         collection_name = collection_name or settings.qdrant_collection
+        fusion = fusion or settings.fusion_method
+        fusion_weight = settings.fusion_weight if fusion_weight is None else fusion_weight
         results = []
         
+        # Callers that already checked the result cache pass its key. The key holds the
+        # collection version from before the search, so a concurrent write invalidates it.
+        if cache_key is None:
+            cache_key = self.search_cache_key(
+                query, mode, limit, offset, filters, collection_name,
+                oversampling=oversampling, rescore=rescore,
+                fusion=fusion, fusion_weight=fusion_weight, group_size=group_size,
+                prefetch=prefetch, hnsw_ef=hnsw_ef, exact=exact, projection=projection
+            )
+            cached = self.get_cached_results(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            # Encode query
-            query_prefix = f"query: {query}"
-            dense_query = self.encode_dense([query_prefix])[0]
-            sparse_query = self.encode_sparse([query])[0]
+            # Encode query unless the caller already did (e.g. batched upstream)
+            if dense_query is None and mode in ("hybrid", "dense"):
+                dense_query = self.encode_dense([query], mode="query")[0]
+            if sparse_query is None and mode in ("hybrid", "sparse"):
+                sparse_query = self.encode_sparse([query])[0]
             
-            if mode == "hybrid":
-                # Hybrid search with RRF fusion
-                search_result = self.qdrant_client.query_points(
-                    collection_name=collection_name,
-                    query=models.FusionQuery(
-                        fusion=models.Fusion.RRF
-                    ),
-                    prefetch=[
-                        models.Prefetch(
-                            query=dense_query.tolist(),
-                            using="dense",
-                            limit=limit * 2  # Fetch more for fusion
-                        ),
-                        models.Prefetch(
-                            query=sparse_query,
-                            using="sparse",
-                            limit=limit * 2
-                        )
-                    ],
-                    limit=limit,
-                    with_payload=True
+            params = resolve_search_params(self.search_profile(collection_name), prefetch, hnsw_ef, exact)
+            if group_size:
+                group_query = self._build_group_query(
+                    mode, offset + limit, group_size, dense_query, sparse_query, filters,
+                    oversampling, rescore, fusion, fusion_weight, params,
+                    payload_selector(projection)
                 )
-                
-            elif mode == "dense":
-                # Dense-only search
-                search_result = self.qdrant_client.search(
+                with metrics.QDRANT_QUERY_SECONDS.labels(mode, collection_name).time():
+                    response = self.qdrant_client.query_points_groups(
+                        collection_name=collection_name,
+                        **group_query
+                    )
+                results = project_results(self._collect_groups(response.groups, offset), query, projection)
+                self.cache_results(cache_key, results)
+                return results
+            
+            selector = payload_selector(projection)
+            requests = self._build_requests(
+                mode, limit, dense_query, sparse_query, filters, offset,
+                oversampling, rescore, params, selector
+            )
+            with metrics.QDRANT_QUERY_SECONDS.labels(mode, collection_name).time():
+                responses = self.qdrant_client.query_batch_points(
                     collection_name=collection_name,
-                    query_vector=("dense", dense_query.tolist()),
-                    limit=limit,
-                    with_payload=True
+                    requests=requests
                 )
+                results = self._collect(mode, responses, limit, offset, fusion, fusion_weight)
+                if mode == "hybrid":
+                    results = self._fetch_payloads(collection_name, results, selector)
+            results = project_results(results, query, projection)
+            self.cache_results(cache_key, results)
                 
-            elif mode == "sparse":
-                # Sparse-only search
-                search_result = self.qdrant_client.search(
+        except Exception as e:
+            logger.error(f"Error during search: {e}")
+        
+        return results
+    
+    async def asearch(
+        self,
+        query: str,
+        mode: str = "hybrid",
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        collection_name: str = None,
+        dense_query: Optional[np.ndarray] = None,
+        sparse_query: Optional[SparseVector] = None,
+        offset: int = 0,
+        cache_key: Optional[Tuple] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        fusion: Optional[str] = None,
+        fusion_weight: Optional[float] = None,
+        group_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: Optional[bool] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Perform search with pre-encoded query vectors on the async Qdrant client"""
+        collection_name = collection_name or settings.qdrant_collection
+        fusion = fusion or settings.fusion_method
+        fusion_weight = settings.fusion_weight if fusion_weight is None else fusion_weight
+        results = []
+        
+        if cache_key is None:
+            cache_key = self.search_cache_key(
+                query, mode, limit, offset, filters, collection_name,
+                oversampling=oversampling, rescore=rescore,
+                fusion=fusion, fusion_weight=fusion_weight, group_size=group_size,
+                prefetch=prefetch, hnsw_ef=hnsw_ef, exact=exact, projection=projection
+            )
+            cached = self.get_cached_results(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            params = resolve_search_params(await self.asearch_profile(collection_name), prefetch, hnsw_ef, exact)
+            if group_size:
+                group_query = self._build_group_query(
+                    mode, offset + limit, group_size, dense_query, sparse_query, filters,
+                    oversampling, rescore, fusion, fusion_weight, params,
+                    payload_selector(projection)
+                )
+                with metrics.QDRANT_QUERY_SECONDS.labels(mode, collection_name).time():
+                    response = await self.async_qdrant_client.query_points_groups(
+                        collection_name=collection_name,
+                        **group_query
+                    )
+                results = project_results(self._collect_groups(response.groups, offset), query, projection)
+                self.cache_results(cache_key, results)
+                return results
+            
+            selector = payload_selector(projection)
+            requests = self._build_requests(
+                mode, limit, dense_query, sparse_query, filters, offset,
+                oversampling, rescore, params, selector
+            )
+            with metrics.QDRANT_QUERY_SECONDS.labels(mode, collection_name).time():
+                responses = await self.async_qdrant_client.query_batch_points(
                     collection_name=collection_name,
-                    query_vector=("sparse", sparse_query),
-                    limit=limit,
-                    with_payload=True
+                    requests=requests
                 )
+                results = self._collect(mode, responses, limit, offset, fusion, fusion_weight)
+                if mode == "hybrid":
+                    results = await self._afetch_payloads(collection_name, results, selector)
+            results = project_results(results, query, projection)
+            self.cache_results(cache_key, results)
             
-            # Format results
-            for point in search_result:
-                result = {
-                    "id": point.id,
-                    "score": point.score if hasattr(point, 'score') else 0.0,
-                    "text": point.payload.get("text", ""),
-                    "metadata": point.payload.get("metadata", {})
-                }
-                results.append(result)
-                
         except Exception as e:
             logger.error(f"Error during search: {e}")
         
         return results
     
+    @staticmethod
+    def _dense_search_params(
+        oversampling: Optional[float],
+        rescore: Optional[bool],
+        params: Dict[str, Any]
+    ) -> Optional[models.SearchParams]:
+        """Dense branch SearchParams: HNSW beam width, exact search and quantization"""
+        quantization = None
+        if oversampling is not None or rescore is not None:
+            # Quantized dense search: fetch oversampling * limit candidates, rescore with originals
+            quantization = models.QuantizationSearchParams(
+                oversampling=oversampling,
+                rescore=rescore
+            )
+        if quantization is None and params["hnsw_ef"] is None and not params["exact"]:
+            return None
+        return models.SearchParams(
+            hnsw_ef=params["hnsw_ef"],
+            exact=params["exact"],
+            quantization=quantization
+        )
+    
+    def _build_requests(
+        self,
+        mode: str,
+        limit: int,
+        dense_query: Optional[np.ndarray],
+        sparse_query: Optional[SparseVector],
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        params: Optional[Dict[str, Any]] = None,
+        with_payload: Any = True
+    ) -> List[models.QueryRequest]:
+        """Build the Qdrant queries for a search mode (one per branch)"""
+        query_filter = build_filter(filters)
+        params = params or resolve_search_params()
+        dense_params = self._dense_search_params(oversampling, rescore, params)
+        
+        if mode == "hybrid":
+            # Both branches are fused client-side, so each must reach past the requested
+            # page for its fused ranks to be right; filter each so fusion only sees matches.
+            # Payloads are only retrieved for the fused page (see _fetch_payloads)
+            depth = prefetch_depth(offset + limit, params)
+            return [
+                models.QueryRequest(
+                    query=dense_query.tolist(),
+                    using="dense",
+                    filter=query_filter,
+                    params=dense_params,
+                    limit=depth,
+                    with_payload=False
+                ),
+                models.QueryRequest(
+                    query=sparse_query,
+                    using="sparse",
+                    filter=query_filter,
+                    limit=depth,
+                    with_payload=False
+                )
+            ]
+        
+        if mode == "dense":
+            # Dense-only search
+            return [
+                models.QueryRequest(
+                    query=dense_query.tolist(),
+                    using="dense",
+                    filter=query_filter,
+                    params=dense_params,
+                    limit=limit,
+                    offset=offset,
+                    with_payload=with_payload
+                )
+            ]
+        
+        if mode == "sparse":
+            # Sparse-only search
+            return [
+                models.QueryRequest(
+                    query=sparse_query,
+                    using="sparse",
+                    filter=query_filter,
+                    limit=limit,
+                    offset=offset,
+                    with_payload=with_payload
+                )
+            ]
+        
+        raise ValueError(f"Unknown search mode: {mode}")
+    
+    def _build_group_query(
+        self,
+        mode: str,
+        groups: int,
+        group_size: int,
+        dense_query: Optional[np.ndarray],
+        sparse_query: Optional[SparseVector],
+        filters: Optional[Dict[str, Any]] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        fusion: str = "rrf",
+        fusion_weight: float = 0.5,
+        params: Optional[Dict[str, Any]] = None,
+        with_payload: Any = True
+    ) -> Dict[str, Any]:
+        """Build query_points_groups arguments grouping hits by parent document
+        
+        Grouping happens in Qdrant, so hybrid mode fuses server-side: weighted
+        RRF, or DBSF at equal weights. The normalizing fusions need the full
+        candidate lists client-side and cannot be grouped.
+        """
+        query_filter = build_filter(filters)
+        params = params or resolve_search_params()
+        dense_params = self._dense_search_params(oversampling, rescore, params)
+        
+        arguments = {
+            "group_by": PARENT_ID_FIELD,
+            "limit": groups,
+            "group_size": group_size,
+            "query_filter": query_filter,
+            "with_payload": with_payload
+        }
+        
+        if mode == "hybrid":
+            if fusion == "rrf":
+                fusion_query = models.RrfQuery(rrf=models.Rrf(weights=[2 * fusion_weight, 2 * (1 - fusion_weight)]))
+            elif fusion == "dbsf" and fusion_weight == 0.5:
+                fusion_query = models.FusionQuery(fusion=models.Fusion.DBSF)
+            else:
+                raise ValueError(f"Grouped hybrid search supports rrf, or dbsf with weight 0.5, not {fusion}")
+            
+            # Several chunks of one document can precede the next document's best chunk
+            depth = max(groups * group_size * settings.group_prefetch_factor, prefetch_depth(groups * group_size, params))
+            arguments.update(
+                prefetch=[
+                    models.Prefetch(query=dense_query.tolist(), using="dense", filter=query_filter, params=dense_params, limit=depth),
+                    models.Prefetch(query=sparse_query, using="sparse", filter=query_filter, limit=depth)
+                ],
+                query=fusion_query
+            )
+        elif mode == "dense":
+            arguments.update(query=dense_query.tolist(), using="dense", search_params=dense_params)
+        elif mode == "sparse":
+            arguments.update(query=sparse_query, using="sparse")
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+        
+        return arguments
+    
+    def _collect_groups(self, groups: List[models.PointGroup], offset: int) -> List[Dict[str, Any]]:
+        """One result per parent document, represented by its best chunk"""
+        results = []
+        for group in groups[offset:]:
+            chunks = self._format_points(group.hits)
+            result = dict(chunks[0], id=str(group.id), chunks=chunks)
+            results.append(result)
+        return results
+    
+    def _collect(
+        self,
+        mode: str,
+        responses: List[models.QueryResponse],
+        limit: int,
+        offset: int,
+        fusion: str,
+        fusion_weight: float
+    ) -> List[Dict[str, Any]]:
+        """Turn branch responses into result dicts, fusing them in hybrid mode"""
+        if mode != "hybrid":
+            results = self._format_points(responses[0].points)
+            for result in results:
+                result[f"{mode}_score"] = result["score"]
+            return results
+        
+        fused = fuse(responses[0].points, responses[1].points, fusion, fusion_weight)
+        results = []
+        for point, score, dense_score, sparse_score in fused[offset:offset + limit]:
+            result = self._format_points([point])[0]
+            result.update(score=score, dense_score=dense_score, sparse_score=sparse_score)
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _payload_fields(payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Result dict fields taken from a point payload"""
+        payload = payload or {}
+        return {
+            "text": payload.get("text", ""),
+            "metadata": payload.get("metadata", {}),
+            PARENT_ID_FIELD: payload.get(PARENT_ID_FIELD),
+            "chunk_index": payload.get("chunk_index"),
+            "chunk_start": payload.get("chunk_start"),
+            "chunk_end": payload.get("chunk_end")
+        }
+    
+    @classmethod
+    def _format_points(cls, points: List[models.ScoredPoint]) -> List[Dict[str, Any]]:
+        """Convert scored points into result dicts"""
+        return [
+            {
+                "id": point.id,
+                "score": point.score if hasattr(point, 'score') else 0.0,
+                **cls._payload_fields(point.payload)
+            }
+            for point in points
+        ]
+    
+    def _attach_payloads(self, results: List[Dict[str, Any]], records: List[models.Record]) -> List[Dict[str, Any]]:
+        """Fill fused hybrid results with the payloads retrieved for them"""
+        payloads = {self._normalize_id(record.id): record.payload for record in records}
+        for result in results:
+            result.update(self._payload_fields(payloads.get(self._normalize_id(result["id"]))))
+        return results
+    
+    def _fetch_payloads(self, collection_name: str, results: List[Dict[str, Any]], with_payload: Any) -> List[Dict[str, Any]]:
+        """Retrieve payloads for the fused page of a hybrid search"""
+        if not results:
+            return results
+        records = self.qdrant_client.retrieve(
+            collection_name=collection_name,
+            ids=list(dict.fromkeys(result["id"] for result in results)),
+            with_payload=with_payload,
+            with_vectors=False
+        )
+        return self._attach_payloads(results, records)
+    
+    async def _afetch_payloads(self, collection_name: str, results: List[Dict[str, Any]], with_payload: Any) -> List[Dict[str, Any]]:
+        """Async variant of _fetch_payloads"""
+        if not results:
+            return results
+        records = await self.async_qdrant_client.retrieve(
+            collection_name=collection_name,
+            ids=list(dict.fromkeys(result["id"] for result in results)),
+            with_payload=with_payload,
+            with_vectors=False
+        )
+        return self._attach_payloads(results, records)
+    
+    def search_batch(
+        self,
+        searches: List[Dict[str, Any]]
+    ) -> Tuple[List[Tuple[List[Dict[str, Any]], float]], Dict[str, float]]:
+        """Run many searches with one encode pass and one query_batch_points call per collection
+        
+        Each search is a dict of search() keyword arguments. Returns (results, ms)
+        per search in input order, and the batch's encode/Qdrant timings.
+        """
+        start = time.perf_counter()
+        outputs: List[Optional[Tuple[List[Dict[str, Any]], float]]] = [None] * len(searches)
+        timings = {"encode_ms": 0.0, "qdrant_ms": 0.0}
+        
+        def elapsed_ms() -> float:
+            return (time.perf_counter() - start) * 1000
+        
+        # Serve repeated searches from the result cache
+        pending = []
+        for i, search in enumerate(searches):
+            search = {
+                "mode": "hybrid",
+                "limit": 10,
+                "offset": 0,
+                "filters": None,
+                **{key: value for key, value in search.items() if value is not None},
+            }
+            search["collection_name"] = search.get("collection_name") or settings.qdrant_collection
+            search["fusion"] = search.get("fusion") or settings.fusion_method
+            search["fusion_weight"] = search.get("fusion_weight", settings.fusion_weight)
+            search["cache_key"] = self.search_cache_key(
+                search["query"], search["mode"], search["limit"], search["offset"],
+                search["filters"], search["collection_name"],
+                oversampling=search.get("oversampling"), rescore=search.get("rescore"),
+                fusion=search["fusion"], fusion_weight=search["fusion_weight"],
+                prefetch=search.get("prefetch"), hnsw_ef=search.get("hnsw_ef"), exact=search.get("exact"),
+                projection=search.get("projection")
+            )
+            cached = self.get_cached_results(search["cache_key"])
+            if cached is not None:
+                outputs[i] = (cached, elapsed_ms())
+            else:
+                pending.append((i, search))
+        
+        if pending:
+            # One dense and one sparse forward pass for every query that needs them
+            encode_start = time.perf_counter()
+            dense_queries, sparse_queries = self.encode_queries(
+                [search["query"] for _, search in pending],
+                [search["mode"] for _, search in pending]
+            )
+            timings["encode_ms"] = (time.perf_counter() - encode_start) * 1000
+            
+            by_collection: Dict[str, List[Tuple[int, Dict[str, Any], List[models.QueryRequest]]]] = {}
+            for (i, search), dense_query, sparse_query in zip(pending, dense_queries, sparse_queries):
+                params = resolve_search_params(
+                    self.search_profile(search["collection_name"]),
+                    search.get("prefetch"), search.get("hnsw_ef"), search.get("exact")
+                )
+                requests = self._build_requests(
+                    search["mode"], search["limit"], dense_query, sparse_query,
+                    search["filters"], search["offset"],
+                    search.get("oversampling"), search.get("rescore"), params,
+                    payload_selector(search.get("projection"))
+                )
+                by_collection.setdefault(search["collection_name"], []).append((i, search, requests))
+            
+            for collection_name, entries in by_collection.items():
+                qdrant_start = time.perf_counter()
+                try:
+                    with metrics.QDRANT_QUERY_SECONDS.labels("batch", collection_name).time():
+                        responses = self.qdrant_client.query_batch_points(
+                            collection_name=collection_name,
+                            requests=[request for _, _, requests in entries for request in requests]
+                        )
+                except Exception as e:
+                    logger.error(f"Error during batch search in {collection_name}: {e}")
+                    for i, _, _ in entries:
+                        outputs[i] = ([], elapsed_ms())
+                    continue
+                finally:
+                    timings["qdrant_ms"] += (time.perf_counter() - qdrant_start) * 1000
+                
+                # Hand each search the responses for its own branch requests
+                collected = []
+                position = 0
+                for i, search, requests in entries:
+                    branch = responses[position:position + len(requests)]
+                    position += len(requests)
+                    collected.append(self._collect(
+                        search["mode"], branch, search["limit"], search["offset"],
+                        search["fusion"], search["fusion_weight"]
+                    ))
+                
+                # One retrieve per payload selector for the fused pages of the hybrid searches
+                pages: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+                for (_, search, _), results in zip(entries, collected):
+                    if search["mode"] == "hybrid":
+                        pages.setdefault(tuple(payload_selector(search.get("projection"))), []).extend(results)
+                retrieve_start = time.perf_counter()
+                try:
+                    for selector, results in pages.items():
+                        self._fetch_payloads(collection_name, results, list(selector))
+                except Exception as e:
+                    logger.error(f"Error retrieving batch search payloads in {collection_name}: {e}")
+                    for i, _, _ in entries:
+                        outputs[i] = ([], elapsed_ms())
+                    continue
+                finally:
+                    timings["qdrant_ms"] += (time.perf_counter() - retrieve_start) * 1000
+                
+                for (i, search, _), results in zip(entries, collected):
+                    results = project_results(results, search["query"], search.get("projection"))
+                    self.cache_results(search["cache_key"], results)
+                    outputs[i] = (results, elapsed_ms())
+        
+        return outputs, timings
+    
+    def encode_queries(
+        self,
+        queries: List[str],
+        modes: List[str]
+    ) -> Tuple[List[Optional[np.ndarray]], List[Optional[SparseVector]]]:
+        """Encode many queries in one dense batch and one sparse batch"""
+        dense_ids = [i for i, mode in enumerate(modes) if mode in ("hybrid", "dense")]
+        sparse_ids = [i for i, mode in enumerate(modes) if mode in ("hybrid", "sparse")]
+        
+        dense_queries: List[Optional[np.ndarray]] = [None] * len(queries)
+        sparse_queries: List[Optional[SparseVector]] = [None] * len(queries)
+        
+        if dense_ids:
+            embeddings = self.encode_dense([queries[i] for i in dense_ids], mode="query")
+            for i, embedding in zip(dense_ids, embeddings):
+                dense_queries[i] = embedding
+        if sparse_ids:
+            vectors = self.encode_sparse([queries[i] for i in sparse_ids])
+            for i, vector in zip(sparse_ids, vectors):
+                sparse_queries[i] = vector
+        
+        return dense_queries, sparse_queries
+    
     def get_collection_info(self, collection_name: str = None) -> Dict[str, Any]:
-        """Get collection statistics"""
+        """Get collection statistics, effective configuration and optimization status"""
         collection_name = collection_name or settings.qdrant_collection
         
         try:
             info = self.qdrant_client.get_collection(collection_name)
+            params = info.config.params
+            dense = params.vectors.get("dense")
+            sparse = (params.sparse_vectors or {}).get("sparse")
+            # Per-vector HNSW settings override the collection's
+            hnsw = info.config.hnsw_config.model_copy(
+                update=dense.hnsw_config.model_dump(exclude_none=True) if dense.hnsw_config else {}
+            )
+            optimizer = info.config.optimizer_config
             return {
                 "name": collection_name,
-                "vectors_count": info.vectors_count,
+                # vectors_count was dropped from newer Qdrant responses
+                "vectors_count": getattr(info, "vectors_count", None) or info.points_count or 0,
                 "points_count": info.points_count,
                 "config": {
-                    "vector_size": info.config.params.vectors.get("dense").size,
-                    "distance": str(info.config.params.vectors.get("dense").distance)
+                    "profile": (info.config.metadata or {}).get("profile"),
+                    "search_profile": (info.config.metadata or {}).get(SEARCH_PROFILE_KEY) or {},
+                    "vector_size": dense.size,
+                    "distance": str(dense.distance),
+                    "on_disk": bool(dense.on_disk),
+                    "sparse_on_disk": bool(sparse and sparse.index and sparse.index.on_disk),
+                    "sparse_datatype": str(sparse.index.datatype.value) if sparse and sparse.index and sparse.index.datatype else "float32",
+                    "sparse_idf": bool(sparse and sparse.modifier == models.Modifier.IDF),
+                    "on_disk_payload": params.on_disk_payload,
+                    "quantization": self._quantization_name(
+                        dense.quantization_config
+                        or info.config.quantization_config
+                    ),
+                    "shard_number": params.shard_number,
+                    "replication_factor": params.replication_factor,
+                    "hnsw": {
+                        "m": hnsw.m,
+                        "ef_construct": hnsw.ef_construct,
+                        "on_disk": bool(hnsw.on_disk),
+                        "full_scan_threshold": hnsw.full_scan_threshold
+                    },
+                    "optimizers": {
+                        "default_segment_number": optimizer.default_segment_number,
+                        "max_segment_size": optimizer.max_segment_size,
+                        "indexing_threshold": optimizer.indexing_threshold
+                    },
+                    "payload_indexes": {
+                        field: str(index.data_type.value)
+                        for field, index in (info.payload_schema or {}).items()
+                    }
+                },
+                "status": {
+                    "status": str(info.status.value),
+                    "optimizer_status": str(info.optimizer_status) if isinstance(info.optimizer_status, str)
+                    else f"error: {info.optimizer_status.error}",
+                    "segments_count": info.segments_count,
+                    "indexed_vectors_count": info.indexed_vectors_count or 0
                 }
             }
         except Exception as e:
             logger.error(f"Error getting collection info: {e}")
             return {}
     
+    @staticmethod
+    def _quantization_name(config: Optional[models.QuantizationConfig]) -> Optional[str]:
+        if isinstance(config, models.ScalarQuantization):
+            return "scalar"
+        if isinstance(config, models.ProductQuantization):
+            return "product"
+        if isinstance(config, models.BinaryQuantization):
+            return "binary"
+        return None
+    
+    def create_payload_index(
+        self,
+        field: str,
+        schema: str = "keyword",
+        collection_name: str = None
+    ) -> bool:
+        """Create a payload index on a metadata field for fast filtered search"""
+        collection_name = collection_name or settings.qdrant_collection
+        
+        try:
+            self.qdrant_client.create_payload_index(
+                collection_name=collection_name,
+                field_name=payload_key(field),
+                field_schema=PAYLOAD_SCHEMAS[schema],
+                wait=True
+            )
+            logger.info(f"Payload index on {payload_key(field)} ({schema}) created in {collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating payload index: {e}")
+            return False
+    
     def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection"""
         try:
             self.qdrant_client.delete_collection(collection_name)
+            self.invalidate_results(collection_name)
+            self._search_profiles.pop(collection_name, None)
             logger.info(f"Collection {collection_name} deleted")
             return True
         except Exception as e:
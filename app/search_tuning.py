@@ -0,0 +1,208 @@
+"""Search parameters: hybrid prefetch depth, hnsw_ef and exact dense search
+
+The effective parameters of a search are the settings from the environment,
+overridden by the collection's default search profile (kept in the
+collection metadata), overridden by the request. The tuner sweeps the
+parameters on a sample of queries and stores the cheapest combination that
+reaches a target hybrid recall@k as the collection's search profile:
+
+    python -m app.search_tuning --collection docs --k 10 --target-recall 0.95
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from qdrant_client import models
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.search_engine import HybridSearchEngine
+
+SEARCH_PARAMS = ("prefetch_min", "prefetch_factor", "hnsw_ef", "exact")
+SEARCH_PROFILE_KEY = "search_profile"
+
+# Prefetch depth of the reference searches the tuner measures recall against
+REFERENCE_DEPTH = 1000
+TUNING_DEPTHS = (1, 2, 3, 5, 8, 12, 20)  # Multiples of k
+TUNING_EFS = (None, 32, 64, 128, 256, 512)
+
+
+def resolve_search_params(
+    profile: Optional[Dict[str, Any]] = None,
+    prefetch: Optional[int] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Effective search parameters for a collection profile and request overrides
+
+    An explicit `prefetch` fixes the per-branch depth instead of deriving it
+    from the number of results.
+    """
+    unknown = set(profile or {}) - set(SEARCH_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown search parameters: {', '.join(sorted(unknown))}")
+
+    params = {
+        "prefetch_min": settings.hybrid_prefetch_min,
+        "prefetch_factor": settings.hybrid_prefetch_factor,
+        "hnsw_ef": settings.hnsw_ef,
+        "exact": settings.exact_search
+    }
+    params.update({key: value for key, value in (profile or {}).items() if value is not None})
+    if prefetch is not None:
+        params.update(prefetch_min=prefetch, prefetch_factor=1.0)
+    if hnsw_ef is not None:
+        params["hnsw_ef"] = hnsw_ef
+    if exact is not None:
+        params["exact"] = exact
+    return params
+
+
+def prefetch_depth(n: int, params: Dict[str, Any]) -> int:
+    """Candidates fetched per hybrid branch to fuse the first n results
+
+    Small pages get a fixed floor, since fused ranks near the top need
+    candidates well past n; larger pages grow linearly instead of doubling.
+    """
+    return max(n, params["prefetch_min"], math.ceil(n * params["prefetch_factor"]))
+
+
+def sample_queries(engine: "HybridSearchEngine", collection_name: str, n: int, words: int = 8, seed: int = 0) -> List[str]:
+    """Query texts cut from random points of the collection"""
+    rng = random.Random(seed)
+    response = engine.qdrant_client.query_points(
+        collection_name=collection_name,
+        query=models.SampleQuery(sample=models.Sample.RANDOM),
+        limit=n,
+        with_payload=["text"]
+    )
+    queries = []
+    for point in response.points:
+        tokens = (point.payload or {}).get("text", "").split()
+        if tokens:
+            start = rng.randrange(max(1, len(tokens) - words + 1))
+            queries.append(" ".join(tokens[start:start + words]))
+    return queries
+
+
+def _run(engine, collection_name, dense_queries, sparse_queries, k, params):
+    """Hybrid top-k IDs per query and the median Qdrant time in ms; the result cache is bypassed"""
+    ids, latencies = [], []
+    for dense_query, sparse_query in zip(dense_queries, sparse_queries):
+        requests = engine._build_requests("hybrid", k, dense_query, sparse_query, params=params)
+        start = time.perf_counter()
+        responses = engine.qdrant_client.query_batch_points(collection_name=collection_name, requests=requests)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results = engine._collect("hybrid", responses, k, 0, settings.fusion_method, settings.fusion_weight)
+        ids.append([str(result["id"]) for result in results])
+    return ids, statistics.median(latencies) if latencies else 0.0
+
+
+def tune_search_profile(
+    engine: "HybridSearchEngine",
+    collection_name: str,
+    queries: List[str],
+    k: int = 10,
+    target_recall: float = 0.95
+) -> Dict[str, Any]:
+    """Sweep prefetch depth, hnsw_ef and exact search; pick the cheapest setting reaching target_recall
+
+    Recall@k is measured against exact searches with a deep prefetch.
+    Candidates are tried in order of estimated cost (exact search last, then
+    the larger of prefetch depth and HNSW beam width); a more expensive one
+    only wins when its median latency is more than 10% lower, so timing
+    noise does not decide between equivalent settings.
+    """
+    dense_queries, sparse_queries = engine.encode_queries(queries, ["hybrid"] * len(queries))
+    reference_params = resolve_search_params(prefetch=max(REFERENCE_DEPTH, k), exact=True)
+    reference, _ = _run(engine, collection_name, dense_queries, sparse_queries, k, reference_params)
+
+    # Without hnsw_ef, Qdrant searches with the collection's ef_construct
+    default_ef = engine.qdrant_client.get_collection(collection_name).config.hnsw_config.ef_construct
+    candidates = [
+        {"prefetch_min": k * multiple, "prefetch_factor": float(multiple), "hnsw_ef": ef, "exact": exact}
+        for multiple in TUNING_DEPTHS
+        for ef, exact in [(ef, False) for ef in TUNING_EFS] + [(None, True)]
+    ]
+    candidates.sort(key=lambda profile: (
+        profile["exact"],
+        max(profile["prefetch_min"], profile["hnsw_ef"] or default_ef),
+        profile["prefetch_min"],
+        profile["hnsw_ef"] or default_ef
+    ))
+
+    _run(engine, collection_name, dense_queries[:5], sparse_queries[:5], k, reference_params)  # warmup
+    trials, best = [], None
+    for profile in candidates:
+        ids, latency_ms = _run(engine, collection_name, dense_queries, sparse_queries, k, resolve_search_params(profile))
+        recall = sum(
+            len(set(found) & set(expected)) / len(expected) if expected else 1.0
+            for found, expected in zip(ids, reference)
+        ) / max(1, len(reference))
+        trial = {"profile": profile, "recall": round(recall, 4), "latency_ms": round(latency_ms, 3)}
+        trials.append(trial)
+        if recall >= target_recall and (best is None or latency_ms < best["latency_ms"] * 0.9):
+            best = trial
+
+    return {
+        "collection": collection_name,
+        "queries": len(queries),
+        "k": k,
+        "target_recall": target_recall,
+        "met": best is not None,
+        "best": best or max(trials, key=lambda trial: (trial["recall"], -trial["latency_ms"])),
+        "trials": trials
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune a collection's default hybrid search profile")
+    parser.add_argument("--collection", default=settings.qdrant_collection)
+    parser.add_argument("--k", type=int, default=settings.default_limit)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--queries", help="File with one query per line (default: sampled from the collection)")
+    parser.add_argument("--sample", type=int, default=100, help="Queries sampled from the collection")
+    parser.add_argument("--dry-run", action="store_true", help="Report without storing the profile")
+    args = parser.parse_args()
+
+    from app.search_engine import HybridSearchEngine
+
+    engine = HybridSearchEngine()
+    if not engine.load_models():
+        raise SystemExit(f"Failed to load models: {engine.model_state}")
+
+    if args.queries:
+        with open(args.queries) as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = sample_queries(engine, args.collection, args.sample)
+    if not queries:
+        raise SystemExit(f"No queries to tune {args.collection} with")
+
+    report = tune_search_profile(engine, args.collection, queries, args.k, args.target_recall)
+    print(f"{len(queries)} queries, k={args.k}, target recall@{args.k} {args.target_recall}")
+    print(f"{'prefetch_min':>12} {'factor':>6} {'hnsw_ef':>7} {'exact':>5} {'recall':>7} {'ms':>8}")
+    for trial in report["trials"]:
+        profile = trial["profile"]
+        print(
+            f"{profile['prefetch_min']:>12} {profile['prefetch_factor']:>6} {str(profile['hnsw_ef']):>7} "
+            f"{str(profile['exact']):>5} {trial['recall']:>7.4f} {trial['latency_ms']:>8.3f}"
+        )
+
+    best = report["best"]
+    if not report["met"]:
+        print(f"No setting reached recall {args.target_recall}; best recall {best['recall']}")
+    print(f"Selected: {best['profile']} (recall {best['recall']}, {best['latency_ms']} ms)")
+    if report["met"] and not args.dry_run:
+        if not engine.set_search_profile(args.collection, best["profile"]):
+            raise SystemExit("Failed to store the search profile")
+        print(f"Stored as the default search profile of {args.collection}")
+
+
+if __name__ == "__main__":
+    main()
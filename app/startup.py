@@ -0,0 +1,61 @@
+"""Startup bookkeeping: phase timings and readiness"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+
+class StartupState:
+    """Tracks background initialization for /livez and /readyz
+
+    The API binds its port before the model stack is imported; the search
+    engine is built, its models loaded and warmed up in the background.
+    Each phase is timed so the startup breakdown can be logged and
+    reported while the service is still coming up.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.current: Optional[str] = None
+        self.ready = False
+        self.error: Optional[str] = None
+        self.gpu_available = False
+        self.gpu_name: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time one startup phase"""
+        self.current = name
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - start_time, 3)
+            self.current = None
+
+    def elapsed(self) -> float:
+        """Seconds since the application module was imported"""
+        return round(time.perf_counter() - self.started_at, 3)
+
+    @property
+    def finished(self) -> bool:
+        """Whether initialization is over, successfully or not"""
+        return self.ready or self.error is not None
+
+    def mark_ready(self):
+        self.ready = True
+        self.phases["total"] = self.elapsed()
+
+    def mark_failed(self, error: str):
+        self.error = error
+        self.phases["total"] = self.elapsed()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "phase": self.current,
+            "error": self.error,
+            "elapsed_seconds": self.elapsed(),
+            "phases": dict(self.phases)
+        }
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite for HybridSearchEngine
+
+Drives the engine directly, with no API server, against qdrant-client's
+local mode (--location :memory: by default) on a synthetic topical corpus:
+
+- encode: docs/sec of encode_dense and encode_sparse
+- index: docs/sec of index_documents (encoding + upsert)
+- search: p50/p95/p99 latency and QPS of search() per mode, query
+  encoding included, and recall@k against brute-force ground truth
+  (exact dense cosine, exact sparse dot product, and the fusion of both
+  full rankings for hybrid)
+- peak RSS of the process after each stage
+
+Embedding and result caches are disabled so every call does the work.
+Any checkpoints can be passed as --dense-model/--sparse-model, including
+small stand-ins, which keeps the suite runnable on CPU. Local mode searches
+exactly, so there recall checks that the indexed vectors and query paths
+agree with brute force; against a server (--location server) it includes
+HNSW approximation.
+
+Results are written with --output and can be diffed with --compare:
+
+    python benchmarks/bench_engine.py --output baseline.json
+    python benchmarks/bench_engine.py --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+
+settings.cache_embeddings = False
+settings.cache_search_results = False
+
+from app.fusion import fuse
+from app.search_engine import HybridSearchEngine
+
+MODES = ("dense", "sparse", "hybrid")
+COLLECTION = "bench_engine"
+SYLLABLES = "ka lo mi ne su ra te vo pi da gu be ho li ma no se ru ta vi".split()
+Scored = namedtuple("Scored", "id score")
+
+
+def make_documents(n: int, topics: int = 20, seed: int = 42) -> List[Dict[str, Any]]:
+    """Unique synthetic documents; each topic draws most words from its own vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(3000)})
+    topic_words = [rng.sample(vocabulary, 150) for _ in range(topics)]
+
+    documents = []
+    for i in range(n):
+        topic = i % topics
+        length = rng.choice([12, 30, 60, 120])
+        words = [
+            rng.choice(topic_words[topic]) if rng.random() < 0.8 else rng.choice(vocabulary)
+            for _ in range(length)
+        ]
+        documents.append({
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"bench-engine/{i}")),
+            "text": " ".join(words),
+            "metadata": {"topic": topic}
+        })
+    return documents
+
+
+def make_queries(documents: List[Dict[str, Any]], n: int, seed: int = 7) -> List[str]:
+    """Short queries made of words sampled from random documents"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        words = rng.choice(documents)["text"].split()
+        queries.append(" ".join(rng.sample(words, min(len(words), rng.randint(3, 6)))))
+    return queries
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    ms = np.array(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "qps": round(len(ms) / (ms.sum() / 1000), 1)
+    }
+
+
+def ground_truth(doc_ids, doc_dense, doc_sparse, query_dense, query_sparse, k) -> Dict[str, List[List[str]]]:
+    """Exact top-k IDs per mode, scored the way Qdrant scores each branch"""
+    inverted: Dict[int, List] = {}
+    for d, vector in enumerate(doc_sparse):
+        for index, value in zip(vector.indices, vector.values):
+            inverted.setdefault(index, []).append((d, value))
+
+    truth = {mode: [] for mode in MODES}
+    dense_scores = query_dense @ doc_dense.T
+    for q, sparse_query in enumerate(query_sparse):
+        dense_order = np.argsort(-dense_scores[q], kind="stable")
+        dense_ranked = [Scored(doc_ids[d], float(dense_scores[q][d])) for d in dense_order]
+
+        sparse_scores: Dict[int, float] = {}
+        for index, value in zip(sparse_query.indices, sparse_query.values):
+            for d, weight in inverted.get(index, ()):
+                sparse_scores[d] = sparse_scores.get(d, 0.0) + value * weight
+        sparse_ranked = [
+            Scored(doc_ids[d], score)
+            for d, score in sorted(sparse_scores.items(), key=lambda item: -item[1])
+            if score > 0
+        ]
+
+        fused = fuse(dense_ranked, sparse_ranked, settings.fusion_method, settings.fusion_weight)
+        truth["dense"].append([point.id for point in dense_ranked[:k]])
+        truth["sparse"].append([point.id for point in sparse_ranked[:k]])
+        truth["hybrid"].append([point.id for point, *_ in fused[:k]])
+    return truth
+
+
+def recall(expected: List[str], found: List[str]) -> float:
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(found)) / len(expected)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args) -> Dict[str, Any]:
+    settings.dense_model = args.dense_model
+    settings.sparse_model = args.sparse_model
+    if args.location != "server":
+        settings.qdrant_location = args.location
+
+    engine = HybridSearchEngine()
+    if not engine.load_models():
+        raise SystemExit(f"Failed to load models: {engine.model_state}")
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "device": str(engine.device),
+            "threads": torch.get_num_threads(),
+            "backend": settings.inference_backend,
+            "dense_model": args.dense_model,
+            "sparse_model": args.sparse_model,
+            "location": args.location,
+            "docs": args.docs,
+            "queries": args.queries,
+            "k": args.k,
+            "batch_size": settings.batch_size,
+            "fusion": settings.fusion_method
+        }
+    }
+    peak_rss = {"load": peak_rss_mb()}
+
+    documents = make_documents(args.docs, seed=args.seed)
+    queries = make_queries(documents, args.queries, seed=args.seed + 1)
+    texts = [doc["text"] for doc in documents]
+
+    # Encoders, one warm pass first
+    engine.encode_dense(texts[:8])
+    engine.encode_sparse(texts[:8])
+    doc_dense, dense_seconds = timed(engine.encode_dense, texts)
+    doc_sparse, sparse_seconds = timed(engine.encode_sparse, texts)
+    results["encode"] = {
+        "dense_docs_per_sec": round(len(texts) / dense_seconds, 1),
+        "sparse_docs_per_sec": round(len(texts) / sparse_seconds, 1)
+    }
+    peak_rss["encode"] = peak_rss_mb()
+
+    # Indexing into a fresh collection
+    if engine.qdrant_client.collection_exists(COLLECTION):
+        engine.delete_collection(COLLECTION)
+    engine.create_collection(COLLECTION)
+    (indexed, errors), index_seconds = timed(engine.index_documents, documents, COLLECTION)
+    if errors or indexed != len(documents):
+        raise SystemExit(f"Indexed {indexed}/{len(documents)} documents: {errors[:3]}")
+    results["index"] = {
+        "docs_per_sec": round(len(documents) / index_seconds, 1),
+        "seconds": round(index_seconds, 3)
+    }
+    peak_rss["index"] = peak_rss_mb()
+
+    # Search latency and recall per mode
+    query_dense = engine.encode_dense(queries, mode="query")
+    query_sparse = engine.encode_sparse(queries)
+    doc_ids = [engine._normalize_id(doc["id"]) for doc in documents]
+    truth = ground_truth(doc_ids, doc_dense, doc_sparse, query_dense, query_sparse, args.k)
+
+    results["search"] = {}
+    for mode in MODES:
+        for query in queries[:5]:
+            engine.search(query, mode=mode, limit=args.k, collection_name=COLLECTION)
+        latencies, recalls = [], []
+        for q, query in enumerate(queries):
+            hits, seconds = timed(engine.search, query, mode=mode, limit=args.k, collection_name=COLLECTION)
+            latencies.append(seconds)
+            recalls.append(recall(truth[mode][q], [engine._normalize_id(hit["id"]) for hit in hits]))
+        results["search"][mode] = {
+            **latency_stats(latencies),
+            f"recall_at_{args.k}": round(float(np.mean(recalls)), 4)
+        }
+    peak_rss["search"] = peak_rss_mb()
+
+    engine.delete_collection(COLLECTION)
+    results["peak_rss_mb"] = peak_rss
+    return results
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves keyed by dotted path, metadata excluded"""
+    flat = {}
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+
+def report(results: Dict[str, Any], baseline: Dict[str, Any] = None):
+    meta = results["meta"]
+    print(
+        f"{meta['docs']} docs, {meta['queries']} queries, k={meta['k']}, device {meta['device']}, "
+        f"{meta['threads']} threads, dense={meta['dense_model']}, sparse={meta['sparse_model']}"
+    )
+    current = flatten(results)
+    previous = flatten(baseline) if baseline else {}
+    if baseline:
+        print(f"Compared with {baseline['meta'].get('commit')} from {baseline['meta'].get('timestamp')}")
+    print(f"{'metric':<34} {'value':>12}" + (f" {'baseline':>12} {'change':>8}" if baseline else ""))
+    for name, value in current.items():
+        line = f"{name:<34} {value:>12}"
+        if name in previous:
+            old = previous[name]
+            change = f"{(value - old) / old * 100:+.1f}%" if old else "n/a"
+            line += f" {old:>12} {change:>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dense-model", default=settings.dense_model)
+    parser.add_argument("--sparse-model", default=settings.sparse_model)
+    parser.add_argument("--location", default=":memory:", help="':memory:', a local storage path, or 'server' for QDRANT_HOST")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--compare", help="JSON results of an earlier run to diff against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = run(args)
+    report(results, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Parity check and CPU throughput of the ONNX Runtime backend against PyTorch
+
+Encodes the same synthetic corpus with PyTorch, ONNX fp32 and ONNX int8
+through HybridSearchEngine.encode_dense/encode_sparse and reports:
+
+- dense parity: cosine similarity to the PyTorch embedding (mean and min)
+- sparse parity: Jaccard overlap of the active vocabulary terms and cosine of
+  the sparse vectors
+- docs/sec for both encoders
+
+Exits non-zero when a backend falls below --min-cosine / --min-overlap.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+from transformers import AutoTokenizer, AutoModelForMaskedLM
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.onnx_backend import OnnxDenseEncoder, OnnxSparseEncoder
+from app.search_engine import HybridSearchEngine
+from bench_sparse_encoding import make_corpus
+
+
+def make_engine(backend: str, args) -> HybridSearchEngine:
+    engine = HybridSearchEngine()
+    engine.device = torch.device("cpu")
+    if backend == "torch":
+        engine.dense_model = SentenceTransformer(args.dense_model, device="cpu")
+        engine.dense_model.max_seq_length = settings.max_sequence_length
+        engine.sparse_tokenizer = AutoTokenizer.from_pretrained(args.sparse_model)
+        engine.sparse_model = AutoModelForMaskedLM.from_pretrained(args.sparse_model).eval()
+    else:
+        options = {"cache_dir": args.cache_dir, "quantize": backend == "onnx-int8", "threads": args.threads}
+        engine.dense_model = OnnxDenseEncoder(args.dense_model, **options)
+        engine.dense_model.max_seq_length = settings.max_sequence_length
+        engine.sparse_model = OnnxSparseEncoder(args.sparse_model, **options)
+        engine.sparse_tokenizer = engine.sparse_model.tokenizer
+    return engine
+
+
+def sparse_parity(reference, candidate):
+    overlaps, cosines = [], []
+    for a, b in zip(reference, candidate):
+        ref = dict(zip(a.indices, a.values))
+        cand = dict(zip(b.indices, b.values))
+        union = set(ref) | set(cand)
+        overlaps.append(len(set(ref) & set(cand)) / len(union) if union else 1.0)
+        dot = sum(value * cand.get(index, 0.0) for index, value in ref.items())
+        norm = np.linalg.norm(list(ref.values())) * np.linalg.norm(list(cand.values()))
+        cosines.append(dot / norm if norm else 1.0)
+    return float(np.mean(overlaps)), float(np.mean(cosines))
+
+
+def throughput(fn, texts, repeats):
+    fn(texts[:8])  # warmup
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dense-model", default=settings.dense_model)
+    parser.add_argument("--sparse-model", default=settings.sparse_model)
+    parser.add_argument("--cache-dir", default=settings.onnx_cache_dir)
+    parser.add_argument("--threads", type=int, default=settings.onnx_threads)
+    parser.add_argument("--docs", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    parser.add_argument("--min-overlap", type=float, default=0.8)
+    args = parser.parse_args()
+
+    settings.cache_embeddings = False  # Measure the encoders, not the cache
+    texts = make_corpus(args.docs)
+    print(f"{args.docs} docs, CPU threads: {torch.get_num_threads()}")
+    print(f"{'backend':<10} {'dense cos':>10} {'min cos':>8} {'sparse jac':>11} {'sparse cos':>11} {'dense d/s':>10} {'sparse d/s':>11}")
+
+    reference = None
+    failed = False
+    for backend in ("torch", "onnx-fp32", "onnx-int8"):
+        engine = make_engine(backend, args)
+        dense = engine.encode_dense(texts)
+        sparse = engine.encode_sparse(texts)
+        if reference is None:
+            reference = dense, sparse
+
+        cosines = np.sum(dense * reference[0], axis=1)
+        overlap, sparse_cosine = sparse_parity(reference[1], sparse)
+        dense_rate = throughput(engine.encode_dense, texts, args.repeats)
+        sparse_rate = throughput(engine.encode_sparse, texts, args.repeats)
+        print(
+            f"{backend:<10} {cosines.mean():>10.4f} {cosines.min():>8.4f} {overlap:>11.3f} "
+            f"{sparse_cosine:>11.4f} {dense_rate:>10.1f} {sparse_rate:>11.1f}"
+        )
+        if cosines.min() < args.min_cosine or overlap < args.min_overlap:
+            failed = True
+
+    if failed:
+        print(f"Parity below thresholds (min cosine {args.min_cosine}, min overlap {args.min_overlap})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
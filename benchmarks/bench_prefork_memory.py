@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Resident memory per worker: preforked workers (app.prefork) vs uvicorn --workers
+
+Starts the API in each mode with the same number of workers, waits until it
+is ready, sends a few searches so every worker has run inference, then
+reads /proc/<pid>/smaps_rollup of the server and all its workers:
+
+- RSS: pages mapped by the process, counting shared pages in full
+- PSS: shared pages divided among the processes sharing them; the PSS
+  total is what the server really costs in RAM
+- private: pages only this process uses (its own heap, caches and
+  activations, plus weight pages it wrote to)
+
+Linux only. Qdrant runs in local in-memory mode unless --qdrant-location
+is changed, so no server is needed; pass --dense-model/--sparse-model to
+measure other checkpoints than the configured ones.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.config import settings
+
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+# uvicorn only configures its own loggers; the workers' startup lines go through the root logger
+LOG_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"default": {"class": "logging.StreamHandler"}},
+    "root": {"level": "INFO", "handlers": ["default"]}
+}
+
+
+def command(mode: str, workers: int, port: int) -> List[str]:
+    address = ["--host", "127.0.0.1", "--port", str(port)]
+    if mode == "prefork":
+        return [sys.executable, "-m", "app.prefork", "--workers", str(workers)] + address
+
+    log_config = os.path.join(tempfile.gettempdir(), "bench_prefork_memory-logging.json")
+    with open(log_config, "w") as f:
+        json.dump(LOG_CONFIG, f)
+    return [sys.executable, "-m", "uvicorn", "app.main:app", "--workers", str(workers), "--log-config", log_config] + address
+
+
+def request(url: str, body=None) -> int:
+    data = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if data else {}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data, headers), timeout=30) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def wait_ready(log_path: str, workers: int, timeout: float):
+    # Connections land on any worker, so count the workers that logged their startup instead
+    deadline = time.monotonic() + timeout
+    while True:
+        with open(log_path) as f:
+            log = f.read()
+        if "initialization failed" in log:
+            raise RuntimeError(f"Server failed to start, see {log_path}")
+        if log.count("Search engine initialized successfully") >= workers:
+            return
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Server not ready after {timeout}s, see {log_path}")
+        time.sleep(1)
+
+
+def descendants(pid: int) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def role(pid: int) -> str:
+    with open(f"/proc/{pid}/cmdline") as f:
+        cmdline = f.read()
+    # uvicorn --workers also starts multiprocessing's resource tracker
+    return "helper" if "resource_tracker" in cmdline else "worker"
+
+
+def memory(pid: int) -> Dict[str, float]:
+    """smaps_rollup fields of one process, in MiB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0]) / 1024
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "shared": values["Shared_Clean"] + values["Shared_Dirty"],
+        "private": values["Private_Clean"] + values["Private_Dirty"]
+    }
+
+
+def measure(mode: str, args, env) -> Dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    log_path = os.path.join(tempfile.gettempdir(), f"bench_prefork_memory-{mode}.log")
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(
+            command(mode, args.workers, args.port),
+            cwd=ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    try:
+        started_at = time.perf_counter()
+        wait_ready(log_path, args.workers, args.timeout)
+        ready_seconds = time.perf_counter() - started_at
+        for i in range(args.requests):
+            request(f"{base_url}/search", {"query": f"memory benchmark query {i}", "limit": 5})
+        time.sleep(1)
+
+        processes = [{"pid": server.pid, "role": "parent", **memory(server.pid)}]
+        for pid in descendants(server.pid):
+            processes.append({"pid": pid, "role": role(pid), **memory(pid)})
+        return {
+            "mode": mode,
+            "ready_seconds": round(ready_seconds, 1),
+            "processes": processes,
+            "total_pss": sum(p["pss"] for p in processes),
+            "total_rss": sum(p["rss"] for p in processes)
+        }
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(server.pid, signal.SIGKILL)
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.prefork_workers)
+    parser.add_argument("--modes", nargs="+", choices=("prefork", "uvicorn"), default=["prefork", "uvicorn"])
+    parser.add_argument("--dense-model", default=settings.dense_model)
+    parser.add_argument("--sparse-model", default=settings.sparse_model)
+    parser.add_argument("--qdrant-location", default=":memory:")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--json", action="store_true", help="Print the raw measurements as JSON")
+    args = parser.parse_args()
+
+    env = dict(
+        os.environ,
+        USE_GPU="false",
+        DENSE_MODEL=args.dense_model,
+        SPARSE_MODEL=args.sparse_model,
+        QDRANT_LOCATION=args.qdrant_location,
+        LOG_LEVEL="INFO"
+    )
+    results = [measure(mode, args, env) for mode in args.modes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.workers} workers, dense={args.dense_model}, sparse={args.sparse_model} (MiB)")
+    print(f"{'mode':<8} {'role':<7} {'pid':>7} {'rss':>8} {'pss':>8} {'shared':>8} {'private':>8}")
+    for result in results:
+        for p in result["processes"]:
+            print(
+                f"{result['mode']:<8} {p['role']:<7} {p['pid']:>7} {p['rss']:>8.0f} "
+                f"{p['pss']:>8.0f} {p['shared']:>8.0f} {p['private']:>8.0f}"
+            )
+        print(
+            f"{result['mode']:<8} {'total':<7} {'':>7} {result['total_rss']:>8.0f} {result['total_pss']:>8.0f}"
+            f"   ready in {result['ready_seconds']}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Compare Qdrant upsert/query throughput across client transports
+
+Runs the same synthetic hybrid workload (1024-dim dense + SPLADE-like sparse
+vectors, no models needed) through the sync and async clients over HTTP and
+gRPC. Pass --location :memory: to exercise the code paths against
+qdrant-client's local mode instead of a server.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+DIM = 1024
+
+
+def make_points(n: int, rng: np.random.Generator):
+    """Random normalized dense vectors plus sparse vectors with ~100 terms"""
+    dense = rng.standard_normal((n, DIM)).astype(np.float32)
+    dense /= np.linalg.norm(dense, axis=1, keepdims=True)
+    points = []
+    for i in range(n):
+        indices = np.sort(rng.choice(30000, size=100, replace=False))
+        points.append(models.PointStruct(
+            id=str(uuid.uuid4()),
+            vector={
+                "dense": dense[i].tolist(),
+                "sparse": models.SparseVector(
+                    indices=indices.tolist(),
+                    values=rng.random(100).astype(np.float32).tolist()
+                )
+            },
+            payload={"text": f"document {i}", "metadata": {"n": i}}
+        ))
+    return points
+
+
+def hybrid_query(point: models.PointStruct, limit: int = 10):
+    return {
+        "query": models.FusionQuery(fusion=models.Fusion.RRF),
+        "prefetch": [
+            models.Prefetch(query=point.vector["dense"], using="dense", limit=limit * 2),
+            models.Prefetch(query=point.vector["sparse"], using="sparse", limit=limit * 2)
+        ],
+        "limit": limit,
+        "with_payload": True
+    }
+
+
+def collection_config():
+    return {
+        "vectors_config": {"dense": models.VectorParams(size=DIM, distance=models.Distance.COSINE)},
+        "sparse_vectors_config": {"sparse": models.SparseVectorParams()}
+    }
+
+
+def run_sync(client: QdrantClient, name: str, points, queries, batch_size: int):
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(name, **collection_config())
+
+    start = time.perf_counter()
+    for i in range(0, len(points), batch_size):
+        client.upsert(name, points=points[i:i + batch_size], wait=True)
+    upsert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for point in queries:
+        client.query_points(name, **hybrid_query(point))
+    query_time = time.perf_counter() - start
+
+    client.delete_collection(name)
+    return len(points) / upsert_time, len(queries) / query_time
+
+
+async def run_async(client: AsyncQdrantClient, name: str, points, queries, batch_size: int, concurrency: int):
+    if await client.collection_exists(name):
+        await client.delete_collection(name)
+    await client.create_collection(name, **collection_config())
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        bounded(client.upsert(name, points=points[i:i + batch_size], wait=True))
+        for i in range(0, len(points), batch_size)
+    ))
+    upsert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(client.query_points(name, **hybrid_query(point))) for point in queries))
+    query_time = time.perf_counter() - start
+
+    await client.delete_collection(name)
+    return len(points) / upsert_time, len(queries) / query_time
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--location", default=None, help='e.g. ":memory:" for local mode')
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    points = make_points(args.points, rng)
+    queries = points[:args.queries]
+
+    if args.location:
+        variants = [("local", {"location": args.location})]
+    else:
+        remote = {"host": args.host, "port": args.port, "grpc_port": args.grpc_port, "pool_size": args.pool_size}
+        variants = [
+            ("http", {**remote, "prefer_grpc": False}),
+            ("grpc", {**remote, "prefer_grpc": True})
+        ]
+
+    print(f"{args.points} points, {args.queries} hybrid queries, batch={args.batch_size}, concurrency={args.concurrency}")
+    print(f"{'client':<14} {'upsert pts/s':>14} {'queries/s':>12}")
+    for label, options in variants:
+        upsert_rate, query_rate = run_sync(
+            QdrantClient(**options), "bench_transport", points, queries, args.batch_size
+        )
+        print(f"{'sync ' + label:<14} {upsert_rate:14.0f} {query_rate:12.1f}")
+
+        client = AsyncQdrantClient(**options)
+        upsert_rate, query_rate = await run_async(
+            client, "bench_transport", points, queries, args.batch_size, args.concurrency
+        )
+        await client.close()
+        print(f"{'async ' + label:<14} {upsert_rate:14.0f} {query_rate:12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
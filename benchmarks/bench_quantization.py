@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Recall vs latency of dense vector quantization against the float32 baseline
+
+Builds a clustered synthetic corpus (no models needed) and compares scalar
+int8, product and binary quantization with several oversampling factors,
+with and without rescoring.
+
+Against a Qdrant server (default) every variant is a real collection and
+queries go through query_points with QuantizationSearchParams, exactly as
+HybridSearchEngine issues them. qdrant-client's local mode
+(--location :memory:) always searches exactly and ignores quantization, so
+there the quantized scoring is emulated in numpy: candidates are ranked on
+the quantized vectors, the top limit * oversampling are optionally rescored
+with the originals. Emulated latencies are brute-force numpy timings and
+only comparable with each other.
+"""
+
+import argparse
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+QUANTIZATIONS = ("none", "scalar", "product", "binary")
+
+
+def clustered_vectors(n: int, dim: int, rng: np.random.Generator, clusters: int = 64) -> np.ndarray:
+    """Normalized vectors around random centroids, closer to real embeddings than pure noise"""
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def recall(found, truth) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+# numpy emulation for local mode
+
+def scalar_scorer(corpus: np.ndarray):
+    """int8 scalar quantization clipped at the 0.99 quantile, as Qdrant configures it"""
+    bound = np.quantile(np.abs(corpus), 0.99)
+    scale = 127 / bound
+    codes = np.clip(np.round(corpus * scale), -127, 127).astype(np.int8)
+    codes_f = codes.astype(np.float32)
+    return lambda q: (np.clip(np.round(q * scale), -127, 127) @ codes_f.T), codes.nbytes / len(corpus)
+
+
+def binary_scorer(corpus: np.ndarray):
+    """One bit per dimension; agreement count stands in for the dot product"""
+    signs = np.where(corpus > 0, 1.0, -1.0).astype(np.float32)
+    return lambda q: np.where(q > 0, 1.0, -1.0) @ signs.T, corpus.shape[1] / 8
+
+
+def product_scorer(corpus: np.ndarray, rng: np.random.Generator, compression: int = 16, iterations: int = 8):
+    """Product quantization with 256 centroids per sub-vector and asymmetric distance lookup"""
+    n, dim = corpus.shape
+    sub = max(1, compression // 4)  # float32 dims per one-byte code
+    m = dim // sub
+    parts = corpus[:, :m * sub].reshape(n, m, sub)
+    sample = parts[rng.choice(n, min(n, 5000), replace=False)]
+
+    def nearest(x: np.ndarray, c: np.ndarray) -> np.ndarray:
+        return np.argmin((c ** 2).sum(1)[None] - 2 * x @ c.T, axis=1)
+
+    centroids = np.empty((m, 256, sub), dtype=np.float32)
+    codes = np.empty((n, m), dtype=np.uint8)
+    for j in range(m):
+        x = sample[:, j]
+        c = x[rng.choice(len(x), 256, replace=len(x) < 256)].copy()
+        for _ in range(iterations):
+            assign = nearest(x, c)
+            counts = np.bincount(assign, minlength=256)
+            sums = np.zeros((256, sub), dtype=np.float32)
+            np.add.at(sums, assign, x)
+            filled = counts > 0
+            c[filled] = sums[filled] / counts[filled, None]
+        centroids[j] = c
+        codes[:, j] = nearest(parts[:, j], c)
+
+    def score(queries: np.ndarray) -> np.ndarray:
+        q = queries[:, :m * sub].reshape(len(queries), m, sub)
+        tables = np.einsum("qms,mcs->qmc", q, centroids)  # (queries, m, 256)
+        scores = np.zeros((len(queries), n), dtype=np.float32)
+        for j in range(m):
+            scores += tables[:, j, codes[:, j]]
+        return scores
+
+    return score, codes.nbytes / n
+
+
+def emulate(corpus, queries, truth, k, oversampling_factors, rng):
+    scorers = {
+        "scalar": scalar_scorer(corpus),
+        "product": product_scorer(corpus, rng),
+        "binary": binary_scorer(corpus)
+    }
+
+    start = time.perf_counter()
+    top_k(queries @ corpus.T, k)
+    baseline_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"{'none':<8} {'-':>5} {'-':>7} {1.0:>9.3f} {baseline_ms:>10.3f} {corpus.shape[1] * 4:>10.0f}")
+
+    for name, (score, bytes_per_vector) in scorers.items():
+        for factor in oversampling_factors:
+            for rescore in (False, True):
+                start = time.perf_counter()
+                candidates = top_k(score(queries), int(k * factor))
+                if rescore:
+                    exact = np.einsum("qd,qcd->qc", queries, corpus[candidates])
+                    found = np.take_along_axis(candidates, top_k(exact, k), axis=1)
+                else:
+                    found = candidates[:, :k]
+                elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+                print(
+                    f"{name:<8} {factor:>5g} {str(rescore):>7} {recall(found, truth):>9.3f} "
+                    f"{elapsed_ms:>10.3f} {bytes_per_vector:>10.0f}"
+                )
+
+
+# Qdrant server
+
+def quantization_config(name: str):
+    if name == "scalar":
+        return models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True))
+    if name == "product":
+        return models.ProductQuantization(product=models.ProductQuantizationConfig(compression=models.CompressionRatio.X16, always_ram=True))
+    if name == "binary":
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def wait_for_index(client: QdrantClient, name: str, timeout: float = 600):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if client.get_collection(name).status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(1)
+
+
+def measure(client, name, queries, k, params):
+    ids, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        response = client.query_points(name, query=query.tolist(), using="dense", limit=k, search_params=params)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append([point.id for point in response.points])
+    return ids, float(np.percentile(latencies, 50)), float(np.percentile(latencies, 99))
+
+
+def run_server(client, corpus, queries, k, oversampling_factors, on_disk, batch_size):
+    point_ids = [str(uuid.uuid4()) for _ in range(len(corpus))]
+    truth = None
+
+    for quantization in QUANTIZATIONS:
+        name = f"bench_quantization_{quantization}"
+        if client.collection_exists(name):
+            client.delete_collection(name)
+        client.create_collection(name, vectors_config={"dense": models.VectorParams(
+            size=corpus.shape[1],
+            distance=models.Distance.COSINE,
+            on_disk=on_disk,
+            quantization_config=quantization_config(quantization)
+        )})
+        for start in range(0, len(corpus), batch_size):
+            client.upsert(name, points=[
+                models.PointStruct(id=point_ids[i], vector={"dense": corpus[i].tolist()})
+                for i in range(start, min(start + batch_size, len(corpus)))
+            ])
+        wait_for_index(client, name)
+
+        if quantization == "none":
+            truth, _, _ = measure(client, name, queries, k, models.SearchParams(exact=True))
+            found, p50, p99 = measure(client, name, queries, k, None)
+            print(f"{'none':<8} {'-':>5} {'-':>7} {recall(found, truth):>9.3f} {p50:>10.2f} {p99:>10.2f}")
+        else:
+            for factor in oversampling_factors:
+                for rescore in (False, True):
+                    params = models.SearchParams(quantization=models.QuantizationSearchParams(
+                        oversampling=factor, rescore=rescore
+                    ))
+                    found, p50, p99 = measure(client, name, queries, k, params)
+                    print(
+                        f"{quantization:<8} {factor:>5g} {str(rescore):>7} {recall(found, truth):>9.3f} "
+                        f"{p50:>10.2f} {p99:>10.2f}"
+                    )
+        client.delete_collection(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--location", default=None, help='":memory:" for the local-mode emulation')
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversampling", default="1,2,4", help="Comma-separated oversampling factors")
+    parser.add_argument("--on-disk", action="store_true", help="Store original vectors on disk (server only)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    corpus = clustered_vectors(args.points, args.dim, rng)
+    queries = clustered_vectors(args.queries, args.dim, np.random.default_rng(7))
+    factors = [float(f) for f in args.oversampling.split(",")]
+
+    print(f"{args.points} x {args.dim} vectors, {args.queries} queries, recall@{args.k}")
+    if args.location:
+        # Local mode is exact, so check the baseline through Qdrant and emulate the rest
+        client = QdrantClient(location=args.location)
+        client.create_collection("bench", vectors_config=models.VectorParams(size=args.dim, distance=models.Distance.COSINE))
+        client.upload_collection("bench", vectors=corpus, ids=list(range(args.points)))
+        truth = top_k(queries @ corpus.T, args.k)
+        found = [[p.id for p in client.query_points("bench", query=q.tolist(), limit=args.k).points] for q in queries]
+        print(f"local-mode baseline recall vs numpy exact: {recall(found, truth):.3f}")
+        print(f"{'quant':<8} {'overs':>5} {'rescore':>7} {'recall':>9} {'ms/query':>10} {'bytes/vec':>10}")
+        emulate(corpus, queries, truth, args.k, factors, rng)
+    else:
+        client = QdrantClient(host=args.host, port=args.port, timeout=120)
+        print(f"{'quant':<8} {'overs':>5} {'rescore':>7} {'recall':>9} {'p50 ms':>10} {'p99 ms':>10}")
+        run_server(client, corpus, queries, args.k, factors, args.on_disk, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark query encoding QPS and latency with and without coalescing
+
+Simulates concurrent /search callers in-process: each one encodes a unique
+query either on its own (batch of one on the inference executor) or through
+the QueryCoalescer. The embedding cache is disabled so every query runs the
+models.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+
+settings.cache_embeddings = False
+
+from app.batching import QueryCoalescer
+from app.executor import InferenceExecutor
+from app.search_engine import HybridSearchEngine
+
+WORDS = (
+    "search engine vector sparse dense hybrid query document index collection "
+    "python docker model embedding token batch latency throughput qdrant gpu"
+).split()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_clients(encode, clients: int, requests_per_client: int, seed: int):
+    """Run concurrent callers and return (latencies_ms, elapsed_s)"""
+    rng = random.Random(seed)
+    latencies = []
+
+    async def client(n):
+        for i in range(requests_per_client):
+            query = f"{n}-{i} " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+            start = time.perf_counter()
+            await encode(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label, latencies, elapsed):
+    print(
+        f"{label:<12} QPS={len(latencies) / elapsed:8.1f}  "
+        f"p50={statistics.median(latencies):7.1f} ms  "
+        f"p99={percentile(latencies, 99):7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dense-model", default=settings.dense_model)
+    parser.add_argument("--sparse-model", default=settings.sparse_model)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--window-ms", type=float, default=settings.coalesce_window_ms)
+    parser.add_argument("--max-batch", type=int, default=settings.coalesce_max_batch)
+    args = parser.parse_args()
+
+    settings.dense_model = args.dense_model
+    settings.sparse_model = args.sparse_model
+    engine = HybridSearchEngine()
+    if not engine.load_models():
+        sys.exit("Could not load models")
+
+    executor = InferenceExecutor(
+        max_workers=settings.num_workers,
+        max_queue=args.clients * 2
+    )
+    coalescer = QueryCoalescer(engine, executor, args.window_ms, args.max_batch)
+
+    async def single(query):
+        return await executor.run(engine.encode_queries, [query], ["hybrid"])
+
+    async def coalesced(query):
+        return await coalescer.encode(query, "hybrid")
+
+    print(f"{args.clients} clients x {args.requests} requests, window={args.window_ms} ms, max_batch={args.max_batch}")
+    await run_clients(single, 4, 2, seed=0)  # warmup
+    report("single", *await run_clients(single, args.clients, args.requests, seed=1))
+    report("coalesced", *await run_clients(coalesced, args.clients, args.requests, seed=1))
+    print(f"Average coalesced batch size: {coalescer.stats()['avg_batch_size']:.1f}")
+
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Response path benchmark: payload projection and result serialization
+
+Measures, for a few payload projections of the same search (full payload,
+truncated text, snippets, no text):
+
+- fetch: median latency of query_points against qdrant-client's local mode
+  with the projection's payload selector, and the payload bytes returned
+- response: median latency and body size of a /search-shaped endpoint
+  served through FastAPI's TestClient, once through the SearchResponse
+  model (response validation and jsonable_encoder) and once through
+  FastJSONResponse on the result dicts; both bodies are checked to decode
+  to the same JSON
+
+Vectors are random and no models are loaded; the documents carry long
+texts and a handful of metadata keys, which is where the two paths differ.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient, models
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.main import search_result
+from app.models import SearchResponse
+from app.projection import payload_selector, project_results, resolve_projection
+from app.responses import FastJSONResponse
+from app.search_engine import HybridSearchEngine
+
+COLLECTION = "bench_response_path"
+DIM = 64
+WORDS = "qdrant hybrid search dense sparse vector payload index query fusion score chunk text model".split()
+PROJECTIONS = {
+    "full": {},
+    "truncate_200": {"max_text_chars": 200},
+    "snippet_200": {"snippet": True},
+    "metadata_2": {"max_text_chars": 200, "metadata_fields": ["source", "lang"]},
+    "no_text": {"include_text": False, "metadata_fields": []}
+}
+
+
+def make_points(n: int, text_chars: int, seed: int) -> List[models.PointStruct]:
+    rng = random.Random(seed)
+    vectors = np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+    points = []
+    for i in range(n):
+        words, length = [], 0
+        while length < text_chars:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        points.append(models.PointStruct(
+            id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"bench-response-path/{i}")),
+            vector={"dense": vectors[i].tolist()},
+            payload={
+                "text": " ".join(words),
+                "metadata": {
+                    "source": f"doc-{i}.pdf",
+                    "lang": "pt",
+                    "page": i % 50,
+                    "tags": rng.sample(WORDS, 4),
+                    "author": f"author-{i % 17}",
+                    "summary": " ".join(rng.choices(WORDS, k=40))
+                },
+                "content_hash": uuid.uuid4().hex
+            }
+        ))
+    return points
+
+
+def median_ms(fn, runs: int) -> float:
+    fn()
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(latencies), 3)
+
+
+def response_app(state: Dict[str, Any]) -> FastAPI:
+    """Two endpoints returning the current results, one per serialization path"""
+    app = FastAPI()
+
+    def body():
+        results = [search_result(r) for r in state["results"]]
+        return {
+            "query": state["query"],
+            "mode": "dense",
+            "results": results,
+            "total": len(results),
+            "processing_time_ms": 1.0,
+            "offset": 0,
+            "next_cursor": None
+        }
+
+    @app.get("/model", response_model=SearchResponse)
+    def model_path():
+        return SearchResponse(**body())
+
+    @app.get("/fast", response_model=SearchResponse)
+    def fast_path():
+        return FastJSONResponse(body())
+
+    return app
+
+
+def run(args) -> List[Dict[str, Any]]:
+    client = QdrantClient(location=":memory:")
+    client.create_collection(
+        COLLECTION,
+        vectors_config={"dense": models.VectorParams(size=DIM, distance=models.Distance.COSINE)}
+    )
+    points = make_points(args.docs, args.text_chars, args.seed)
+    for start in range(0, len(points), 256):
+        client.upsert(COLLECTION, points[start:start + 256])
+
+    query = "hybrid fusion score"
+    vector = np.random.default_rng(args.seed + 1).standard_normal(DIM).astype(np.float32).tolist()
+    state = {"query": query, "results": []}
+    http = TestClient(response_app(state))
+
+    rows = []
+    for name, options in PROJECTIONS.items():
+        projection = resolve_projection(snippet_chars=200, **options)
+        selector = payload_selector(projection)
+
+        def fetch():
+            return client.query_points(
+                COLLECTION, query=vector, using="dense", limit=args.k, with_payload=selector
+            ).points
+
+        fetched = fetch()
+        state["results"] = project_results(HybridSearchEngine._format_points(fetched), query, projection)
+
+        model_response, fast_response = http.get("/model"), http.get("/fast")
+        if model_response.json() != fast_response.json():
+            raise SystemExit(f"{name}: the two serialization paths disagree")
+
+        rows.append({
+            "projection": name,
+            "fetch_ms": median_ms(fetch, args.runs),
+            "payload_bytes": sum(len(json.dumps(point.payload)) for point in fetched),
+            "model_ms": median_ms(lambda: http.get("/model"), args.runs),
+            "fast_ms": median_ms(lambda: http.get("/fast"), args.runs),
+            "response_bytes": len(fast_response.content)
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--text-chars", type=int, default=4000, help="Characters of text per document")
+    parser.add_argument("--k", type=int, default=50, help="Results per search")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print the raw measurements as JSON")
+    args = parser.parse_args()
+
+    rows = run(args)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{args.docs} docs of {args.text_chars} chars, k={args.k}, median of {args.runs} runs")
+    print(f"{'projection':<14} {'fetch ms':>9} {'payload B':>10} {'model ms':>9} {'fast ms':>8} {'response B':>11}")
+    for row in rows:
+        print(
+            f"{row['projection']:<14} {row['fetch_ms']:>9.3f} {row['payload_bytes']:>10} "
+            f"{row['model_ms']:>9.3f} {row['fast_ms']:>8.3f} {row['response_bytes']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
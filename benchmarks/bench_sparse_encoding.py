@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark batched SPLADE encoding against the legacy per-text path"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import torch
+from qdrant_client.models import SparseVector
+from transformers import AutoTokenizer, AutoModelForMaskedLM
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings
+from app.search_engine import HybridSearchEngine
+
+WORDS = (
+    "search engine vector sparse dense hybrid query document index collection "
+    "python docker model embedding token batch latency throughput qdrant gpu "
+    "busca documento consulta coleção desempenho modelo servidor indexação"
+).split()
+
+
+def make_corpus(n: int, seed: int = 42):
+    """Generate a synthetic corpus mixing short and long texts"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        length = rng.choice([8, 15, 40, 80, 150])
+        corpus.append(" ".join(rng.choice(WORDS) for _ in range(length)))
+    return corpus
+
+
+@torch.no_grad()
+def encode_sparse_per_text(engine: HybridSearchEngine, texts):
+    """Legacy path: one forward pass per text padded to max_length (SPLADE pooling)"""
+    sparse_vectors = []
+    for text in texts:
+        max_length = 24 if len(text) < 100 else 128
+        inputs = engine.sparse_tokenizer(
+            text,
+            return_tensors="pt",
+            max_length=max_length,
+            truncation=True,
+            padding="max_length"
+        ).to(engine.device)
+        logits = engine.sparse_model(**inputs).logits
+        pooled = torch.log1p(torch.relu(logits)).max(dim=1).values.squeeze()
+        indices = pooled.nonzero().squeeze(-1)
+        sparse_vectors.append(SparseVector(
+            indices=indices.cpu().tolist(),
+            values=pooled[indices].float().cpu().tolist()
+        ))
+    return sparse_vectors
+
+
+def run(label, fn, texts, repeats):
+    """Time an encoder and print docs/sec"""
+    fn(texts[:8])  # warmup
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    rate = len(texts) / best
+    print(f"{label:<12} {rate:10.1f} docs/sec  ({best * 1000:.0f} ms for {len(texts)} docs)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=settings.sparse_model)
+    parser.add_argument("--docs", type=int, default=512)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = HybridSearchEngine()
+    engine.sparse_tokenizer = AutoTokenizer.from_pretrained(args.model)
+    engine.sparse_model = AutoModelForMaskedLM.from_pretrained(args.model).to(engine.device).eval()
+
+    texts = make_corpus(args.docs)
+    print(f"Model: {args.model}  device: {engine.device}  batch_size: {settings.batch_size}")
+    legacy = run("per-text", lambda t: encode_sparse_per_text(engine, t), texts, args.repeats)
+    batched = run("batched", engine.encode_sparse, texts, args.repeats)
+    print(f"Speedup: {batched / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Sparse index size and search latency against recall: pruning, precision and IDF
+
+Encodes the bench_engine corpus once, then indexes it into one collection
+per variant of the sparse storage options and reports, per variant:
+
+- terms/doc and postings: non-zero sparse weights kept per document and in total
+- index_mb: estimated size of the sparse posting lists, postings times
+  (4-byte point offset + value bytes: 4 for float32, 2 for float16, 1 for uint8)
+- sparse and hybrid p50 latency of search() with pre-encoded queries,
+  so only the Qdrant side is timed
+- recall@k of the sparse and hybrid results against the unpruned float32
+  collection; for the IDF variant it is the overlap with the unmodified
+  ranking, since IDF changes the ranking on purpose
+
+Variants: --top-k values (SPARSE_PRUNE_TOP_K), --min-weight values
+(SPARSE_PRUNE_MIN_WEIGHT; by default the 25th and 50th percentile of the
+corpus weights, since their scale depends on the model), float16 and uint8 values (SPARSE_DATATYPE) and
+the IDF modifier (SPARSE_IDF). qdrant-client's local mode ignores the index
+datatype, so there the reduced precision is simulated on the values before
+upserting (uint8 as 256 levels up to each vector's largest weight); against
+a server (--location server) the collection's datatype does the work.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_engine import latency_stats, make_documents, make_queries, recall
+from app.config import settings
+from app.search_engine import HybridSearchEngine
+from qdrant_client import models
+
+COLLECTION = "bench_sparse"
+VALUE_BYTES = {"float32": 4, "float16": 2, "uint8": 1}
+
+
+def reduce_precision(vector: models.SparseVector, datatype: str) -> models.SparseVector:
+    """Values as a float16 or uint8 sparse index would return them"""
+    values = np.asarray(vector.values, dtype=np.float32)
+    if datatype == "float16":
+        values = values.astype(np.float16).astype(np.float32)
+    elif datatype == "uint8" and len(values):
+        scale = values.max() / 255
+        values = np.round(values / scale) * scale
+    return models.SparseVector(indices=vector.indices, values=values.tolist())
+
+
+def variants(args, doc_sparse: List[models.SparseVector]) -> List[Dict[str, Any]]:
+    min_weights = args.min_weight
+    if min_weights is None:
+        weights = np.concatenate([vector.values for vector in doc_sparse])
+        min_weights = [round(float(w), 3) for w in np.percentile(weights, [25, 50])]
+
+    found = [{"name": "baseline"}]
+    found += [{"name": f"top_k={k}", "top_k": k} for k in args.top_k]
+    found += [{"name": f"min_weight={w}", "min_weight": w} for w in min_weights]
+    found += [{"name": datatype, "datatype": datatype} for datatype in ("float16", "uint8")]
+    if args.top_k:
+        found.append({"name": f"top_k={args.top_k[-1]}+uint8", "top_k": args.top_k[-1], "datatype": "uint8"})
+    found.append({"name": "idf", "idf": True})
+    return found
+
+
+def index_variant(engine, variant, documents, doc_dense, doc_sparse, simulate) -> List[models.SparseVector]:
+    """Recreate the collection with the variant's options and upsert the pre-encoded corpus"""
+    if engine.qdrant_client.collection_exists(COLLECTION):
+        engine.delete_collection(COLLECTION)
+    if not engine.create_collection(
+        COLLECTION,
+        sparse_datatype=variant.get("datatype"),
+        sparse_idf=variant.get("idf")
+    ):
+        raise SystemExit(f"Failed to create the collection for {variant['name']}")
+
+    vectors = [
+        engine.prune_sparse(vector, variant.get("top_k", 0), variant.get("min_weight", 0.0))
+        for vector in doc_sparse
+    ]
+    if simulate and variant.get("datatype"):
+        vectors = [reduce_precision(vector, variant["datatype"]) for vector in vectors]
+
+    points = [
+        models.PointStruct(
+            id=doc["id"],
+            vector={"dense": dense.tolist(), "sparse": sparse},
+            payload={"text": doc["text"], "metadata": doc["metadata"]}
+        )
+        for doc, dense, sparse in zip(documents, doc_dense, vectors)
+    ]
+    for start in range(0, len(points), settings.upsert_batch_size):
+        engine.qdrant_client.upsert(COLLECTION, points[start:start + settings.upsert_batch_size])
+    return vectors
+
+
+def search_all(engine, queries, query_dense, query_sparse, mode, k):
+    """Top-k IDs per query and the per-query latencies"""
+    ids, latencies = [], []
+    for query, dense, sparse in zip(queries, query_dense, query_sparse):
+        start = time.perf_counter()
+        hits = engine.search(
+            query, mode=mode, limit=k, collection_name=COLLECTION,
+            dense_query=dense, sparse_query=sparse
+        )
+        latencies.append(time.perf_counter() - start)
+        ids.append([engine._normalize_id(hit["id"]) for hit in hits])
+    return ids, latencies
+
+
+def run(args) -> List[Dict[str, Any]]:
+    settings.dense_model = args.dense_model
+    settings.sparse_model = args.sparse_model
+    settings.cache_search_results = False
+    if args.location != "server":
+        settings.qdrant_location = args.location
+
+    engine = HybridSearchEngine()
+    if not engine.load_models():
+        raise SystemExit(f"Failed to load models: {engine.model_state}")
+
+    documents = make_documents(args.docs, seed=args.seed)
+    queries = make_queries(documents, args.queries, seed=args.seed + 1)
+    texts = [doc["text"] for doc in documents]
+    doc_dense = engine.encode_dense(texts)
+    doc_sparse = engine.encode_sparse(texts)
+    query_dense, query_sparse = engine.encode_queries(queries, ["hybrid"] * len(queries))
+
+    rows, reference = [], {}
+    for variant in variants(args, doc_sparse):
+        vectors = index_variant(engine, variant, documents, doc_dense, doc_sparse, args.location != "server")
+        postings = sum(len(vector.indices) for vector in vectors)
+        row = {
+            "variant": variant["name"],
+            "terms_per_doc": round(postings / len(vectors), 1),
+            "postings": postings,
+            "index_mb": round(postings * (4 + VALUE_BYTES[variant.get("datatype", "float32")]) / 2 ** 20, 3)
+        }
+        for mode in ("sparse", "hybrid"):
+            search_all(engine, queries[:5], query_dense[:5], query_sparse[:5], mode, args.k)  # warmup
+            ids, latencies = search_all(engine, queries, query_dense, query_sparse, mode, args.k)
+            reference.setdefault(mode, ids)
+            row[f"{mode}_p50_ms"] = latency_stats(latencies)["p50_ms"]
+            row[f"{mode}_recall"] = round(float(np.mean([
+                recall(expected, found) for expected, found in zip(reference[mode], ids)
+            ])), 4)
+        rows.append(row)
+
+    engine.delete_collection(COLLECTION)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dense-model", default=settings.dense_model)
+    parser.add_argument("--sparse-model", default=settings.sparse_model)
+    parser.add_argument("--location", default=":memory:", help="':memory:', a local storage path, or 'server' for QDRANT_HOST")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--top-k", type=int, nargs="*", default=[128, 64, 32], help="SPARSE_PRUNE_TOP_K values to try")
+    parser.add_argument("--min-weight", type=float, nargs="*", help="SPARSE_PRUNE_MIN_WEIGHT values to try")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print the raw measurements as JSON")
+    args = parser.parse_args()
+
+    rows = run(args)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{args.docs} docs, {args.queries} queries, k={args.k}, sparse={args.sparse_model}, location={args.location}")
+    print(
+        f"{'variant':<18} {'terms/doc':>9} {'postings':>9} {'index MB':>9} "
+        f"{'sparse ms':>9} {'recall':>7} {'hybrid ms':>9} {'recall':>7}"
+    )
+    for row in rows:
+        print(
+            f"{row['variant']:<18} {row['terms_per_doc']:>9} {row['postings']:>9} {row['index_mb']:>9.3f} "
+            f"{row['sparse_p50_ms']:>9.3f} {row['sparse_recall']:>7.4f} "
+            f"{row['hybrid_p50_ms']:>9.3f} {row['hybrid_recall']:>7.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Load test: /health latency while a large /index request is running
+
+Polls /health at a fixed rate, first on an idle server and then while a
+10k-document index batch is in flight, and prints p50/p99 for both phases.
+With inference on the executor the two distributions should stay close.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+WORDS = (
+    "search engine vector sparse dense hybrid query document index collection "
+    "python docker model embedding token batch latency throughput qdrant gpu"
+).split()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def poll_health(client, stop: asyncio.Event, interval: float):
+    """Call /health until stop is set and return latencies in ms"""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def report(label, latencies):
+    print(
+        f"{label:<10} n={len(latencies):<5} "
+        f"p50={statistics.median(latencies):7.1f} ms  "
+        f"p99={percentile(latencies, 99):7.1f} ms  "
+        f"max={max(latencies):7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--collection", default=None, help="Defaults to the server's default collection")
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.api_key}"} if args.api_key else {}
+    rng = random.Random(42)
+    documents = [
+        {"text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 120))), "metadata": {"n": i}}
+        for i in range(args.docs)
+    ]
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=None) as client:
+        # Baseline: idle server
+        stop = asyncio.Event()
+        poller = asyncio.create_task(poll_health(client, stop, args.interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await poller
+
+        # Under load: one large index request in flight
+        stop = asyncio.Event()
+        poller = asyncio.create_task(poll_health(client, stop, args.interval))
+        start = time.perf_counter()
+        response = await client.post(
+            "/index",
+            json={"documents": documents, "collection_name": args.collection}
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        loaded = await poller
+
+    response.raise_for_status()
+    result = response.json()
+    print(f"Indexed {result['indexed_count']} docs in {elapsed:.1f}s ({result['indexed_count'] / elapsed:.0f} docs/sec)")
+    report("idle", baseline)
+    report("indexing", loaded)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())